@@ -0,0 +1,27 @@
+"""
+Renders a CSV or JSONL file of findings (category, url, notes) into a single
+Markdown or HTML report using the app's report templates:
+
+    python bulk_report.py findings.csv -o report.html
+"""
+import argparse
+import sys
+from utils import db as command_db
+from utils.report_batch import write_bulk_report
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate one report from a file of findings.")
+    parser.add_argument('findings', help="CSV with category,url,notes columns, or JSONL with those keys")
+    parser.add_argument('-o', '--output', required=True, help="Report to write; .html/.htm for HTML, otherwise Markdown")
+    args = parser.parse_args(argv)
+
+    command_db.initialize_db()
+    renderer = write_bulk_report(
+        args.findings, args.output, command_db.get_all_templates(),
+        progress=lambda count: print(f"\r{count} findings...", end='', file=sys.stderr)
+    )
+    print(f"\r{renderer.summary()}", file=sys.stderr)
+    return 0 if renderer.rendered else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
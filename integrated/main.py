@@ -1,25 +1,45 @@
 import sys
 import os
-from PyQt5.QtWidgets import QApplication, QMainWindow, QTabWidget
-from PyQt5.QtCore import QSize
-from PyQt5.QtGui import QIcon
-
-# Import utility and module classes
-from utils import db as command_db
-from modules.scan_control import ScanControlWidget
-from modules.playground import PlaygroundTabWidget
-from modules.custom_commands import CustomCommandsWidget
-from modules.sudo_terminal import SudoTerminalWidget
-from modules.report_tab import ReportTabWidget
+from utils import startup_timing
+with startup_timing.timed("import PyQt5"):
+    from PyQt5.QtWidgets import QApplication, QMainWindow, QTabWidget, QShortcut
+    from PyQt5.QtCore import QSize, QTimer
+    from PyQt5.QtGui import QIcon, QKeySequence
+
+# Import utility and module classes. Only the first tab is imported up front;
+# the others (and heavy dependencies like numpy/matplotlib) load when opened.
+with startup_timing.timed("import utils"):
+    from utils import db as command_db
+    from utils.db_worker import run_db_task, shutdown_db_worker
+    from utils.process_pool import shutdown_parse_pool
+with startup_timing.timed("import modules.scan_control"):
+    from modules.scan_control import ScanControlWidget
+from modules.lazy_tab import LazyTab
+
+STALL_REPORT_SHORTCUT = "Ctrl+Shift+D"
+
+def stall_watchdog_threshold(argv):
+    """
+    Returns the threshold in ms if --stall-watchdog (or --stall-watchdog=MS) was
+    passed, otherwise None.
+    """
+    from utils.stall_watchdog import DEFAULT_THRESHOLD_MS
+    for arg in argv:
+        if arg == "--stall-watchdog":
+            return DEFAULT_THRESHOLD_MS
+        if arg.startswith("--stall-watchdog="):
+            return int(arg.split("=", 1)[1])
+    return None
 
 class ReconAutomatorApp(QMainWindow):
     """
     The main application window that acts as an orchestrator for all the modular components (tabs).
     """
-    def __init__(self):
+    def __init__(self, stall_watchdog=None):
         super().__init__()
         self.setWindowTitle("Reconnaissance Automator")
         self.setGeometry(100, 100, 1200, 800)
+        self.stall_watchdog = stall_watchdog
         
         # Load the last used CWD from the database
         last_cwd = command_db.get_setting('last_cwd')
@@ -35,11 +55,13 @@ class ReconAutomatorApp(QMainWindow):
         self.setCentralWidget(self.tabs)
 
         # --- Instantiate Modular Widgets ---
-        self.scan_control_tab = ScanControlWidget(self.working_directory, self.icon_path)
-        self.terminal_tab = CustomCommandsWidget(self.working_directory, self.icon_path)
-        self.playground_tab = PlaygroundTabWidget(self.working_directory, self.icon_path, self.terminal_tab)
-        self.sudo_terminal_tab = SudoTerminalWidget(self.icon_path)
-        self.report_tab = ReportTabWidget()
+        # Scan Control is what the user sees first; the rest are built on first use
+        with startup_timing.timed("build Scan Control tab"):
+            self.scan_control_tab = ScanControlWidget(self.working_directory, self.icon_path)
+        self.terminal_tab = LazyTab("Terminal", self.build_terminal_tab)
+        self.playground_tab = LazyTab("Playground", self.build_playground_tab)
+        self.sudo_terminal_tab = LazyTab("Sudo Terminal", self.build_sudo_terminal_tab)
+        self.report_tab = LazyTab("Reporting", self.build_report_tab)
 
         # --- Add Widgets as Tabs ---
         self.tabs.addTab(self.scan_control_tab, "Scan Control")
@@ -49,38 +71,107 @@ class ReconAutomatorApp(QMainWindow):
         self.tabs.addTab(self.report_tab, "Reporting")
 
         # --- Connect Signals Between Modules ---
-        self.scan_control_tab.scan_updated.connect(self.playground_tab.refresh_playground)
+        self.scan_control_tab.scan_updated.connect(self.on_scan_updated)
         self.scan_control_tab.cwd_changed.connect(self.on_cwd_changed)
         self.scan_control_tab.theme_changed.connect(self.apply_theme)
         
-        self.apply_theme()
+        # Startup reads happen before the first paint; later changes go through the DB thread
+        self.on_theme_loaded(command_db.get_active_theme())
+
+        if self.stall_watchdog:
+            QShortcut(QKeySequence(STALL_REPORT_SHORTCUT), self, self.show_stall_report)
+            self.statusBar().showMessage(f"Stall watchdog on - {STALL_REPORT_SHORTCUT} shows the stall report")
+
+    def show_stall_report(self):
+        from modules.dialogs import StallReportDialog
+        StallReportDialog(self.stall_watchdog, self).exec_()
+
+    def build_terminal_tab(self):
+        from modules.custom_commands import CustomCommandsWidget
+        return CustomCommandsWidget(self.working_directory, self.icon_path)
+
+    def build_playground_tab(self):
+        from modules.playground import PlaygroundTabWidget
+        # The Playground sends fuzzing commands to the Terminal, so that one comes first
+        return PlaygroundTabWidget(self.working_directory, self.icon_path, self.terminal_tab.widget())
+
+    def build_sudo_terminal_tab(self):
+        from modules.sudo_terminal import SudoTerminalWidget
+        return SudoTerminalWidget(self.icon_path, self.working_directory)
+
+    def build_report_tab(self):
+        from modules.report_tab import ReportTabWidget
+        return ReportTabWidget()
+
+    def on_scan_updated(self):
+        # An unbuilt Playground lists the directory fresh when it is opened
+        if self.playground_tab.is_built():
+            self.playground_tab.widget().refresh_playground()
 
     def on_cwd_changed(self, new_path):
         """Broadcasts the CWD change to all interested modules and saves it."""
         self.working_directory = new_path
-        self.playground_tab.set_working_directory(new_path)
-        self.terminal_tab.set_working_directory(new_path)
+        # Tabs that haven't been built yet pick up self.working_directory when they are
+        if self.playground_tab.is_built():
+            self.playground_tab.widget().set_working_directory(new_path)
+        if self.terminal_tab.is_built():
+            self.terminal_tab.widget().set_working_directory(new_path)
+        if self.sudo_terminal_tab.is_built():
+            self.sudo_terminal_tab.widget().set_working_directory(new_path)
         # Save the new CWD to the database
-        command_db.set_setting('last_cwd', new_path)
+        run_db_task(command_db.set_setting, 'last_cwd', new_path)
 
     def apply_theme(self):
-        """Applies the current theme and reloads icons for all modules."""
-        theme_name = command_db.get_setting('active_theme')
-        stylesheet = command_db.get_setting(f"{theme_name}_theme_stylesheet")
+        """Loads the current theme from the database and applies it."""
+        run_db_task(command_db.get_active_theme, on_result=self.on_theme_loaded, owner=self)
+
+    def on_theme_loaded(self, theme):
+        """Applies the given theme and reloads icons for all modules."""
+        theme_name, stylesheet = theme
         self.setStyleSheet(stylesheet)
         self.scan_control_tab.apply_theme(theme_name)
-        self.playground_tab.apply_theme()
+        if self.playground_tab.is_built():
+            self.playground_tab.widget().apply_theme()
+
+    def paintEvent(self, event):
+        super().paintEvent(event)
+        if startup_timing.first_paint is None:
+            startup_timing.mark_first_paint()
+            if startup_timing.enabled:
+                QTimer.singleShot(0, startup_timing.print_report)
 
     def closeEvent(self, event):
         """Ensures all child processes are terminated when the app closes."""
-        self.terminal_tab.stop_all_processes()
+        if self.terminal_tab.is_built():
+            self.terminal_tab.widget().stop_all_processes()
+        if self.sudo_terminal_tab.is_built():
+            self.sudo_terminal_tab.widget().stop_all_jobs()
+        if self.report_tab.is_built():
+            self.report_tab.widget().stop_bulk_report()
         if self.scan_control_tab.worker and self.scan_control_tab.worker.isRunning():
             self.scan_control_tab.worker.stop()
+        shutdown_db_worker()
+        shutdown_parse_pool()
+        if self.stall_watchdog:
+            self.stall_watchdog.stop()
+            if self.stall_watchdog.stalls:
+                print(self.stall_watchdog.report(), file=sys.stderr)
         event.accept()
 
 if __name__ == "__main__":
-    app = QApplication(sys.argv)
-    command_db.initialize_db()
-    main_win = ReconAutomatorApp()
+    # --startup-timing prints how long each import/construction step took
+    startup_timing.enabled = "--startup-timing" in sys.argv
+    with startup_timing.timed("create QApplication"):
+        app = QApplication(sys.argv)
+    with startup_timing.timed("initialize database"):
+        command_db.initialize_db()
+    # --stall-watchdog[=MS] reports where the GUI thread blocks for longer than MS
+    stall_watchdog = None
+    threshold_ms = stall_watchdog_threshold(sys.argv)
+    if threshold_ms is not None:
+        from utils.stall_watchdog import StallWatchdog
+        stall_watchdog = StallWatchdog(threshold_ms)
+        stall_watchdog.start()
+    main_win = ReconAutomatorApp(stall_watchdog)
     main_win.show()
     sys.exit(app.exec_())
\ No newline at end of file
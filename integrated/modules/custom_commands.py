@@ -1,21 +1,248 @@
+import codecs
 import os
 import shlex
-from PyQt5.QtWidgets import QWidget, QVBoxLayout, QFrame, QTextEdit, QLineEdit, QPushButton, QHBoxLayout, QLabel
-from PyQt5.QtCore import QProcess, QTimer, Qt, QSize
-from PyQt5.QtGui import QFont, QIcon
+import time
+from PyQt5.QtWidgets import (
+    QWidget, QVBoxLayout, QFrame, QPlainTextEdit, QLineEdit, QPushButton, QHBoxLayout, QLabel,
+    QTabWidget, QMessageBox
+)
+from PyQt5.QtCore import QProcess, QTimer, Qt, QSize, pyqtSignal
+from PyQt5.QtGui import QFont, QIcon, QTextCursor
+
+INITIAL_SLOTS = 4
+# Lines kept on screen per slot; the transcript on disk has everything
+SCROLLBACK_LINES = 5000
+# Output is added to the display at most this often
+FLUSH_INTERVAL_MS = 100
+# A single flush never pushes more than this into the display; older text is only in the transcript
+MAX_FLUSH_CHARS = 256 * 1024
+TRANSCRIPT_DIR = "terminal_transcripts"
+
+def format_elapsed(seconds):
+    hours, rem = divmod(int(seconds), 3600)
+    minutes, seconds = divmod(rem, 60)
+    return f"Elapsed: {hours:02d}:{minutes:02d}:{seconds:02d}"
+
+class TerminalSlot(QFrame):
+    """
+    One terminal: a command line, its process, and a bounded output view.
+    Output is buffered and flushed to the view every FLUSH_INTERVAL_MS, and
+    everything the process writes also goes to a transcript file.
+    """
+    started = pyqtSignal()
+    stopped = pyqtSignal()
+
+    def __init__(self, owner, parent=None):
+        super().__init__(parent)
+        self.owner = owner
+        self.process = None
+        self.started_at = None
+        self.pending = []
+        self.pending_size = 0
+        self.omitted = 0
+        self.decoder = None
+        self.transcript = None
+        self.transcript_path = None
+        self.setFrameShape(QFrame.StyledPanel)
+        layout = QVBoxLayout(self)
+
+        self.output_display = QPlainTextEdit(readOnly=True)
+        self.output_display.setFont(QFont("Courier", 10))
+        self.output_display.setMaximumBlockCount(SCROLLBACK_LINES)
+        layout.addWidget(self.output_display)
+
+        self.timer_label = QLabel(format_elapsed(0))
+        self.timer_label.setAlignment(Qt.AlignRight)
+        self.transcript_label = QLabel()
+
+        input_layout = QHBoxLayout()
+        self.status_icon = QLabel()
+        self.status_icon.setPixmap(owner.stopped_icon.pixmap(QSize(16, 16)))
+        input_layout.addWidget(self.status_icon)
+
+        self.command_input = QLineEdit()
+        self.command_input.setPlaceholderText("Enter command and press Enter")
+        self.start_button = QPushButton("Run")
+        self.stop_button = QPushButton("Stop")
+        self.stop_button.setEnabled(False)
+        input_layout.addWidget(self.command_input)
+        input_layout.addWidget(self.start_button)
+        input_layout.addWidget(self.stop_button)
+
+        bottom_layout = QHBoxLayout()
+        bottom_layout.addLayout(input_layout, 4)
+        bottom_layout.addWidget(self.timer_label, 1)
+        layout.addLayout(bottom_layout)
+        layout.addWidget(self.transcript_label)
+
+        self.flush_timer = QTimer(self)
+        self.flush_timer.setSingleShot(True)
+        self.flush_timer.setInterval(FLUSH_INTERVAL_MS)
+        self.flush_timer.timeout.connect(self.flush_output)
+
+        self.command_input.returnPressed.connect(self.start_process)
+        self.start_button.clicked.connect(self.start_process)
+        self.stop_button.clicked.connect(self.stop_process)
+
+    def is_running(self):
+        return self.process is not None and self.process.state() != QProcess.NotRunning
+
+    def start_process(self):
+        if self.is_running():
+            return
+        command_text = self.command_input.text()
+        if not command_text:
+            return
+        try:
+            args = shlex.split(command_text)
+        except ValueError as e:
+            self.output_display.setPlainText(f"Invalid command: {e}")
+            return
+
+        self.output_display.clear()
+        self.pending, self.pending_size, self.omitted = [], 0, 0
+        # Multi-byte characters can be split across reads
+        self.decoder = codecs.getincrementaldecoder('utf-8')(errors='replace')
+        self.open_transcript(command_text, args[0])
+
+        self.process = QProcess(self)
+        self.process.setProcessChannelMode(QProcess.MergedChannels)
+        self.process.setWorkingDirectory(self.owner.working_directory)
+        self.process.readyReadStandardOutput.connect(self.handle_output)
+        self.process.finished.connect(self.handle_finish)
+        self.process.errorOccurred.connect(self.handle_error)
+        self.started_at = time.monotonic()
+        self.process.start(args[0], args[1:])
+        self.update_ui_for_start()
+        self.started.emit()
+
+    def stop_process(self):
+        if self.is_running():
+            self.process.kill()
+
+    def open_transcript(self, command_text, program):
+        transcript_dir = os.path.join(self.owner.working_directory, TRANSCRIPT_DIR)
+        name = f"{time.strftime('%Y%m%d-%H%M%S')}_{os.path.basename(program)}_{id(self):x}.log"
+        self.transcript_path = os.path.join(transcript_dir, name)
+        try:
+            os.makedirs(transcript_dir, exist_ok=True)
+            self.transcript = open(self.transcript_path, 'wb')
+            self.transcript.write(f"$ {command_text}\n".encode())
+            self.transcript_label.setText(f"Transcript: {name}")
+            self.transcript_label.setToolTip(self.transcript_path)
+        except OSError as e:
+            self.transcript = None
+            self.transcript_label.setText(f"No transcript: {e}")
+            self.transcript_label.setToolTip("")
+
+    def close_transcript(self):
+        if self.transcript:
+            self.transcript.close()
+            self.transcript = None
+
+    def handle_output(self):
+        data = self.process.readAllStandardOutput().data()
+        if self.transcript:
+            self.transcript.write(data)
+        text = self.decoder.decode(data)
+        self.pending.append(text)
+        self.pending_size += len(text)
+        # A flood of output between flushes only keeps what could be shown
+        while self.pending_size - len(self.pending[0]) > MAX_FLUSH_CHARS:
+            self.omitted += len(self.pending[0])
+            self.pending_size -= len(self.pending.pop(0))
+        if not self.flush_timer.isActive():
+            self.flush_timer.start()
+
+    def flush_output(self):
+        if not self.pending:
+            return
+        text = "".join(self.pending)
+        omitted = self.omitted
+        self.pending, self.pending_size, self.omitted = [], 0, 0
+        # Lines beyond the scrollback would only be inserted to be trimmed again,
+        # and replacing the whole document is much cheaper than that
+        replace = text.count('\n') >= SCROLLBACK_LINES
+        if replace:
+            cut = len(text)
+            for _ in range(SCROLLBACK_LINES):
+                cut = text.rfind('\n', 0, cut)
+            omitted += cut + 1
+            text = text[cut + 1:]
+        if len(text) > MAX_FLUSH_CHARS:
+            omitted += len(text) - MAX_FLUSH_CHARS
+            text = text[-MAX_FLUSH_CHARS:]
+        if omitted:
+            text = f"[... {omitted} characters not shown, see the transcript ...]\n" + text
+        # Only follow the output if the user hasn't scrolled up to read something
+        scroll_bar = self.output_display.verticalScrollBar()
+        at_bottom = scroll_bar.value() == scroll_bar.maximum()
+        if replace:
+            self.output_display.setPlainText(text)
+        else:
+            cursor = QTextCursor(self.output_display.document())
+            cursor.movePosition(QTextCursor.End)
+            cursor.insertText(text)
+        if at_bottom or replace:
+            scroll_bar.setValue(scroll_bar.maximum())
+
+    def handle_error(self, error):
+        if error == QProcess.FailedToStart:
+            self.pending.append(f"Failed to start: {self.process.errorString()}\n")
+            self.handle_finish()
+
+    def handle_finish(self):
+        self.flush_timer.stop()
+        self.flush_output()
+        self.close_transcript()
+        self.started_at = None
+        self.update_ui_for_finish()
+        self.stopped.emit()
+
+    def kill(self):
+        """Kills a running process without waiting for its signals, e.g. when the app closes."""
+        if self.is_running():
+            # Output already read from the pipe but not handled yet would be lost with the signals blocked
+            self.drain_output()
+            self.process.blockSignals(True)
+            self.process.kill()
+            self.process.waitForFinished(1000)
+            self.process.blockSignals(False)
+            self.drain_output()
+            self.handle_finish()
+
+    def drain_output(self):
+        if self.process.bytesAvailable():
+            self.handle_output()
+
+    def update_elapsed(self, now):
+        if self.started_at is not None:
+            self.timer_label.setText(format_elapsed(now - self.started_at))
+
+    def update_ui_for_start(self):
+        self.start_button.setEnabled(False)
+        self.stop_button.setEnabled(True)
+        self.command_input.setEnabled(False)
+        self.status_icon.setPixmap(self.owner.running_icon.pixmap(QSize(16, 16)))
+
+    def update_ui_for_finish(self):
+        self.start_button.setEnabled(True)
+        self.stop_button.setEnabled(False)
+        self.command_input.setEnabled(True)
+        self.status_icon.setPixmap(self.owner.stopped_icon.pixmap(QSize(16, 16)))
+        self.timer_label.setText(format_elapsed(0))
 
 class CustomCommandsWidget(QWidget):
     """
-    A widget that provides multiple terminal-like slots for running custom commands.
+    A widget that provides any number of terminal-like slots, one per tab, for
+    running custom commands.
     """
     def __init__(self, working_directory, icon_path, parent=None):
         super().__init__(parent)
         self.working_directory = working_directory
         self.icon_path = icon_path
-        self.processes = {}
-        self.timers = {}
-        self.num_slots = 4
-        self.slots = []  # To hold references to each slot's widgets
+        self.slots = []
+        self.slots_created = 0
 
         # --- Load Icons ---
         self.running_icon = QIcon(os.path.join(self.icon_path, "run.svg"))
@@ -23,156 +250,83 @@ class CustomCommandsWidget(QWidget):
 
         main_layout = QVBoxLayout(self)
 
-        # "Stop All" button
-        stop_all_layout = QHBoxLayout()
-        stop_all_layout.addStretch()
+        top_layout = QHBoxLayout()
+        add_slot_button = QPushButton("New Terminal")
+        add_slot_button.clicked.connect(lambda: self.add_slot(select=True))
+        top_layout.addWidget(add_slot_button)
+        top_layout.addStretch()
         stop_all_button = QPushButton("Stop All Running Commands")
         stop_all_button.clicked.connect(self.stop_all_processes)
-        stop_all_layout.addWidget(stop_all_button)
-        main_layout.addLayout(stop_all_layout)
-
-        # Create and connect each terminal slot
-        for i in range(self.num_slots):
-            slot_widgets = self.create_terminal_slot()
-            self.slots.append(slot_widgets)
-            main_layout.addWidget(slot_widgets['frame'])
-            
-            # Connect signals using direct references
-            slot_widgets['input'].returnPressed.connect(lambda idx=i: self.start_process(idx))
-            slot_widgets['start_btn'].clicked.connect(lambda idx=i: self.start_process(idx))
-            slot_widgets['stop_btn'].clicked.connect(lambda idx=i: self.stop_process(idx))
-
-    def create_terminal_slot(self):
-        """Creates widgets for a single slot and returns them in a dictionary."""
-        frame = QFrame()
-        frame.setFrameShape(QFrame.StyledPanel)
-        layout = QVBoxLayout(frame)
-
-        output_display = QTextEdit(readOnly=True)
-        output_display.setFont(QFont("Courier", 10))
-        layout.addWidget(output_display)
-
-        timer_label = QLabel("Elapsed: 00:00:00")
-        timer_label.setAlignment(Qt.AlignRight)
+        top_layout.addWidget(stop_all_button)
+        main_layout.addLayout(top_layout)
 
-        input_layout = QHBoxLayout()
-        status_icon_label = QLabel()
-        status_icon_label.setPixmap(self.stopped_icon.pixmap(QSize(16, 16)))
-        input_layout.addWidget(status_icon_label)
-        
-        command_input = QLineEdit()
-        command_input.setPlaceholderText("Enter command and press Enter")
-        
-        start_button = QPushButton("Run")
-        stop_button = QPushButton("Stop")
-        stop_button.setEnabled(False)
-
-        input_layout.addWidget(command_input)
-        input_layout.addWidget(start_button)
-        input_layout.addWidget(stop_button)
-        
-        bottom_layout = QHBoxLayout()
-        bottom_layout.addLayout(input_layout, 4)
-        bottom_layout.addWidget(timer_label, 1)
-        layout.addLayout(bottom_layout)
+        self.slot_tabs = QTabWidget()
+        self.slot_tabs.setTabsClosable(True)
+        self.slot_tabs.setMovable(True)
+        self.slot_tabs.tabCloseRequested.connect(self.close_slot)
+        main_layout.addWidget(self.slot_tabs)
 
-        return {
-            'frame': frame, 'output': output_display, 'input': command_input,
-            'start_btn': start_button, 'stop_btn': stop_button,
-            'timer_lbl': timer_label, 'status_icon': status_icon_label
-        }
+        # One ticker drives the elapsed-time labels of every running slot
+        self.ticker = QTimer(self)
+        self.ticker.setInterval(1000)
+        self.ticker.timeout.connect(self.tick)
 
-    def start_process(self, index):
-        """Starts a new process using direct widget references."""
-        if index in self.processes and self.processes[index]['process'].state() == QProcess.Running:
-            return
+        for _ in range(INITIAL_SLOTS):
+            self.add_slot()
 
-        slot = self.slots[index]
-        command_input = slot['input']
-        command_text = command_input.text()
-        if not command_text:
-            return
+    def add_slot(self, select=False):
+        slot = TerminalSlot(self)
+        self.slots.append(slot)
+        self.slots_created += 1
+        index = self.slot_tabs.addTab(slot, self.stopped_icon, f"Terminal {self.slots_created}")
+        slot.started.connect(lambda: self.on_slot_started(slot))
+        slot.stopped.connect(lambda: self.on_slot_stopped(slot))
+        if select:
+            self.slot_tabs.setCurrentIndex(index)
+        return slot
+
+    def close_slot(self, index):
+        slot = self.slot_tabs.widget(index)
+        if slot.is_running():
+            reply = QMessageBox.question(self, "Close Terminal", "A command is still running in this terminal. Kill it and close?",
+                                         QMessageBox.Yes | QMessageBox.No, QMessageBox.No)
+            if reply != QMessageBox.Yes:
+                return
+            slot.kill()
+        self.slot_tabs.removeTab(index)
+        self.slots.remove(slot)
+        slot.deleteLater()
+
+    def on_slot_started(self, slot):
+        self.slot_tabs.setTabIcon(self.slot_tabs.indexOf(slot), self.running_icon)
+        if not self.ticker.isActive():
+            self.ticker.start()
+
+    def on_slot_stopped(self, slot):
+        index = self.slot_tabs.indexOf(slot)
+        if index != -1:
+            self.slot_tabs.setTabIcon(index, self.stopped_icon)
+        if not any(other.is_running() for other in self.slots if other is not slot):
+            self.ticker.stop()
+
+    def tick(self):
+        now = time.monotonic()
+        for slot in self.slots:
+            slot.update_elapsed(now)
 
-        slot['output'].clear()
-        
-        process = QProcess()
-        self.processes[index] = {'process': process, 'elapsed_time': 0}
-        
-        process.setProcessChannelMode(QProcess.MergedChannels)
-        process.readyReadStandardOutput.connect(lambda: self.handle_output(index))
-        process.finished.connect(lambda: self.handle_finish(index))
-        
-        self.timers[index] = QTimer()
-        self.timers[index].timeout.connect(lambda: self.update_timer(index))
-        self.timers[index].start(1000)
-
-        process.start(shlex.split(command_text)[0], shlex.split(command_text)[1:])
-        process.setWorkingDirectory(self.working_directory)
-        self.update_ui_for_start(index)
-    
-    def stop_process(self, index):
-        if index in self.processes and self.processes[index]['process'].state() == QProcess.Running:
-            self.processes[index]['process'].kill()
-
-    def handle_output(self, index):
-        process = self.processes[index]['process']
-        output = process.readAllStandardOutput().data().decode(errors='ignore')
-        self.slots[index]['output'].append(output)
-
-    def handle_finish(self, index):
-        if index in self.timers:
-            self.timers[index].stop()
-        self.update_ui_for_finish(index)
-        
     def stop_all_processes(self):
-        for i, process_info in list(self.processes.items()):
-            process = process_info['process']
-            if process.state() == QProcess.Running:
-                process.blockSignals(True)
-                process.kill()
-                process.waitForFinished(1000)
-                process.blockSignals(False)
-                
-                if i in self.timers:
-                    self.timers[i].stop()
-                self.update_ui_for_finish(i)
-
-    def update_timer(self, index):
-        if index in self.processes:
-            self.processes[index]['elapsed_time'] += 1
-            elapsed = self.processes[index]['elapsed_time']
-            hours, rem = divmod(elapsed, 3600)
-            minutes, seconds = divmod(rem, 60)
-            self.slots[index]['timer_lbl'].setText(f"Elapsed: {int(hours):02d}:{int(minutes):02d}:{int(seconds):02d}")
-
-    def update_ui_for_start(self, index):
-        slot = self.slots[index]
-        slot['start_btn'].setEnabled(False)
-        slot['stop_btn'].setEnabled(True)
-        slot['input'].setEnabled(False)
-        slot['status_icon'].setPixmap(self.running_icon.pixmap(QSize(16, 16)))
-
-    def update_ui_for_finish(self, index):
-        if index < len(self.slots):
-            slot = self.slots[index]
-            slot['start_btn'].setEnabled(True)
-            slot['stop_btn'].setEnabled(False)
-            slot['input'].setEnabled(True)
-            slot['status_icon'].setPixmap(self.stopped_icon.pixmap(QSize(16, 16)))
-            # Reset the timer label's text
-            slot['timer_lbl'].setText("Elapsed: 00:00:00")
-            
-        if index in self.processes:
-            del self.processes[index]
-        if index in self.timers:
-            del self.timers[index]
-            
+        for slot in self.slots:
+            slot.kill()
+
     def set_working_directory(self, path):
         self.working_directory = path
 
     def add_command_to_slot(self, command):
-        for i in range(self.num_slots):
-            if not self.slots[i]['input'].text():
-                self.slots[i]['input'].setText(command)
-                return
-        QMessageBox.information(self, "No Empty Slots", "All command slots are full. Please clear one to add the new command.")
\ No newline at end of file
+        """Puts a command in the first idle, empty slot, opening a new one if there isn't any."""
+        for slot in self.slots:
+            if not slot.is_running() and not slot.command_input.text():
+                break
+        else:
+            slot = self.add_slot()
+        slot.command_input.setText(command)
+        self.slot_tabs.setCurrentWidget(slot)
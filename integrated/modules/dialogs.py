@@ -4,11 +4,22 @@ from PyQt5.QtWidgets import (
     QCheckBox, QSpinBox, QMessageBox, QInputDialog, QLabel,
     QTextEdit, QFileDialog, QSplitter, QHeaderView, QTabWidget, QComboBox
 )
-from PyQt5.QtCore import Qt
+from PyQt5.QtCore import Qt, pyqtSignal
 from utils import db as command_db
+from utils.db_worker import run_db_task
 import os
 from PyQt5.QtGui import QFont
 
+def show_table_loading(table, column):
+    """Replaces a table's contents with a single disabled 'Loading...' row."""
+    table.setRowCount(1)
+    for col in range(table.columnCount()):
+        table.removeCellWidget(0, col)
+    loading_item = QTableWidgetItem("Loading...")
+    loading_item.setFlags(Qt.NoItemFlags)
+    table.setItem(0, column, loading_item)
+    table.setEnabled(False)
+
 class TemplateEditDialog(QDialog):
     """A dialog for adding/editing a structured report template."""
     def __init__(self, parent=None, data=None):
@@ -51,6 +62,9 @@ class TemplateEditDialog(QDialog):
 
 class TemplateEditorDialog(QDialog):
     """A dialog for managing all report templates with a better view."""
+    # Emitted after a template is added, edited or deleted
+    templates_changed = pyqtSignal()
+
     def __init__(self, parent=None):
         super().__init__(parent)
         self.setWindowTitle("Report Template Manager")
@@ -83,6 +97,7 @@ class TemplateEditorDialog(QDialog):
         button_layout.addWidget(delete_btn)
         layout.addLayout(button_layout)
 
+        self.templates_data = []
         self.load_templates()
         
         self.table.itemSelectionChanged.connect(self.display_selected_template)
@@ -91,17 +106,31 @@ class TemplateEditorDialog(QDialog):
         delete_btn.clicked.connect(self.delete_row)
 
     def load_templates(self):
+        run_db_task(
+            command_db.get_all_templates,
+            on_result=self.on_templates_loaded,
+            on_error=self.show_db_error,
+            on_loading=lambda: show_table_loading(self.table, 1),
+            owner=self
+        )
+
+    def on_templates_loaded(self, templates):
         self.table.setRowCount(0)
-        self.templates_data = command_db.get_all_templates() # Store all data
+        self.table.setEnabled(True)
+        self.templates_data = templates # Store all data
         for tpl in self.templates_data:
             row_pos = self.table.rowCount()
             self.table.insertRow(row_pos)
             self.table.setItem(row_pos, 0, QTableWidgetItem(str(tpl['id'])))
             self.table.setItem(row_pos, 1, QTableWidgetItem(tpl['category']))
 
+    def on_templates_saved(self, _):
+        self.templates_changed.emit()
+        self.load_templates()
+
     def display_selected_template(self):
         selected_row = self.table.currentRow()
-        if selected_row < 0: return
+        if selected_row < 0 or selected_row >= len(self.templates_data): return
 
         template = self.templates_data[selected_row]
         preview_text = f"""
@@ -123,12 +152,14 @@ class TemplateEditorDialog(QDialog):
         dialog = TemplateEditDialog(self)
         if dialog.exec_() == QDialog.Accepted:
             data = dialog.get_data()
-            command_db.add_template(data['category'], data['description'], data['impact'], data['validation'], data['fix'])
-            self.load_templates()
+            run_db_task(
+                command_db.add_template, data['category'], data['description'], data['impact'], data['validation'], data['fix'],
+                on_result=self.on_templates_saved, on_error=self.show_db_error, owner=self
+            )
 
     def edit_row(self):
         selected_row = self.table.currentRow()
-        if selected_row < 0: return
+        if selected_row < 0 or selected_row >= len(self.templates_data): return
         
         # --- FIX: Pass the full template dictionary to the edit dialog ---
         current_data = self.templates_data[selected_row]
@@ -136,20 +167,27 @@ class TemplateEditorDialog(QDialog):
         dialog = TemplateEditDialog(self, data=current_data)
         if dialog.exec_() == QDialog.Accepted:
             new_data = dialog.get_data()
-            command_db.update_template(
+            run_db_task(
+                command_db.update_template,
                 current_data['id'], new_data['category'], new_data['description'],
-                new_data['impact'], new_data['validation'], new_data['fix']
+                new_data['impact'], new_data['validation'], new_data['fix'],
+                on_result=self.on_templates_saved, on_error=self.show_db_error, owner=self
             )
-            self.load_templates()
 
     def delete_row(self):
         selected_row = self.table.currentRow()
-        if selected_row < 0: return
-        tpl_id = int(self.table.item(selected_row, 0).text())
+        if selected_row < 0 or selected_row >= len(self.templates_data): return
+        tpl_id = self.templates_data[selected_row]['id']
         reply = QMessageBox.question(self, 'Confirm Deletion', 'Are you sure?', QMessageBox.Yes | QMessageBox.No, QMessageBox.No)
         if reply == QMessageBox.Yes:
-            command_db.delete_template(tpl_id)
-            self.load_templates()
+            run_db_task(
+                command_db.delete_template, tpl_id,
+                on_result=self.on_templates_saved, on_error=self.show_db_error, owner=self
+            )
+
+    def show_db_error(self, message):
+        self.table.setEnabled(True)
+        QMessageBox.critical(self, "Database Error", message)
 
 class DomainsFileDialog(QDialog):
     """A dialog for creating and editing a domains file."""
@@ -190,6 +228,13 @@ class CommandEditDialog(QDialog):
         
         layout = QVBoxLayout(self)
         self.command_text = QLineEdit(data['text'] if data else "")
+        self.command_text.setToolTip(
+            "Placeholders: {target_name}, {scope_file}.\n"
+            "foreach:<input file>[:<jobs>] <command> runs the command once per line of the input file,\n"
+            "several at a time, with {line}, {line_safe} (usable in filenames) and {index} filled in, e.g.\n"
+            "foreach:live_hosts:10 ffuf -u {line}/FUZZ -w words.txt -o ffuf/{line_safe}.json\n"
+            "With Use Shell, {line} is quoted for you, so don't put quotes around it."
+        )
         self.execution_order = QSpinBox()
         self.execution_order.setRange(1, 999)
         self.execution_order.setValue(data['order'] if data else 1)
@@ -250,8 +295,17 @@ class CommandEditorDialog(QDialog):
         edit_btn.clicked.connect(self.edit_row)
         delete_btn.clicked.connect(self.delete_row)
     def load_commands(self):
+        run_db_task(
+            command_db.get_all_commands,
+            on_result=self.on_commands_loaded,
+            on_error=self.show_db_error,
+            on_loading=lambda: show_table_loading(self.table, 1),
+            owner=self
+        )
+
+    def on_commands_loaded(self, commands):
         self.table.setRowCount(0)
-        commands = command_db.get_all_commands()
+        self.table.setEnabled(True)
         for cmd in commands:
             row_pos = self.table.rowCount()
             self.table.insertRow(row_pos)
@@ -274,8 +328,10 @@ class CommandEditorDialog(QDialog):
         dialog = CommandEditDialog(self)
         if dialog.exec_() == QDialog.Accepted:
             data = dialog.get_data()
-            command_db.add_command(data['text'], data['shell'], data['background'])
-            self.load_commands()
+            run_db_task(
+                command_db.add_command, data['text'], data['shell'], data['background'],
+                on_result=lambda _: self.load_commands(), on_error=self.show_db_error, owner=self
+            )
 
     def edit_row(self):
         selected_row = self.table.currentRow()
@@ -290,8 +346,10 @@ class CommandEditorDialog(QDialog):
         dialog = CommandEditDialog(self, data=current_data)
         if dialog.exec_() == QDialog.Accepted:
             new_data = dialog.get_data()
-            command_db.update_command(cmd_id, new_data['text'], new_data['shell'], new_data['order'], new_data['background'])
-            self.load_commands()
+            run_db_task(
+                command_db.update_command, cmd_id, new_data['text'], new_data['shell'], new_data['order'], new_data['background'],
+                on_result=lambda _: self.load_commands(), on_error=self.show_db_error, owner=self
+            )
 
     def delete_row(self):
         selected_row = self.table.currentRow()
@@ -299,8 +357,14 @@ class CommandEditorDialog(QDialog):
         cmd_id = int(self.table.item(selected_row, 0).text())
         reply = QMessageBox.question(self, 'Confirm Deletion', 'Are you sure?', QMessageBox.Yes | QMessageBox.No, QMessageBox.No)
         if reply == QMessageBox.Yes:
-            command_db.delete_command(cmd_id)
-            self.load_commands()
+            run_db_task(
+                command_db.delete_command, cmd_id,
+                on_result=lambda _: self.load_commands(), on_error=self.show_db_error, owner=self
+            )
+
+    def show_db_error(self, message):
+        self.table.setEnabled(True)
+        QMessageBox.critical(self, "Database Error", message)
 
 class SudoCommandEditorDialog(QDialog):
     """A dialog for adding/deleting commands in the sudo_commands table."""
@@ -332,8 +396,17 @@ class SudoCommandEditorDialog(QDialog):
         delete_btn.clicked.connect(self.delete_command)
 
     def load_commands(self):
+        run_db_task(
+            command_db.get_all_sudo_commands,
+            on_result=self.on_commands_loaded,
+            on_error=self.show_db_error,
+            on_loading=lambda: show_table_loading(self.table, 1),
+            owner=self
+        )
+
+    def on_commands_loaded(self, commands):
         self.table.setRowCount(0)
-        commands = command_db.get_all_sudo_commands()
+        self.table.setEnabled(True)
         for cmd in commands:
             row_pos = self.table.rowCount()
             self.table.insertRow(row_pos)
@@ -345,8 +418,10 @@ class SudoCommandEditorDialog(QDialog):
         if ok and text:
             if not text.strip().startswith('sudo'):
                 text = f"sudo {text.strip()}"
-            command_db.add_sudo_command(text)
-            self.load_commands()
+            run_db_task(
+                command_db.add_sudo_command, text,
+                on_result=lambda _: self.load_commands(), on_error=self.show_db_error, owner=self
+            )
 
     def delete_command(self):
         selected_row = self.table.currentRow()
@@ -358,8 +433,14 @@ class SudoCommandEditorDialog(QDialog):
         reply = QMessageBox.question(self, 'Confirm Deletion', 'Are you sure?', QMessageBox.Yes | QMessageBox.No, QMessageBox.No)
         
         if reply == QMessageBox.Yes:
-            command_db.delete_sudo_command(cmd_id)
-            self.load_commands()
+            run_db_task(
+                command_db.delete_sudo_command, cmd_id,
+                on_result=lambda _: self.load_commands(), on_error=self.show_db_error, owner=self
+            )
+
+    def show_db_error(self, message):
+        self.table.setEnabled(True)
+        QMessageBox.critical(self, "Database Error", message)
 
 class FuzzerDialog(QDialog):
     """A dialog for building and saving FFUF commands."""
@@ -461,3 +542,39 @@ class FuzzerDialog(QDialog):
 
         self.command = f"ffuf -w \"{wordlist}\" -u {url} -t {threads} -timeout {timeout} {redirects}"
         self.accept()
+
+class StallReportDialog(QDialog):
+    """Shows the main-thread stalls a StallWatchdog has caught, grouped by call site."""
+    def __init__(self, watchdog, parent=None):
+        super().__init__(parent)
+        self.watchdog = watchdog
+        self.setWindowTitle("GUI Stall Report")
+        self.setGeometry(200, 200, 900, 600)
+
+        layout = QVBoxLayout(self)
+        self.report_view = QTextEdit(readOnly=True)
+        self.report_view.setFont(QFont("Courier New"))
+        self.report_view.setLineWrapMode(QTextEdit.NoWrap)
+        layout.addWidget(self.report_view)
+
+        button_layout = QHBoxLayout()
+        refresh_btn = QPushButton("Refresh")
+        clear_btn = QPushButton("Clear")
+        close_btn = QPushButton("Close")
+        button_layout.addStretch()
+        button_layout.addWidget(refresh_btn)
+        button_layout.addWidget(clear_btn)
+        button_layout.addWidget(close_btn)
+        layout.addLayout(button_layout)
+
+        refresh_btn.clicked.connect(self.refresh)
+        clear_btn.clicked.connect(self.clear)
+        close_btn.clicked.connect(self.accept)
+        self.refresh()
+
+    def refresh(self):
+        self.report_view.setPlainText(self.watchdog.report())
+
+    def clear(self):
+        self.watchdog.clear()
+        self.refresh()
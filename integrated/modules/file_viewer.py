@@ -0,0 +1,384 @@
+import os
+from PyQt5.QtWidgets import (
+    QDialog, QVBoxLayout, QHBoxLayout, QLabel, QLineEdit, QPushButton, QCheckBox,
+    QListWidget, QListWidgetItem, QSplitter, QMenu, QApplication, QAbstractScrollArea
+)
+from PyQt5.QtCore import Qt, QTimer, QFileSystemWatcher, pyqtSignal
+from PyQt5.QtGui import QFont, QFontMetrics, QIntValidator, QPainter, QPalette, QKeySequence
+from utils.line_index import LineIndex, LineCache, FileReader
+from utils.line_index_worker import LineIndexWorker, LineSearchWorker
+
+# The clipboard isn't meant for gigabytes; bigger selections aren't copied
+MAX_COPY_LINES = 100000
+GUTTER_PADDING = 8
+
+class LineView(QAbstractScrollArea):
+    """
+    Shows lines from a LineCache with line numbers, painting only the rows
+    that fit in the viewport; the vertical scroll bar counts lines, so the
+    cost of showing a file doesn't depend on how many lines it has.
+    """
+    copy_refused = pyqtSignal(str)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.lines = None
+        self.line_count = 0
+        self.current_line = -1
+        self.anchor_line = -1
+        self.widest_line = 0
+        self.viewport().setFont(QFont("Courier", 10))
+        self.metrics = QFontMetrics(self.viewport().font())
+        self.line_height = self.metrics.height()
+        self.setFocusPolicy(Qt.StrongFocus)
+        self.setContextMenuPolicy(Qt.CustomContextMenu)
+        self.customContextMenuRequested.connect(self.open_context_menu)
+
+    def visible_rows(self):
+        return max(self.viewport().height() // self.line_height, 1)
+
+    def set_lines(self, lines, line_count):
+        self.lines = lines
+        self.line_count = line_count
+        if line_count == 0:
+            self.current_line = self.anchor_line = -1
+            self.widest_line = 0
+        self.update_scroll_bars()
+        self.viewport().update()
+
+    def update_scroll_bars(self):
+        rows = self.visible_rows()
+        self.verticalScrollBar().setRange(0, max(self.line_count - rows, 0))
+        self.verticalScrollBar().setPageStep(rows)
+        self.horizontalScrollBar().setRange(0, max(self.gutter_width() + self.widest_line - self.viewport().width(), 0))
+        self.horizontalScrollBar().setPageStep(self.viewport().width())
+        self.horizontalScrollBar().setSingleStep(self.metrics.averageCharWidth() * 4)
+
+    def gutter_width(self):
+        return self.metrics.horizontalAdvance("9" * len(str(max(self.line_count, 1)))) + GUTTER_PADDING * 2
+
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        self.update_scroll_bars()
+
+    def paintEvent(self, event):
+        painter = QPainter(self.viewport())
+        palette = self.viewport().palette()
+        first = self.verticalScrollBar().value()
+        last = min(first + self.visible_rows() + 1, self.line_count)
+        gutter = self.gutter_width()
+        x_offset = self.horizontalScrollBar().value()
+        ascent = self.metrics.ascent()
+        selection = sorted((self.anchor_line, self.current_line)) if self.current_line >= 0 else None
+        widest = self.widest_line
+        for row in range(first, last):
+            y = (row - first) * self.line_height
+            text = self.lines.line(row)
+            if selection and selection[0] <= row <= selection[1]:
+                painter.fillRect(0, y, self.viewport().width(), self.line_height, palette.color(QPalette.Highlight))
+                painter.setPen(palette.color(QPalette.HighlightedText))
+            else:
+                painter.setPen(palette.color(QPalette.Text))
+            painter.drawText(gutter - x_offset, y + ascent, text)
+            painter.setPen(palette.color(QPalette.Mid))
+            painter.drawText(GUTTER_PADDING - x_offset, y + ascent, str(row + 1))
+            widest = max(widest, self.metrics.horizontalAdvance(text))
+        painter.end()
+        if widest > self.widest_line:
+            # Lines never seen can't be measured; widen the scroll range as wider ones show up
+            self.widest_line = widest
+            self.update_scroll_bars()
+
+    def line_at(self, y):
+        return min(self.verticalScrollBar().value() + y // self.line_height, self.line_count - 1)
+
+    def set_current_line(self, line, extend=False):
+        if self.line_count == 0:
+            return
+        self.current_line = max(0, min(line, self.line_count - 1))
+        if not extend:
+            self.anchor_line = self.current_line
+        self.ensure_visible(self.current_line)
+        self.viewport().update()
+
+    def ensure_visible(self, line, center=False):
+        scroll_bar = self.verticalScrollBar()
+        rows = self.visible_rows()
+        if center:
+            scroll_bar.setValue(line - rows // 2)
+        elif line < scroll_bar.value():
+            scroll_bar.setValue(line)
+        elif line >= scroll_bar.value() + rows:
+            scroll_bar.setValue(line - rows + 1)
+
+    def go_to_line(self, line):
+        self.set_current_line(line)
+        self.ensure_visible(self.current_line, center=True)
+
+    def scroll_to_bottom(self):
+        self.verticalScrollBar().setValue(self.verticalScrollBar().maximum())
+
+    def mousePressEvent(self, event):
+        if event.button() == Qt.LeftButton and self.line_count:
+            self.set_current_line(self.line_at(event.y()), extend=bool(event.modifiers() & Qt.ShiftModifier))
+        super().mousePressEvent(event)
+
+    def mouseMoveEvent(self, event):
+        if event.buttons() & Qt.LeftButton and self.line_count:
+            self.set_current_line(self.line_at(max(event.y(), 0)), extend=True)
+
+    def keyPressEvent(self, event):
+        if event.matches(QKeySequence.Copy):
+            self.copy_selected_lines()
+            return
+        steps = {Qt.Key_Up: -1, Qt.Key_Down: 1, Qt.Key_PageUp: -self.visible_rows(), Qt.Key_PageDown: self.visible_rows()}
+        extend = bool(event.modifiers() & Qt.ShiftModifier)
+        if event.key() in steps:
+            self.set_current_line(max(self.current_line, 0) + steps[event.key()], extend)
+        elif event.key() == Qt.Key_Home:
+            self.set_current_line(0, extend)
+        elif event.key() == Qt.Key_End:
+            self.set_current_line(self.line_count - 1, extend)
+        else:
+            super().keyPressEvent(event)
+
+    def open_context_menu(self, position):
+        menu = QMenu()
+        copy_action = menu.addAction("Copy Selected Lines")
+        copy_action.setEnabled(self.current_line >= 0)
+        if menu.exec_(self.viewport().mapToGlobal(position)) == copy_action:
+            self.copy_selected_lines()
+
+    def copy_selected_lines(self):
+        if self.current_line < 0:
+            return
+        first, last = sorted((self.anchor_line, self.current_line))
+        if last - first + 1 > MAX_COPY_LINES:
+            self.copy_refused.emit(f"Select at most {MAX_COPY_LINES:,} lines to copy")
+            return
+        QApplication.clipboard().setText("\n".join(self.lines.line(row) for row in range(first, last + 1)))
+
+class FileViewerWindow(QDialog):
+    """
+    A read-only viewer for text files of any size, such as terminal
+    transcripts and tool output. Lines are indexed on a worker thread and
+    read by offset with os.pread; only the lines on screen are ever read.
+    """
+    def __init__(self, file_path, parent=None):
+        super().__init__(parent)
+        self.file_path = file_path
+        self.setWindowTitle(f"File Viewer - {os.path.basename(file_path)}")
+        self.setGeometry(150, 150, 1100, 700)
+
+        main_layout = QVBoxLayout(self)
+        top_bar_layout = QHBoxLayout()
+        self.status_label = QLabel("Indexing...")
+        top_bar_layout.addWidget(self.status_label)
+        top_bar_layout.addStretch()
+        self.follow_checkbox = QCheckBox("Follow")
+        self.follow_checkbox.setToolTip("Keep the last line in view as the file grows")
+        top_bar_layout.addWidget(self.follow_checkbox)
+        self.goto_input = QLineEdit()
+        self.goto_input.setPlaceholderText("Go to line")
+        self.goto_input.setValidator(QIntValidator(1, 2 ** 31 - 1, self))
+        self.goto_input.setMaximumWidth(120)
+        self.goto_input.returnPressed.connect(lambda: self.line_view.go_to_line(int(self.goto_input.text() or 1) - 1))
+        top_bar_layout.addWidget(self.goto_input)
+        main_layout.addLayout(top_bar_layout)
+
+        search_bar_layout = QHBoxLayout()
+        self.search_input = QLineEdit()
+        self.search_input.setPlaceholderText("Regex search, e.g. password|api[_-]?key")
+        self.search_input.returnPressed.connect(self.toggle_search)
+        self.case_checkbox = QCheckBox("Case sensitive")
+        self.search_button = QPushButton("Search")
+        self.search_button.clicked.connect(self.toggle_search)
+        self.search_label = QLabel()
+        search_bar_layout.addWidget(self.search_input)
+        search_bar_layout.addWidget(self.case_checkbox)
+        search_bar_layout.addWidget(self.search_button)
+        search_bar_layout.addWidget(self.search_label)
+        main_layout.addLayout(search_bar_layout)
+
+        splitter = QSplitter(Qt.Vertical)
+        self.line_view = LineView()
+        self.line_view.copy_refused.connect(self.status_label.setText)
+        self.results_list = QListWidget()
+        self.results_list.setFont(QFont("Courier", 10))
+        self.results_list.setUniformItemSizes(True)
+        self.results_list.currentItemChanged.connect(
+            lambda item, _: item is not None and self.line_view.go_to_line(item.data(Qt.UserRole))
+        )
+        self.results_list.setVisible(False)
+        splitter.addWidget(self.line_view)
+        splitter.addWidget(self.results_list)
+        splitter.setSizes([500, 150])
+        main_layout.addWidget(splitter)
+
+        self.line_index = LineIndex()
+        self.lines = LineCache(self.line_index)
+        self.line_count = 0
+        self.reader = None
+        self.file_size = 0 # Bytes indexed so far; nothing past it is read
+        self.index_worker = None
+        self.reindex_pending = False
+        self.search_worker = None
+        self.search_failed = False
+
+        self.file_watcher = QFileSystemWatcher([file_path], self)
+        self.file_watcher.fileChanged.connect(self.on_file_changed)
+        # Writers append in bursts; look at the file once per burst
+        self.growth_timer = QTimer(self)
+        self.growth_timer.setSingleShot(True)
+        self.growth_timer.setInterval(250)
+        self.growth_timer.timeout.connect(self.check_growth)
+        self.start_indexing()
+
+    def start_indexing(self):
+        """Indexes whatever was written past the current index, on a worker thread."""
+        if self.index_worker and self.index_worker.isRunning():
+            self.reindex_pending = True
+            return
+        self.index_worker = LineIndexWorker(self.file_path, self.line_index, self)
+        self.index_worker.lines_indexed.connect(self.on_lines_indexed)
+        self.index_worker.error.connect(self.status_label.setText)
+        self.index_worker.finished.connect(self.on_indexing_finished)
+        self.index_worker.start()
+
+    def on_lines_indexed(self, line_count, indexed_bytes, scanned_bytes):
+        # Progress still queued from a worker stopped because the file was rewritten
+        if self.sender() is not self.index_worker:
+            return
+        if self.reader is None:
+            self.open_reader()
+            if self.reader is None:
+                return
+        self.file_size = self.lines.end = max(self.file_size, scanned_bytes)
+        # The old last line may have been unterminated and grown since
+        self.lines.forget(self.line_count - 1)
+        # Bytes after the last newline are shown as a last line that may still grow
+        self.line_count = line_count + (scanned_bytes > indexed_bytes)
+        self.line_view.set_lines(self.lines, self.line_count)
+        self.status_label.setText(f"Indexing... {self.line_count:,} lines ({scanned_bytes * 100 // max(self.reader.size(), 1)}%)")
+        if self.follow_checkbox.isChecked():
+            self.line_view.scroll_to_bottom()
+
+    def on_indexing_finished(self):
+        if self.reindex_pending:
+            self.reindex_pending = False
+            self.start_indexing()
+            return
+        self.status_label.setText(f"{self.line_count:,} lines, {self.file_size:,} bytes")
+
+    def open_reader(self):
+        try:
+            self.reader = FileReader(self.file_path)
+        except OSError as e:
+            self.status_label.setText(f"Could not read {os.path.basename(self.file_path)}: {e}")
+            return
+        self.lines.reader = self.reader
+
+    def on_file_changed(self, path):
+        # Writers that replace the file make the watcher drop it; watch the new one
+        if path not in self.file_watcher.files() and os.path.exists(path):
+            self.file_watcher.addPath(path)
+        # Truncation is handled at once so nothing is drawn from the old contents;
+        # growth is picked up once per burst
+        if not self.check_rewritten() and not self.growth_timer.isActive():
+            self.growth_timer.start()
+
+    def check_rewritten(self):
+        """Starts over if the file was truncated or replaced; returns whether it was."""
+        try:
+            stat = os.stat(self.file_path)
+        except OSError:
+            return False
+        replaced = self.reader is not None and stat.st_ino != self.reader.inode()
+        if stat.st_size >= max(self.line_index.indexed_bytes, self.file_size) and not replaced:
+            return False
+        self.stop_worker(self.index_worker)
+        self.reindex_pending = False
+        self.close_file()
+        self.line_index = LineIndex()
+        self.lines = LineCache(self.line_index)
+        self.start_indexing()
+        return True
+
+    def check_growth(self):
+        if self.check_rewritten():
+            return
+        try:
+            size = os.path.getsize(self.file_path)
+        except OSError:
+            return
+        if size > self.file_size:
+            self.start_indexing()
+
+    def toggle_search(self):
+        if self.search_worker and self.search_worker.isRunning():
+            self.search_worker.stop()
+            return
+        pattern = self.search_input.text()
+        self.results_list.clear()
+        if not pattern or self.reader is None:
+            self.results_list.setVisible(False)
+            self.search_label.setText("")
+            return
+        self.results_list.setVisible(True)
+        self.search_failed = False
+        self.search_worker = LineSearchWorker(self.file_path, pattern, self.file_size, not self.case_checkbox.isChecked(), self)
+        self.search_worker.matches_found.connect(self.on_matches_found)
+        self.search_worker.progress_updated.connect(
+            lambda pos, end: self.search_label.setText(f"Searching... {self.results_list.count():,} lines ({pos * 100 // max(end, 1)}%)")
+        )
+        self.search_worker.error.connect(self.on_search_error)
+        self.search_worker.finished.connect(self.on_search_finished)
+        self.search_button.setText("Stop")
+        self.search_label.setText("Searching...")
+        self.search_worker.start()
+
+    def on_matches_found(self, matches):
+        self.results_list.setUpdatesEnabled(False)
+        for line, text in matches:
+            item = QListWidgetItem(f"{line + 1}: {text}")
+            item.setData(Qt.UserRole, line)
+            self.results_list.addItem(item)
+        self.results_list.setUpdatesEnabled(True)
+
+    def on_search_error(self, message):
+        self.search_failed = True
+        self.search_label.setText(message)
+
+    def on_search_finished(self):
+        self.search_button.setText("Search")
+        worker = self.search_worker
+        if self.search_failed:
+            return
+        if worker.result_count >= worker.MAX_RESULTS:
+            self.search_label.setText(f"First {worker.MAX_RESULTS:,} matching lines")
+        elif worker.is_running:
+            self.search_label.setText(f"{worker.result_count:,} matching lines")
+        else:
+            self.search_label.setText(f"{worker.result_count:,} matching lines (stopped)")
+
+    def stop_worker(self, worker):
+        if worker and worker.isRunning():
+            worker.stop()
+            worker.wait()
+
+    def close_file(self):
+        self.line_count = 0
+        self.file_size = 0
+        self.line_view.set_lines(None, 0)
+        if self.reader is not None:
+            self.reader.close()
+            self.reader = None
+
+    def done(self, result):
+        """Stops the background workers and closes the file before the window goes away."""
+        self.stop_worker(self.index_worker)
+        self.stop_worker(self.search_worker)
+        self.growth_timer.stop()
+        self.file_watcher.removePaths(self.file_watcher.files())
+        self.close_file()
+        super().done(result)
@@ -0,0 +1,31 @@
+from PyQt5.QtWidgets import QWidget, QVBoxLayout
+from utils import startup_timing
+
+class LazyTab(QWidget):
+    """
+    A tab page that builds its real widget the first time it is shown (or
+    asked for), so that the widget's module and its dependencies are only
+    imported when needed.
+    """
+    def __init__(self, name, factory, parent=None):
+        super().__init__(parent)
+        self.name = name
+        self.factory = factory
+        self.content = None
+        self.content_layout = QVBoxLayout(self)
+        self.content_layout.setContentsMargins(0, 0, 0, 0)
+
+    def is_built(self):
+        return self.content is not None
+
+    def widget(self):
+        """Returns the real tab widget, constructing it on first use."""
+        if self.content is None:
+            with startup_timing.timed(f"build {self.name} tab"):
+                self.content = self.factory()
+            self.content_layout.addWidget(self.content)
+        return self.content
+
+    def showEvent(self, event):
+        self.widget()
+        super().showEvent(event)
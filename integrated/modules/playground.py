@@ -1,89 +1,104 @@
 import os
-import re
-from urllib.parse import urlparse
-from collections import Counter
+import time
 import webbrowser
 from PyQt5.QtWidgets import (
     QWidget, QVBoxLayout, QTreeWidget, QTreeWidgetItem, QDialog,
     QTableView, QHeaderView, QMessageBox, QPushButton, QHBoxLayout,
-    QTextEdit, QDialogButtonBox, QTabWidget, QListWidget, QLabel, QMenu
+    QTextEdit, QDialogButtonBox, QTabWidget, QListWidget, QLabel, QMenu,
+    QProgressBar, QLineEdit, QListView, QFileDialog, QCheckBox, QSpinBox, QSizePolicy
 )
-from PyQt5.QtCore import Qt
-from PyQt5.QtGui import QIcon, QStandardItemModel, QStandardItem, QColor, QBrush
+from PyQt5.QtCore import Qt, QTimer, QFileSystemWatcher, QRect
+from PyQt5.QtGui import QIcon, QPainter
 from utils import db as command_db
+from utils.db_worker import run_db_task
+from utils.httpx_data import HttpxDataset, IntColumn, CHUNK_SIZE, parse_httpx_tail, looks_like_httpx
+from utils.parse_worker import HttpxParseWorker, FacetIndexWorker
+from utils.url_classifier import get_url_classifier
+from utils.risk_worker import RiskAnalysisWorker
+from utils.chart_data import DEFAULT_TOP_N, DARK_THEME, LIGHT_THEME, bar_chart_spec, pie_chart_spec, histogram_spec
 from .dialogs import FuzzerDialog
+from .file_viewer import FileViewerWindow
+from .results_model import ResultsTableModel, IndexSortProxyModel, UrlListModel
 import subprocess
 
-# --- Matplotlib Integration ---
-from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
-from matplotlib.figure import Figure
-import matplotlib.pyplot as plt
-
-class StatsChartCanvas(FigureCanvas):
-    """A custom canvas for displaying matplotlib charts within a PyQt dialog."""
-    def __init__(self, parent=None, width=5, height=4, dpi=100):
-        is_dark_theme = "dark" in parent.styleSheet().lower()
-
-        if is_dark_theme:
-            plt.style.use('dark_background')
-            self.fig = Figure(figsize=(width, height), dpi=dpi, facecolor='#2e3440')
-            self.axes = self.fig.add_subplot(111, facecolor='#2e3440')
-            self.axes.tick_params(axis='x', colors='white')
-            self.axes.tick_params(axis='y', colors='white')
-            self.axes.xaxis.label.set_color('white')
-            self.axes.yaxis.label.set_color('white')
-            self.axes.title.set_color('white')
-        else:
-            plt.style.use('default')
-            self.fig = Figure(figsize=(width, height), dpi=dpi)
-            self.axes = self.fig.add_subplot(111)
-
-        super().__init__(self.fig)
-        self.setParent(parent)
-
-    def plot_histogram(self, data, title):
-        self.axes.clear()
-        self.axes.hist(data, bins=20, color='#88c0d0', edgecolor='#2e3440' if "dark" in self.parent().styleSheet().lower() else "white", linewidth=1.5)
-        self.axes.set_title(title, fontsize=14, fontweight='bold')
-        self.axes.set_xlabel("Value", fontsize=12)
-        self.axes.set_ylabel("Frequency", fontsize=12)
-        self.fig.tight_layout()
-        self.draw()
-
-    def plot_bar_chart(self, labels, values, title, xlabel='Count'):
-        """Generic horizontal bar chart plotting with improved layout."""
-        self.axes.clear()
-        y_pos = range(len(labels))
-        self.axes.barh(y_pos, values, align='center', color='#81a1c1', height=0.6)
-        self.axes.set_yticks(y_pos)
-        self.axes.set_yticklabels(labels, fontsize=9)
-        self.axes.invert_yaxis()
-        self.axes.set_xlabel(xlabel, fontsize=10)
-        self.axes.set_title(title, fontsize=12, fontweight='bold')
-        # Adjust layout to prevent labels from being cut off
-        self.fig.tight_layout(rect=[0.1, 0, 0.9, 1])
-        self.draw()
-
-    def plot_pie_chart(self, labels, sizes, title):
-        """Plots a pie chart."""
-        self.axes.clear()
-        is_dark_theme = "dark" in self.parent().styleSheet().lower()
-        colors = ['#5e81ac', '#bf616a', '#d08770', '#a3be8c', '#b48ead']
-        
-        textprops = {'color': 'white' if is_dark_theme else 'black'}
-        
-        self.axes.pie(sizes, labels=labels, autopct='%1.1f%%',
-                      shadow=True, startangle=90, colors=colors, textprops=textprops)
-        self.axes.axis('equal')
-        self.axes.set_title(title, fontsize=12, fontweight='bold')
-        self.fig.tight_layout()
-        self.draw()
+class StatsChartCanvas(QWidget):
+    """
+    Displays charts that are rendered into an image on a worker thread, so
+    the GUI thread only ever paints a finished picture.
+    """
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.theme = DARK_THEME if "dark" in parent.styleSheet().lower() else LIGHT_THEME
+        self.setMinimumSize(300, 200)
+        self.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Expanding)
+        self.spec = None
+        self.image = None
+        self.message = "Select a chart on the left."
+        self.generation = 0
+        self.workers = set()
+        # Re-render at the new size once resizing settles; until then the old image is scaled
+        self.resize_timer = QTimer(self)
+        self.resize_timer.setSingleShot(True)
+        self.resize_timer.setInterval(200)
+        self.resize_timer.timeout.connect(self.render_chart)
+
+    def show_chart(self, spec):
+        self.spec = spec
+        self.render_chart()
+
+    def render_chart(self):
+        if self.spec is None:
+            return
+        # matplotlib takes a while to import; only pay for it once a chart is wanted
+        from utils.chart_worker import ChartRenderWorker
+        self.generation += 1
+        self.message = "Rendering..."
+        self.update()
+        worker = ChartRenderWorker(self.generation, self.spec, max(self.width(), 300), max(self.height(), 200), self.theme, self)
+        worker.image_ready.connect(self.on_image_ready)
+        worker.error.connect(self.on_render_error)
+        worker.finished.connect(lambda: self.workers.discard(worker))
+        self.workers.add(worker)
+        worker.start()
+
+    def on_image_ready(self, generation, image):
+        # Only the latest request counts; earlier ones may finish out of order
+        if generation == self.generation:
+            self.image = image
+            self.message = ""
+            self.update()
+
+    def on_render_error(self, generation, message):
+        if generation == self.generation:
+            self.image = None
+            self.message = message
+            self.update()
+
+    def paintEvent(self, event):
+        painter = QPainter(self)
+        if self.image is not None:
+            scaled = self.image.size().scaled(self.size(), Qt.KeepAspectRatio)
+            target = QRect(0, 0, scaled.width(), scaled.height())
+            target.moveCenter(self.rect().center())
+            painter.drawImage(target, self.image)
+        if self.message:
+            painter.drawText(self.rect(), Qt.AlignCenter, self.message)
+
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        if self.spec is not None:
+            self.resize_timer.start()
+
+    def wait_for_workers(self):
+        for worker in list(self.workers):
+            worker.wait()
 
 class StatisticsDialog(QDialog):
     """A dialog with tabs for textual and graphical statistics."""
     def __init__(self, model, parent=None):
         super().__init__(parent)
         self.model = model
+        self.dataset = model.dataset
         self.setWindowTitle("Dataset Statistics")
         self.setGeometry(200, 200, 800, 600)
         layout = QVBoxLayout(self)
@@ -101,11 +116,25 @@ class StatisticsDialog(QDialog):
         # Charts Tab
         charts_widget = QWidget()
         charts_layout = QHBoxLayout(charts_widget)
+        chart_picker_layout = QVBoxLayout()
         self.column_list = QListWidget()
         self.column_list.setMaximumWidth(200)
         self.column_list.itemClicked.connect(self.update_chart)
+        chart_picker_layout.addWidget(self.column_list)
+        # Bar charts show the top N values plus an 'Other' bar, whatever the dataset size
+        top_n_layout = QHBoxLayout()
+        top_n_layout.addWidget(QLabel("Top N:"))
+        self.top_n_spinbox = QSpinBox()
+        self.top_n_spinbox.setRange(5, 100)
+        self.top_n_spinbox.setValue(DEFAULT_TOP_N)
+        self.top_n_spinbox.valueChanged.connect(self.refresh_chart)
+        top_n_layout.addWidget(self.top_n_spinbox)
+        chart_picker_layout.addLayout(top_n_layout)
+        self.log_scale_checkbox = QCheckBox("Log scale")
+        self.log_scale_checkbox.toggled.connect(self.refresh_chart)
+        chart_picker_layout.addWidget(self.log_scale_checkbox)
         self.chart_canvas = StatsChartCanvas(parent=self)
-        charts_layout.addWidget(self.column_list)
+        charts_layout.addLayout(chart_picker_layout)
         charts_layout.addWidget(self.chart_canvas)
         tab_widget.addTab(charts_widget, "Charts")
         
@@ -118,49 +147,44 @@ class StatisticsDialog(QDialog):
         self.populate_chart_columns()
 
     def calculate_and_display_text_stats(self):
-        """Calculates and displays statistics for each column in the model."""
+        """Displays statistics for each column; the numbers are computed once per dataset and cached."""
         stats_report = []
-        for col in range(self.model.columnCount()):
-            header = self.model.horizontalHeaderItem(col).text()
-            if header == '⭐': continue # Skip the star column
+        for header, field in zip(self.model.HEADERS, self.model.FIELDS):
+            if field is None: continue # Skip the star column
 
             stats_report.append(f"--- Statistics for Column: '{header}' ---\n")
-            values = [self.model.item(row, col).text() for row in range(self.model.rowCount()) if self.model.item(row, col)]
+            column = self.dataset.columns[field]
             
-            if not values:
+            if len(column) == 0:
                 stats_report.append("No data in this column.\n\n")
                 continue
 
-            try:
-                numeric_values = [float(v) for v in values]
-                is_numeric = True
-            except (ValueError, TypeError):
-                is_numeric = False
-            
-            if is_numeric:
-                count = len(numeric_values)
-                mean = sum(numeric_values) / count
-                median = sorted(numeric_values)[count // 2]
-                std_dev = (sum((x - mean) ** 2 for x in numeric_values) / count) ** 0.5
+            if isinstance(column, IntColumn):
+                summary = self.dataset.numeric_summary(field)
                 stats_report.extend([
-                    f"  Type: Numeric",
-                    f"  Count: {count}",
-                    f"  Mean: {mean:.2f}",
-                    f"  Median: {median}",
-                    f"  Std Dev: {std_dev:.2f}",
-                    f"  Min: {min(numeric_values)}",
-                    f"  Max: {max(numeric_values)}\n"
+                    "  Type: Numeric",
+                    f"  Count: {summary['count']}",
+                    f"  Mean: {summary['mean']:.2f}",
+                    f"  Median: {summary['p50']:g}",
+                    f"  Std Dev: {summary['std']:.2f}",
+                    f"  Min: {summary['min']}",
+                    f"  Max: {summary['max']}",
+                    f"  Percentiles: p25={summary['p25']:g}  p75={summary['p75']:g}  p90={summary['p90']:g}  p99={summary['p99']:g}\n"
                 ])
+                if field == 'status_code':
+                    stats_report.append("  Status Classes:")
+                    stats_report.extend([f"    - {label}: {count}" for label, count in self.dataset.status_class_counts().items()])
+                    stats_report.append("")
             else:
-                value_counts = Counter(values)
+                values, counts = self.dataset.value_counts(field)
                 stats_report.extend([
-                    f"  Type: Textual",
-                    f"  Total Rows: {len(values)}",
-                    f"  Unique Values: {len(value_counts)}\n",
+                    "  Type: Textual",
+                    f"  Total Rows: {len(column)}",
+                    f"  Unique Values: {len(values)}\n",
                     "  Most Common Values:"
                 ])
-                stats_report.extend([f"    - '{value}': {count} occurrences" for value, count in value_counts.most_common(15)])
-                if len(value_counts) > 15:
+                stats_report.extend([f"    - '{value}': {count} occurrences" for value, count in zip(values[:15], counts[:15])])
+                if len(values) > 15:
                     stats_report.append("    - ...and more.\n")
             
             stats_report.append("\n")
@@ -172,131 +196,143 @@ class StatisticsDialog(QDialog):
         self.column_list.clear()
         self.column_list.addItem("Status Code Distribution (Pie Chart)") # Custom pie chart
         
-        for col in range(self.model.columnCount()):
-            header = self.model.horizontalHeaderItem(col).text()
+        for header in self.model.HEADERS:
             if header in ['Status Code', 'Length', 'Technology', 'Title']: # Only show relevant columns for charting
                 self.column_list.addItem(header)
 
+    def refresh_chart(self):
+        if self.column_list.currentItem() is not None:
+            self.update_chart(self.column_list.currentItem())
+
     def update_chart(self, item):
+        """Builds a small, pre-aggregated chart spec from the cached statistics and renders it off-thread."""
         col_name = item.text()
+        top_n = self.top_n_spinbox.value()
+        log_scale = self.log_scale_checkbox.isChecked()
 
         if col_name == "Status Code Distribution (Pie Chart)":
-            status_codes = [int(self.model.item(row, 5).text()) for row in range(self.model.rowCount())]
-            
-            status_groups = {'2xx (Success)': 0, '3xx (Redirection)': 0, '4xx (Client Error)': 0, '5xx (Server Error)': 0, 'Other': 0}
-            for code in status_codes:
-                if 200 <= code < 300: status_groups['2xx (Success)'] += 1
-                elif 300 <= code < 400: status_groups['3xx (Redirection)'] += 1
-                elif 400 <= code < 500: status_groups['4xx (Client Error)'] += 1
-                elif 500 <= code < 600: status_groups['5xx (Server Error)'] += 1
-                else: status_groups['Other'] += 1
-            
-            # FIX: Correctly filter and extract labels and sizes
-            labels = [k for k, v in status_groups.items() if v > 0]
-            sizes = [v for k, v in status_groups.items() if v > 0]
-
-            if labels:
-                self.chart_canvas.plot_pie_chart(labels, sizes, "Status Code Distribution")
+            status_groups = self.dataset.status_class_counts()
+            if status_groups:
+                self.chart_canvas.show_chart(pie_chart_spec(status_groups, status_groups.values(), "Status Code Distribution"))
             return
 
-        header_map = {self.model.horizontalHeaderItem(i).text(): i for i in range(self.model.columnCount())}
-        col_index = header_map.get(col_name)
-        
-        if col_index is None: return
-
-        values = [self.model.item(row, col_index).text() for row in range(self.model.rowCount())]
+        if col_name not in self.model.HEADERS: return
+        field = self.model.FIELDS[self.model.HEADERS.index(col_name)]
 
         if col_name == 'Length':
-            # Create a sorted bar chart for all lengths
-            numeric_values = sorted([(int(v), self.model.item(i, 2).text()) for i, v in enumerate(values) if v.isdigit()], reverse=True)
-            if not numeric_values: return
-            lengths, hosts = zip(*numeric_values)
-            self.chart_canvas.plot_bar_chart(hosts, lengths, "Content Length by Host", xlabel="Length (bytes)")
+            if len(self.dataset) == 0: return
+            self.chart_canvas.show_chart(histogram_spec(
+                self.dataset.columns[field].values, "Content Length Distribution", log_scale=log_scale, xlabel="Length (bytes)"
+            ))
         elif col_name in ['Technology', 'Title', 'Status Code']:
-            # Use the bar chart logic for all items
-            counts = Counter(values)
-            all_items = counts.most_common() # Get all items
-            if not all_items: return
-            labels, data = zip(*all_items)
-            self.chart_canvas.plot_bar_chart(labels, data, f"Distribution of {col_name}s")
+            labels, data = self.dataset.value_counts(field)
+            if not labels: return
+            self.chart_canvas.show_chart(bar_chart_spec(labels, data, f"Distribution of {col_name}s", top_n=top_n, log_scale=log_scale))
+
+    def done(self, result):
+        self.chart_canvas.wait_for_workers()
+        super().done(result)
 
 
 class RiskAnalysisDialog(QDialog):
     """A dedicated window to display categorized, high-risk URLs."""
-    def __init__(self, urls, parent=None):
+    SECTIONS = (
+        ('high_risk', "High Risk URLs", "#bf616a"),
+        ('interesting', "Potentially Interesting URLs", "#ebcb8b"),
+        ('sensitive', "URLs with Sensitive Extensions", "#d08770"),
+    )
+
+    def __init__(self, dataset, parent=None):
         super().__init__(parent)
-        self.urls = urls
+        self.dataset = dataset
+        self.worker = None
         self.setWindowTitle("URL Risk Analysis")
         self.setGeometry(250, 250, 800, 700) # Increased height for the new section
 
-        # --- Load Keywords from Database ---
-        self.HIGH_RISK_KEYWORDS = command_db.get_high_risk_keywords()
-        self.INTERESTING_KEYWORDS = command_db.get_interesting_keywords()
-        self.SENSITIVE_EXTENSIONS = [
-            ".xls", ".xml", ".xlsx", ".json", ".pdf", ".sql", ".doc", ".docx", 
-            ".pptx", ".txt", ".zip", ".tar.gz", ".tgz", ".bak", ".7z", ".rar", 
-            ".log", ".cache", ".secret", ".db", ".backup", ".yml", ".gz", 
-            ".config", ".csv", ".yaml", ".md", ".md5", ".tar", ".xz", ".7zip", 
-            ".p12", ".pem", ".key", ".crt", ".csr", ".sh", ".pl", ".py", 
-            ".java", ".class", ".jar", ".war", ".ear", ".sqlitedb", ".sqlite3", 
-            ".dbf", ".db3", ".accdb", ".mdb", ".sqlcipher", ".gitignore", ".env", 
-            ".ini", ".conf", ".properties", ".plist", ".cfg"
-        ]
-        
         # --- Layout ---
         layout = QVBoxLayout(self)
-        
-        # High Risk Section
-        layout.addWidget(QLabel("<h2>High Risk URLs</h2>"))
-        self.high_risk_display = QTextEdit(readOnly=True)
-        layout.addWidget(self.high_risk_display)
-        
-        # Interesting Section
-        layout.addWidget(QLabel("<h2>Potentially Interesting URLs</h2>"))
-        self.interesting_display = QTextEdit(readOnly=True)
-        layout.addWidget(self.interesting_display)
-        
-        # --- New: Sensitive Extensions Section ---
-        layout.addWidget(QLabel("<h2>URLs with Sensitive Extensions</h2>"))
-        self.sensitive_ext_display = QTextEdit(readOnly=True)
-        layout.addWidget(self.sensitive_ext_display)
+        self.status_label = QLabel()
+        self.progress_bar = QProgressBar()
+        status_layout = QHBoxLayout()
+        status_layout.addWidget(self.status_label)
+        status_layout.addWidget(self.progress_bar)
+        layout.addLayout(status_layout)
+
+        # One virtualized list per category, each with a count badge and an export button
+        self.list_models = {}
+        self.count_labels = {}
+        for key, title, color in self.SECTIONS:
+            header_layout = QHBoxLayout()
+            header_layout.addWidget(QLabel(f"<h2>{title}</h2>"))
+            self.count_labels[key] = QLabel("0")
+            header_layout.addWidget(self.count_labels[key])
+            header_layout.addStretch()
+            export_button = QPushButton("Export...")
+            export_button.clicked.connect(lambda checked, k=key, t=title: self.export_list(k, t))
+            header_layout.addWidget(export_button)
+            layout.addLayout(header_layout)
+
+            self.list_models[key] = UrlListModel(self.dataset, color, self)
+            list_view = QListView()
+            list_view.setUniformItemSizes(True)
+            list_view.setModel(self.list_models[key])
+            layout.addWidget(list_view)
         
         close_button = QDialogButtonBox(QDialogButtonBox.Close)
         close_button.rejected.connect(self.reject)
         layout.addWidget(close_button)
         
-        self.analyze_and_display_urls()
-
-    def analyze_and_display_urls(self):
-        """Categorizes URLs and displays them in the appropriate text box."""
-        high_risk_html = []
-        interesting_html = []
-        sensitive_ext_html = []
-
-        for url in self.urls:
-            is_high_risk = any(keyword in url.lower() for keyword in self.HIGH_RISK_KEYWORDS)
-            is_interesting = any(keyword in url.lower() for keyword in self.INTERESTING_KEYWORDS)
-            has_sensitive_ext = any(url.lower().endswith(ext) for ext in self.SENSITIVE_EXTENSIONS)
-
-            if is_high_risk:
-                high_risk_html.append(f'<span style="color: #bf616a;">{url}</span>')
-            elif is_interesting:
-                interesting_html.append(f'<span style="color: #ebcb8b;">{url}</span>')
-                
-            if has_sensitive_ext:
-                sensitive_ext_html.append(f'<span style="color: #d08770;">{url}</span>')
-        
-        self.high_risk_display.setHtml("<br>".join(high_risk_html))
-        self.interesting_display.setHtml("<br>".join(interesting_html))
-        self.sensitive_ext_display.setHtml("<br>".join(sensitive_ext_html))
-
-class NumericStandardItem(QStandardItem):
-    def __lt__(self, other):
-        try:
-            return int(self.text()) < int(other.text())
-        except ValueError:
-            return self.text() < other.text()
+        # --- Load Keywords from Database ---
+        run_db_task(
+            command_db.get_risk_keywords,
+            on_result=self.on_keywords_loaded,
+            on_error=lambda message: QMessageBox.critical(self, "Database Error", message),
+            on_loading=self.show_loading,
+            owner=self
+        )
 
+    def show_loading(self):
+        self.status_label.setText("Loading keywords...")
+        self.progress_bar.setRange(0, 0)
+
+    def on_keywords_loaded(self, keywords):
+        """Starts classifying on a worker thread; the lists fill in as batches arrive."""
+        self.status_label.setText("Analyzing URLs...")
+        self.progress_bar.setRange(0, max(len(self.dataset), 1))
+        self.worker = RiskAnalysisWorker(self.dataset, get_url_classifier(*keywords))
+        self.worker.batch_ready.connect(self.on_batch_classified)
+        self.worker.progress_updated.connect(lambda done, total: self.progress_bar.setValue(done))
+        self.worker.error.connect(lambda message: QMessageBox.critical(self, "Analysis Error", message))
+        self.worker.finished.connect(self.on_analysis_finished)
+        self.worker.start()
+
+    def on_batch_classified(self, high_risk, interesting, sensitive):
+        for key, rows in (('high_risk', high_risk), ('interesting', interesting), ('sensitive', sensitive)):
+            self.list_models[key].append_rows(rows)
+            self.count_labels[key].setText(str(self.list_models[key].rowCount()))
+
+    def on_analysis_finished(self):
+        cancelled = not self.worker.is_running
+        self.progress_bar.setVisible(False)
+        self.status_label.setText(f"Analyzed {len(self.dataset)} URLs" if not cancelled else "Analysis cancelled")
+
+    def export_list(self, key, title):
+        """Writes one category's URLs to a text file, one per line."""
+        file_path, _ = QFileDialog.getSaveFileName(self, f"Export {title}", "", "Text Files (*.txt)")
+        if file_path:
+            try:
+                with open(file_path, 'w') as f:
+                    for url in self.list_models[key].urls():
+                        f.write(url + '\n')
+            except Exception as e:
+                QMessageBox.critical(self, "Error", f"Could not save file: {e}")
+
+    def done(self, result):
+        """Stops the classifier before the window goes away."""
+        if self.worker and self.worker.isRunning():
+            self.worker.stop()
+            self.worker.wait()
+        super().done(result)
 
 class PlaygroundWindow(QDialog):
     """
@@ -323,18 +359,78 @@ class PlaygroundWindow(QDialog):
         
         top_bar_layout.addStretch()
 
+        self.load_label = QLabel()
+        self.load_progress = QProgressBar()
+        self.load_progress.setMaximumWidth(250)
+        self.cancel_load_button = QPushButton("Cancel")
+        self.cancel_load_button.clicked.connect(self.cancel_loading)
+        top_bar_layout.addWidget(self.load_label)
+        top_bar_layout.addWidget(self.load_progress)
+        top_bar_layout.addWidget(self.cancel_load_button)
+
+        self.follow_checkbox = QCheckBox("Follow")
+        self.follow_checkbox.setToolTip("Append new rows as the files grow, e.g. while a scan is still writing them")
+        self.follow_checkbox.setEnabled(False)
+        self.follow_checkbox.toggled.connect(self.set_follow_mode)
+        top_bar_layout.addWidget(self.follow_checkbox)
+
         self.stats_button = QPushButton("View Stats")
         self.stats_button.clicked.connect(self.show_stats)
         top_bar_layout.addWidget(self.stats_button)
 
         main_layout.addLayout(top_bar_layout)
+
+        # Filter bar; every non-empty field must match. Enabled once the indexes are built.
+        filter_bar_layout = QHBoxLayout()
+        self.filter_inputs = {}
+        for key, placeholder in (('status', "Status (200, 3xx)"), ('extension', "Extension (.php, .js)"),
+                                 ('technology', "Technology contains"), ('host_suffix', "Host / domain"),
+                                 ('path', "Path contains")):
+            line_edit = QLineEdit()
+            line_edit.setPlaceholderText(placeholder)
+            line_edit.setClearButtonEnabled(True)
+            line_edit.textChanged.connect(lambda: self.filter_timer.start())
+            filter_bar_layout.addWidget(line_edit)
+            self.filter_inputs[key] = line_edit
+        self.filter_label = QLabel()
+        filter_bar_layout.addWidget(self.filter_label)
+        main_layout.addLayout(filter_bar_layout)
+        # Wait for a pause in typing before filtering
+        self.filter_timer = QTimer(self)
+        self.filter_timer.setSingleShot(True)
+        self.filter_timer.setInterval(150)
+        self.filter_timer.timeout.connect(self.apply_filters)
+        self.facet_index = None
+        self.index_worker = None
+        self.set_filters_enabled(False, "Filters are available once loading finishes")
         
         self.table_view = QTableView()
-        self.table_view.setSortingEnabled(True)
+        # Uniform row heights let the view skip per-row size calculations
+        self.table_view.verticalHeader().setSectionResizeMode(QHeaderView.Fixed)
+        self.table_view.verticalHeader().setDefaultSectionSize(self.table_view.fontMetrics().height() + 8)
         main_layout.addWidget(self.table_view)
         
-        self.model = QStandardItemModel()
-        self.model.itemChanged.connect(self.on_item_changed)
+        self.dataset = HttpxDataset()
+        self.model = ResultsTableModel(self.dataset, self.starred_hosts, self)
+        self.model.star_toggled.connect(self.save_starred_hosts)
+        self.proxy_model = IndexSortProxyModel(self)
+        self.proxy_model.setSourceModel(self.model)
+        self.table_view.setModel(self.proxy_model)
+        # Show file order until a header is clicked
+        self.table_view.horizontalHeader().setSortIndicator(-1, Qt.AscendingOrder)
+        self.table_view.setSortingEnabled(True)
+        self.columns_sized = False
+        self.parse_worker = None
+        # Follow mode: byte offset up to which each file has been read
+        self.file_offsets = {}
+        self.file_watcher = QFileSystemWatcher(self)
+        self.file_watcher.fileChanged.connect(self.on_file_changed)
+        self.changed_files = set()
+        # Writers append in bursts; collect change notifications before reading
+        self.tail_timer = QTimer(self)
+        self.tail_timer.setSingleShot(True)
+        self.tail_timer.setInterval(250)
+        self.tail_timer.timeout.connect(self.read_appended_rows)
         self.load_and_parse_data()
 
         self.table_view.setContextMenuPolicy(Qt.CustomContextMenu)
@@ -345,7 +441,7 @@ class PlaygroundWindow(QDialog):
         """Loads the list of starred hosts from a file."""
         if os.path.exists(self.starred_hosts_file):
             with open(self.starred_hosts_file, 'r') as f:
-                self.starred_hosts = set(line.strip() for line in f)
+                self.starred_hosts.update(line.strip() for line in f)
 
     def save_starred_hosts(self):
         """Saves the current list of starred hosts to a file with error handling."""
@@ -356,146 +452,21 @@ class PlaygroundWindow(QDialog):
         except Exception as e:
             QMessageBox.critical(self, "Save Error", f"Could not save starred hosts to {self.starred_hosts_file}:\n{e}")
 
-    def on_item_changed(self, item):
-        """Handles starring/unstarring of hosts and saves the changes."""
-        if item.column() == 0: # Star column
-            row = item.row()
-            host_item = self.model.item(row, 2)
-            if host_item:
-                host = host_item.text()
-                if item.checkState() == Qt.Checked:
-                    self.starred_hosts.add(host)
-                else:
-                    self.starred_hosts.discard(host)
-                self.save_starred_hosts()
-    
-    def on_item_changed(self, item):
-        """Handles starring/unstarring of hosts."""
-        if item.column() == 0: # Star column
-            row = item.row()
-            host_item = self.model.item(row, 2) # Host is now at column 2
-            if host_item:
-                host = host_item.text()
-                if item.checkState() == Qt.Checked:
-                    self.starred_hosts.add(host)
-                else:
-                    self.starred_hosts.discard(host)
+    def source_row(self, index):
+        """Maps a row of the (sorted) view back to its dataset row."""
+        return self.proxy_model.mapToSource(index).row()
 
     def on_cell_double_clicked(self, index):
         """Opens the URL in a browser when a host is double-clicked."""
-        if index.column() == 2: # Host column
-            self.open_in_browser(index.row())
-
-    def open_context_menu(self, position):
-        indexes = self.table_view.selectedIndexes()
-        if not indexes:
-            return
-        
-        row = indexes[0].row()
-        
-        menu = QMenu()
-        if indexes[0].column() == 2: # Host column
-            open_browser_action = menu.addAction("Open in default browser")
-            open_burp_action = menu.addAction("Open with Burp's Chromium")
-            fuzz_action = menu.addAction("Fuzz with ffuf")
-            menu.addSeparator()
-
-        colorize_menu = menu.addMenu("Colorize Row")
-        colors = {"Red": "#bf616a", "Green": "#a3be8c", "Blue": "#81a1c1", "Yellow": "#ebcb8b", "None": None}
-        for name, color_hex in colors.items():
-            action = colorize_menu.addAction(name)
-            action.triggered.connect(lambda checked, r=row, c=color_hex: self.colorize_row(r, c))
-
-        action = menu.exec_(self.table_view.viewport().mapToGlobal(position))
-        
-        if 'open_browser_action' in locals() and action == open_browser_action:
-            self.open_in_browser(row)
-        elif 'open_burp_action' in locals() and action == open_burp_action:
-            self.open_in_burp_browser(row)
-        elif 'fuzz_action' in locals() and action == fuzz_action:
-            self.open_fuzzer_dialog(row)
-
-    def colorize_row(self, row, color_hex):
-        """Applies a background color to an entire row."""
-        for col in range(self.model.columnCount()):
-            item = self.model.item(row, col)
-            if item:
-                if color_hex:
-                    item.setBackground(QBrush(QColor(color_hex)))
-                else:
-                    item.setBackground(QBrush()) # Reset to default
-            
-    def get_url_from_row(self, row):
-        schema = self.model.item(row, 1).text() # Schema is at column 1
-        host = self.model.item(row, 2).text()   # Host is at column 2
-        path = self.model.item(row, 3).text() if self.model.item(row, 3) else ''
-        return f"{schema}://{host}{path}"
-
-    def colorize_status_code(self, item, status_code):
-        """Sets the background color of a status code item based on its value."""
-        if 200 <= status_code < 300:
-            color = QColor("green")
-        elif 300 <= status_code < 400:
-            color = QColor("blue")
-        elif 400 <= status_code < 500:
-            color = QColor("orange")
-        elif 500 <= status_code < 600:
-            color = QColor("red")
-        else:
-            # Should not happen, but as a fallback
-            color = QColor("white")
-            
-        item.setForeground(color)
-
-    def load_and_parse_data(self):
-        """Loads data into the main table view."""
-        self.all_records = [rec for fp in self.file_paths for rec in self.parse_httpx_file(fp)]
-        if not self.all_records:
-            QMessageBox.warning(self, "No Data", "No valid data could be parsed.")
-            return
-
-        headers = ['⭐', 'Schema', 'Host', 'Path', 'Extension', 'Status Code', 'Length', 'Technology']
-        self.model.setHorizontalHeaderLabels(headers)
-
-        for record in self.all_records:
-            host = record.get('host', '')
-            star_item = QStandardItem()
-            star_item.setCheckable(True)
-            if host in self.starred_hosts:
-                star_item.setCheckState(Qt.Checked)
-            
-            status_code = int(record.get('status_code', 0))
-            status_item = NumericStandardItem(f"{status_code:d}")
-            self.colorize_status_code(status_item, status_code)
-            
-            row_items = [
-                star_item,
-                QStandardItem(str(record.get('schema', ''))),
-                QStandardItem(host),
-                QStandardItem(str(record.get('path', ''))),
-                QStandardItem(str(record.get('extension', ''))),
-                status_item,
-                NumericStandardItem(f"{record.get('length', 0):d}"),
-                QStandardItem(str(record.get('technology', '')))
-            ]
-            self.model.appendRow(row_items)
-
-        self.table_view.setModel(self.model)
-        self.table_view.resizeColumnsToContents()
-        self.table_view.horizontalHeader().setSectionResizeMode(QHeaderView.Interactive)
-        self.table_view.setColumnWidth(0, 30)
-    
-    def on_cell_double_clicked(self, index):
-        """Opens the URL in a browser when a host is double-clicked."""
-        if index.column() == 1: # Host column
-            self.open_in_browser(index.row())
+        if index.column() == ResultsTableModel.HOST_COLUMN:
+            self.open_in_browser(self.source_row(index))
 
     def open_context_menu(self, position):
         index = self.table_view.indexAt(position)
         if not index.isValid():
             return
             
-        row = index.row()
+        row = self.source_row(index)
         
         menu = QMenu()
         
@@ -504,10 +475,10 @@ class PlaygroundWindow(QDialog):
         colors = {"Red": "#bf616a", "Green": "#a3be8c", "Blue": "#81a1c1", "Yellow": "#ebcb8b", "None": None}
         for name, color_hex in colors.items():
             action = colorize_menu.addAction(name)
-            action.triggered.connect(lambda checked, r=row, c=color_hex: self.colorize_row(r, c))
+            action.triggered.connect(lambda checked, r=row, c=color_hex: self.model.set_row_color(r, c))
 
         # --- Host-specific Actions ---
-        if index.column() == 2: # Only show these for the 'Host' column
+        if index.column() == ResultsTableModel.HOST_COLUMN: # Only show these for the 'Host' column
             menu.addSeparator()
             open_browser_action = menu.addAction("Open in default browser")
             open_burp_action = menu.addAction("Open with Burp's Chromium")
@@ -525,19 +496,158 @@ class PlaygroundWindow(QDialog):
         else:
             # For other columns, just show the colorize menu
             menu.exec_(self.table_view.viewport().mapToGlobal(position))
-            
-    def get_url_from_row(self, row):
-        schema = self.model.item(row, 0).text()
-        host = self.model.item(row, 1).text()
-        path = self.model.item(row, 2).text() if self.model.item(row, 2) else ''
-        return f"{schema}://{host}{path}"
+
+    def load_and_parse_data(self):
+        """Parses the files on a worker thread; rows appear as batches arrive."""
+        self.load_progress.setRange(0, 0)
+        self.parse_worker = HttpxParseWorker(self.file_paths)
+        self.parse_worker.batch_ready.connect(self.on_batch_parsed)
+        self.parse_worker.progress_updated.connect(self.update_load_progress)
+        self.parse_worker.file_started.connect(
+            lambda number, count, path: self.load_label.setText(f"Parsing {os.path.basename(path)} ({number}/{count})")
+        )
+        self.parse_worker.error.connect(lambda message: QMessageBox.critical(self, "File Error", message))
+        self.parse_worker.finished.connect(self.on_parsing_finished)
+        self.parse_worker.start()
+
+    def on_batch_parsed(self, batch):
+        self.model.append_dataset(batch)
+        # Only reveal rows if the user is at the end of the table (or it isn't full yet);
+        # otherwise the view fetches them when scrolled down.
+        scroll_bar = self.table_view.verticalScrollBar()
+        if self.proxy_model.canFetchMore() and scroll_bar.value() >= scroll_bar.maximum():
+            self.proxy_model.fetchMore()
+        if not self.columns_sized and self.model.rowCount() > 0:
+            self.table_view.resizeColumnsToContents()
+            self.table_view.horizontalHeader().setSectionResizeMode(QHeaderView.Interactive)
+            self.table_view.setColumnWidth(0, 30)
+            self.columns_sized = True
+
+    def update_load_progress(self, bytes_done, total_bytes):
+        # QProgressBar works with ints, so track kilobytes to stay in range for huge files
+        self.load_progress.setRange(0, max(total_bytes // 1024, 1))
+        self.load_progress.setValue(bytes_done // 1024)
+
+    def cancel_loading(self):
+        if self.parse_worker and self.parse_worker.isRunning():
+            self.parse_worker.stop()
+
+    def on_parsing_finished(self):
+        cancelled = not self.parse_worker.is_running
+        self.load_progress.setVisible(False)
+        self.cancel_load_button.setVisible(False)
+        self.load_label.setText(f"{len(self.dataset)} rows" + (" (loading cancelled)" if cancelled else ""))
+        self.file_offsets = dict(self.parse_worker.file_offsets)
+        self.follow_checkbox.setEnabled(not cancelled and bool(self.file_offsets))
+        if len(self.dataset) == 0 and not cancelled:
+            QMessageBox.warning(self, "No Data", "No valid data could be parsed.")
+        elif len(self.dataset) > 0:
+            self.build_filter_index()
+
+    def set_filters_enabled(self, enabled, tooltip=""):
+        for line_edit in self.filter_inputs.values():
+            line_edit.setEnabled(enabled)
+            line_edit.setToolTip(tooltip)
+
+    def build_filter_index(self):
+        """Builds the facet and trigram indexes on a worker thread."""
+        if self.index_worker and self.index_worker.isRunning():
+            return
+        if self.facet_index is None:
+            self.set_filters_enabled(False, "Building filter indexes...")
+            self.filter_label.setText("Indexing...")
+        self.index_worker = FacetIndexWorker(self.dataset)
+        self.index_worker.index_ready.connect(self.on_filter_index_ready)
+        self.index_worker.error.connect(lambda message: self.filter_label.setText(message))
+        self.index_worker.start()
+
+    def on_filter_index_ready(self, facet_index):
+        self.facet_index = facet_index
+        self.set_filters_enabled(True)
+        self.apply_filters()
+        # Rows followed in while indexing need another pass
+        if facet_index.row_count < len(self.dataset):
+            QTimer.singleShot(0, self.build_filter_index)
+
+    def set_follow_mode(self, enabled):
+        """Starts or stops watching the open files for appended lines."""
+        if enabled:
+            self.file_watcher.addPaths(list(self.file_offsets))
+            # Pick up anything written since loading finished
+            self.changed_files.update(self.file_offsets)
+            self.tail_timer.start()
+        else:
+            self.file_watcher.removePaths(self.file_watcher.files())
+            self.tail_timer.stop()
+            self.changed_files.clear()
+
+    def on_file_changed(self, path):
+        # Writers that replace the file make the watcher drop it; watch the new one
+        if path not in self.file_watcher.files() and os.path.exists(path):
+            self.file_watcher.addPath(path)
+        self.changed_files.add(path)
+        if not self.tail_timer.isActive():
+            self.tail_timer.start()
+
+    def read_appended_rows(self):
+        """Parses only the complete lines appended since the last read and adds them to the table."""
+        pending = self.changed_files
+        self.changed_files = set()
+        added = 0
+        for path in pending:
+            try:
+                size = os.path.getsize(path)
+                if size < self.file_offsets[path]:
+                    # Rewritten from scratch; rows already shown can't be matched up with the new content
+                    self.file_offsets[path] = size
+                    self.load_label.setText(f"{os.path.basename(path)} was truncated; reopen the viewer to reload it")
+                    continue
+                if size == self.file_offsets[path]:
+                    continue
+                offset = self.file_offsets[path]
+                batch, self.file_offsets[path] = parse_httpx_tail(path, offset)
+                if size - offset > CHUNK_SIZE:
+                    # More than one read's worth is waiting; come back for the rest
+                    self.changed_files.add(path)
+            except OSError as e:
+                self.load_label.setText(f"Could not follow {os.path.basename(path)}: {e}")
+                continue
+            if len(batch) > 0:
+                self.on_batch_parsed(batch)
+                added += len(batch)
+        if added:
+            self.load_label.setText(f"{len(self.dataset)} rows (+{added} followed)")
+            self.build_filter_index()
+        if self.changed_files and self.follow_checkbox.isChecked():
+            self.tail_timer.start()
+
+    def apply_filters(self):
+        """Resolves the filter bar against the indexes and hands the row mask to the proxy."""
+        if self.facet_index is None:
+            return
+        mask = self.facet_index.filter_mask(**{key: line_edit.text() for key, line_edit in self.filter_inputs.items()})
+        self.proxy_model.set_row_filter(mask)
+        if mask is None:
+            self.filter_label.setText("")
+        else:
+            self.filter_label.setText(f"{int(mask.sum())} of {len(self.dataset)} rows")
+
+    def done(self, result):
+        """Stops the background workers before the window goes away."""
+        if self.parse_worker and self.parse_worker.isRunning():
+            self.parse_worker.stop()
+            self.parse_worker.wait()
+        if self.index_worker and self.index_worker.isRunning():
+            self.index_worker.wait()
+        self.follow_checkbox.setChecked(False)
+        super().done(result)
 
     def open_in_browser(self, row):
-        url = self.get_url_from_row(row)
+        url = self.dataset.url(row)
         webbrowser.open_new_tab(url)
         
     def open_in_burp_browser(self, row):
-        url = self.get_url_from_row(row)
+        url = self.dataset.url(row)
         try:
             chromium_path = "/usr/bin/chromium" 
             subprocess.Popen([chromium_path, "--proxy-server=127.0.0.1:8080", "--ignore-certificate-errors", url])
@@ -547,7 +657,7 @@ class PlaygroundWindow(QDialog):
             QMessageBox.critical(self, "Error", f"Could not launch browser: {e}")
 
     def open_fuzzer_dialog(self, row):
-        url = self.get_url_from_row(row)
+        url = self.dataset.url(row)
         # Ensure the URL for fuzzing ends with a slash
         if not url.endswith('/'):
             url += '/'
@@ -557,50 +667,15 @@ class PlaygroundWindow(QDialog):
 
     def show_risk_analysis(self):
         """Opens the new dialog for viewing categorized risks."""
-        if not hasattr(self, 'all_records') or not self.all_records:
+        if len(self.dataset) == 0:
             QMessageBox.information(self, "No Data", "There are no URLs to analyze.")
             return
         
-        # Compile a list of full URLs to pass to the dialog
-        full_urls = [
-            f"{rec.get('schema', '')}://{rec.get('host', '')}{rec.get('path', '')}" 
-            for rec in self.all_records
-        ]
-        
-        dialog = RiskAnalysisDialog(full_urls, self)
+        dialog = RiskAnalysisDialog(self.dataset, self)
         dialog.exec_()
 
-    def parse_httpx_file(self, file_path):
-        """Parses a single httpx output file."""
-        records = []
-        ansi_escape = re.compile(r'\x1B(?:[@-Z\\-_]|\[[0-?]*[ -/]*[@-~])')
-        line_regex = re.compile(
-            r"^(?P<url>https?://[^\s]+)\s+"
-            r"\[\s*(?P<status_code>[\d,\s]+)\s*\]\s+"
-            r"\[\s*(?P<length>\d+)\s*\]\s+"
-            r"(?:\[\s*(?P<technology>[^\]]+)\s*\])?"
-        )
-        try:
-            with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-                for line in f:
-                    clean_line = ansi_escape.sub('', line).strip()
-                    match = line_regex.match(clean_line)
-                    if not match: continue
-                    data = match.groupdict()
-                    parsed_url = urlparse(data['url'])
-                    final_status_code = data['status_code'].split(',')[-1].strip()
-                    _, extension = os.path.splitext(parsed_url.path)
-                    records.append({
-                        'schema': parsed_url.scheme, 'host': parsed_url.hostname, 'path': parsed_url.path,
-                        'extension': extension if extension else 'N/A', 'status_code': int(final_status_code),
-                        'length': int(data['length']), 'technology': data.get('technology', 'N/A').strip()
-                    })
-        except Exception as e:
-            QMessageBox.critical(self, "File Error", f"Could not read/parse {os.path.basename(file_path)}: {e}")
-        return records
-
     def show_stats(self):
-        if self.model.rowCount() == 0:
+        if len(self.dataset) == 0:
             QMessageBox.information(self, "No Data", "There is no data to analyze.")
             return
         dialog = StatisticsDialog(self.model, self)
@@ -618,19 +693,45 @@ class PlaygroundTabWidget(QWidget):
         self.tree_widget = QTreeWidget()
         self.tree_widget.setHeaderHidden(True)
         self.tree_widget.setSelectionMode(QTreeWidget.ExtendedSelection)
-        self.tree_widget.itemDoubleClicked.connect(self.open_selected_items)
+        # Items are inserted as files appear, so let the view keep them ordered
+        self.tree_widget.setSortingEnabled(True)
+        self.tree_widget.sortByColumn(0, Qt.AscendingOrder)
+        self.tree_widget.itemDoubleClicked.connect(lambda: self.open_selected_items())
+        self.tree_widget.itemExpanded.connect(self.on_item_expanded)
         layout.addWidget(self.tree_widget)
+
+        self.icons = {}
+        # Directories whose contents are in the tree, by path:
+        # {'item': container item, 'entries': {name: (item, signature)}, 'bags': {prefix: item}}
+        self.loaded_dirs = {}
+        self.error_item = None
+        self.dir_watcher = QFileSystemWatcher(self)
+        self.dir_watcher.directoryChanged.connect(self.on_directory_changed)
+        self.changed_dirs = set()
+        # Scans write many files in a row; sync each directory once per burst
+        self.sync_timer = QTimer(self)
+        self.sync_timer.setSingleShot(True)
+        self.sync_timer.setInterval(200)
+        self.sync_timer.timeout.connect(self.sync_changed_directories)
         
+        # Open viewers are non-modal; keep them referenced until they close
+        self.file_viewers = []
+
         open_button_layout = QHBoxLayout()
+        view_text_button = QPushButton("View as Text")
+        view_text_button.setToolTip("Open the selected files in the plain text viewer, even if they are httpx output")
+        view_text_button.clicked.connect(lambda: self.open_selected_items(as_text=True))
         open_button = QPushButton("Open Selected File(s)")
-        open_button.clicked.connect(self.open_selected_items)
+        open_button.clicked.connect(lambda: self.open_selected_items())
         open_button_layout.addStretch()
+        open_button_layout.addWidget(view_text_button)
         open_button_layout.addWidget(open_button)
         layout.addLayout(open_button_layout)
         
         self.refresh_playground()
 
-    def open_selected_items(self):
+    def open_selected_items(self, as_text=False):
+        """Opens httpx output in the Playground viewer and any other file in the text viewer."""
         selected_items = self.tree_widget.selectedItems()
         if not selected_items:
             QMessageBox.information(self, "No Selection", "Please select one or more files to open.")
@@ -643,7 +744,22 @@ class PlaygroundTabWidget(QWidget):
         if not file_paths:
             QMessageBox.warning(self, "No Files Selected", "Your selection does not contain any valid files.")
             return
-            
+
+        httpx_paths = []
+        for path in file_paths:
+            try:
+                is_httpx = not as_text and looks_like_httpx(path)
+            except OSError as e:
+                QMessageBox.warning(self, "File Error", f"Could not read {path}: {e}")
+                continue
+            if is_httpx:
+                httpx_paths.append(path)
+            else:
+                self.open_file_viewer(path)
+        if not httpx_paths:
+            return
+        file_paths = httpx_paths
+
         viewer_window = PlaygroundWindow(
             file_paths=file_paths, 
             terminal_widget=self.terminal_widget, 
@@ -652,42 +768,150 @@ class PlaygroundTabWidget(QWidget):
         )
         viewer_window.exec_()
 
+    def open_file_viewer(self, path):
+        viewer = FileViewerWindow(path, self)
+        viewer.setAttribute(Qt.WA_DeleteOnClose)
+        viewer.finished.connect(lambda: self.file_viewers.remove(viewer))
+        self.file_viewers.append(viewer)
+        viewer.show()
+
     def set_working_directory(self, path):
         """Updates the working directory and refreshes the file view."""
         self.working_directory = path
-        self.refresh_playground()
-
-    def refresh_playground(self):
+        self.reset_tree()
+
+    def icon(self, name):
+        """Returns one of the tree's SVG icons, loading each only once."""
+        if name not in self.icons:
+            self.icons[name] = QIcon(os.path.join(self.icon_path, name))
+        return self.icons[name]
+
+    def reset_tree(self):
+        """Drops everything and shows the top level of the working directory again."""
+        if self.dir_watcher.directories():
+            self.dir_watcher.removePaths(self.dir_watcher.directories())
         self.tree_widget.clear()
-        folder_icon = QIcon(os.path.join(self.icon_path, "folder.svg"))
-        file_icon = QIcon(os.path.join(self.icon_path, "file.svg"))
-        bag_icon = QIcon(os.path.join(self.icon_path, "bag.svg"))
-
-        bags = {}
+        self.loaded_dirs = {}
+        self.error_item = None
+        self.changed_dirs.clear()
+        self.load_directory(self.working_directory, self.tree_widget.invisibleRootItem())
 
+    def refresh_playground(self):
+        """Brings the tree up to date with the disk, touching only the entries that changed."""
+        if self.working_directory not in self.loaded_dirs:
+            self.reset_tree()
+            return
+        for dir_path in list(self.loaded_dirs):
+            self.sync_directory(dir_path)
+
+    def load_directory(self, dir_path, container):
+        self.loaded_dirs[dir_path] = {'item': container, 'entries': {}, 'bags': {}}
+        if os.path.isdir(dir_path):
+            self.dir_watcher.addPath(dir_path)
+        self.sync_directory(dir_path)
+
+    def on_item_expanded(self, item):
+        """Lists a subdirectory the first time it is expanded."""
+        path = item.data(0, Qt.UserRole)
+        if path and path not in self.loaded_dirs and os.path.isdir(path):
+            self.load_directory(path, item)
+            item.setChildIndicatorPolicy(QTreeWidgetItem.DontShowIndicatorWhenChildless)
+
+    def on_directory_changed(self, dir_path):
+        self.changed_dirs.add(dir_path)
+        if not self.sync_timer.isActive():
+            self.sync_timer.start()
+
+    def sync_changed_directories(self):
+        changed, self.changed_dirs = self.changed_dirs, set()
+        for dir_path in changed:
+            self.sync_directory(dir_path)
+
+    def sync_directory(self, dir_path):
+        """Applies the additions, removals and modifications in one directory to the tree."""
+        state = self.loaded_dirs.get(dir_path)
+        if state is None:
+            return
+        current = {}
         try:
-            for item_name in sorted(os.listdir(self.working_directory)):
-                full_path = os.path.join(self.working_directory, item_name)
-                if os.path.isdir(full_path):
-                    dir_item = QTreeWidgetItem(self.tree_widget, [item_name])
-                    dir_item.setIcon(0, folder_icon)
-                    dir_item.setData(0, Qt.UserRole, full_path)
-                elif "_" in item_name:
-                    prefix = item_name.split('_')[0]
-                    if prefix not in bags:
-                        bags[prefix] = QTreeWidgetItem(self.tree_widget, [prefix])
-                        bags[prefix].setIcon(0, bag_icon)
-                    file_item = QTreeWidgetItem(bags[prefix], [item_name])
-                    file_item.setIcon(0, file_icon)
-                    file_item.setData(0, Qt.UserRole, full_path)
+            with os.scandir(dir_path) as entries:
+                for entry in entries:
+                    try:
+                        stat = entry.stat()
+                        current[entry.name] = (entry.is_dir(), stat.st_size, stat.st_mtime)
+                    except OSError:
+                        # Broken symlink or removed while listing
+                        continue
+        except OSError as e:
+            if dir_path == self.working_directory and self.error_item is None:
+                self.error_item = QTreeWidgetItem(self.tree_widget, [f"Error reading directory: {e}"])
+            # A vanished subdirectory is removed when its parent is synced
+            return
+        if dir_path == self.working_directory and self.error_item is not None:
+            self.tree_widget.invisibleRootItem().removeChild(self.error_item)
+            self.error_item = None
+
+        known = state['entries']
+        for name in set(known) - set(current):
+            self.remove_entry(state, name)
+        for name, signature in current.items():
+            if name not in known:
+                self.add_entry(state, dir_path, name, signature)
+            elif known[name][1] != signature:
+                if known[name][1][0] != signature[0]:
+                    # Changed between file and directory
+                    self.remove_entry(state, name)
+                    self.add_entry(state, dir_path, name, signature)
                 else:
-                    file_item = QTreeWidgetItem(self.tree_widget, [item_name])
-                    file_item.setIcon(0, file_icon)
-                    file_item.setData(0, Qt.UserRole, full_path)
-        except Exception as e:
-            QTreeWidgetItem(self.tree_widget, [f"Error reading directory: {e}"])
+                    item = known[name][0]
+                    known[name] = (item, signature)
+                    self.set_entry_tooltip(item, signature)
+
+    def add_entry(self, state, dir_path, name, signature):
+        full_path = os.path.join(dir_path, name)
+        container = state['item']
+        item = QTreeWidgetItem([name])
+        item.setData(0, Qt.UserRole, full_path)
+        if signature[0]:
+            item.setIcon(0, self.icon("folder.svg"))
+            # Contents are listed on first expansion
+            item.setChildIndicatorPolicy(QTreeWidgetItem.ShowIndicator)
+        else:
+            item.setIcon(0, self.icon("file.svg"))
+            if "_" in name:
+                prefix = name.split('_')[0]
+                if prefix not in state['bags']:
+                    state['bags'][prefix] = QTreeWidgetItem([prefix])
+                    state['bags'][prefix].setIcon(0, self.icon("bag.svg"))
+                    container.addChild(state['bags'][prefix])
+                container = state['bags'][prefix]
+        self.set_entry_tooltip(item, signature)
+        container.addChild(item)
+        state['entries'][name] = (item, signature)
+
+    def remove_entry(self, state, name):
+        item, signature = state['entries'].pop(name)
+        parent = item.parent() or self.tree_widget.invisibleRootItem()
+        parent.removeChild(item)
+        if signature[0]:
+            self.forget_directory(item.data(0, Qt.UserRole))
+        elif parent is not state['item'] and parent.childCount() == 0:
+            # Last file of a bag
+            state['item'].removeChild(parent)
+            state['bags'].pop(parent.text(0), None)
+
+    def forget_directory(self, dir_path):
+        """Stops tracking a removed directory and everything loaded below it."""
+        for path in [path for path in self.loaded_dirs if path == dir_path or path.startswith(dir_path + os.sep)]:
+            del self.loaded_dirs[path]
+            self.dir_watcher.removePath(path)
+
+    def set_entry_tooltip(self, item, signature):
+        if not signature[0]:
+            item.setToolTip(0, f"{signature[1]} bytes, modified {time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(signature[2]))}")
 
     def apply_theme(self):
+        # The icons don't depend on the theme; just make sure the listing is current
         self.refresh_playground()
         
     def open_fuzzer_dialog(self):
@@ -1,12 +1,29 @@
 from PyQt5.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QSplitter, QLabel, QComboBox,
-    QLineEdit, QTextEdit, QPushButton, QApplication, QMessageBox, QFrame
+    QLineEdit, QTextEdit, QPushButton, QApplication, QMessageBox, QFrame, QFileDialog
 )
 from PyQt5.QtCore import Qt, QTimer
 from PyQt5.QtGui import QIcon, QFont
 from utils import db as command_db
+from utils.db_worker import run_db_task
+from utils.report_worker import BulkReportWorker
 from modules.dialogs import TemplateEditorDialog
-import markdown, re
+import os
+import re
+from functools import lru_cache
+
+# Keystrokes in the URL/impact fields are coalesced into one render
+RENDER_DELAY_MS = 150
+
+@lru_cache(maxsize=256)
+def render_markdown(text):
+    """
+    Converts markdown to HTML, memoized by input text since the same template
+    sections are rendered over and over. The markdown package is imported on
+    first use.
+    """
+    import markdown
+    return markdown.markdown(text)
 
 class ReportTabWidget(QWidget):
     """A tab for generating vulnerability reports from templates."""
@@ -23,9 +40,16 @@ class ReportTabWidget(QWidget):
         category_layout = QHBoxLayout()
         category_layout.addWidget(QLabel("Vulnerability Category:"))
         manage_templates_btn = QPushButton("Manage Templates")
+        self.bulk_report_btn = QPushButton("Bulk Report...")
+        self.bulk_report_btn.setToolTip("Render every finding in a CSV/JSONL file into one Markdown or HTML report")
         category_layout.addStretch()
+        category_layout.addWidget(self.bulk_report_btn)
         category_layout.addWidget(manage_templates_btn)
         input_layout.addLayout(category_layout)
+        self.bulk_status_label = QLabel()
+        self.bulk_status_label.setWordWrap(True)
+        self.bulk_status_label.setVisible(False)
+        input_layout.addWidget(self.bulk_status_label)
         
         self.category_combo = QComboBox()
         input_layout.addWidget(self.category_combo)
@@ -54,13 +78,27 @@ class ReportTabWidget(QWidget):
         splitter.setSizes([400, 600])
         main_layout.addWidget(splitter)
         
+        # All templates are kept in memory (category -> row) and only reloaded
+        # when the template editor saves a change
+        self.templates = {}
+        # The markdown each preview currently shows, so unchanged sections are skipped
+        self.rendered_sources = {}
+        self.validation_text = None
+        self.validation_steps = []
+        self.current_step_index = 0
+        self.bulk_worker = None
+
+        self.render_timer = QTimer(self)
+        self.render_timer.setSingleShot(True)
+        self.render_timer.setInterval(RENDER_DELAY_MS)
+        self.render_timer.timeout.connect(self.generate_report)
+
         self.load_categories()
         manage_templates_btn.clicked.connect(self.open_template_editor)
+        self.bulk_report_btn.clicked.connect(self.generate_bulk_report)
         self.category_combo.currentIndexChanged.connect(self.generate_report)
-        self.url_input.textChanged.connect(self.generate_report)
-        self.impact_input.textChanged.connect(self.generate_report)
-        
-        self.generate_report()
+        self.url_input.textChanged.connect(self.render_timer.start)
+        self.impact_input.textChanged.connect(self.render_timer.start)
 
     def create_preview_section(self, parent_layout, title, navigation=False):
         """Helper function to create a preview box, optionally with navigation."""
@@ -104,40 +142,92 @@ class ReportTabWidget(QWidget):
 
     def load_categories(self):
         current_selection = self.category_combo.currentText()
+        run_db_task(
+            command_db.get_all_templates,
+            on_result=lambda templates: self.on_templates_loaded(templates, current_selection),
+            on_loading=lambda: self.category_combo.setEnabled(False),
+            owner=self
+        )
+
+    def on_templates_loaded(self, templates, current_selection):
+        self.templates = {template['category']: template for template in templates}
+        # Templates may have been edited in place, so render every section afresh
+        self.rendered_sources.clear()
+        self.validation_text = None
+        self.category_combo.blockSignals(True)
         self.category_combo.clear()
-        categories = command_db.get_all_template_categories()
-        self.category_combo.addItems(categories)
+        self.category_combo.addItems(list(self.templates))
         index = self.category_combo.findText(current_selection)
         if index != -1:
             self.category_combo.setCurrentIndex(index)
+        self.category_combo.blockSignals(False)
+        self.category_combo.setEnabled(True)
+        self.generate_report()
 
     def open_template_editor(self):
         dialog = TemplateEditorDialog(self)
+        dialog.templates_changed.connect(self.load_categories)
         dialog.exec_()
-        self.load_categories()
+
+    def generate_bulk_report(self):
+        findings_path, _ = QFileDialog.getOpenFileName(self, "Select Findings File", "", "Findings (*.csv *.jsonl *.json);;All Files (*)")
+        if not findings_path: return
+        default_path = os.path.splitext(findings_path)[0] + "_report.md"
+        output_path, selected_filter = QFileDialog.getSaveFileName(self, "Save Report", default_path, "Markdown (*.md);;HTML (*.html)")
+        if not output_path: return
+        if not os.path.splitext(output_path)[1]:
+            output_path += ".html" if selected_filter.startswith("HTML") else ".md"
+
+        # The in-memory templates are current; the worker renders from a snapshot of them
+        self.bulk_worker = BulkReportWorker(findings_path, output_path, list(self.templates.values()), self)
+        self.bulk_worker.progress_updated.connect(lambda count: self.bulk_status_label.setText(f"Rendering findings... {count} read"))
+        self.bulk_worker.report_ready.connect(lambda renderer: self.bulk_status_label.setText(f"{renderer.summary()}\nSaved to {output_path}"))
+        self.bulk_worker.error.connect(self.bulk_status_label.setText)
+        self.bulk_worker.finished.connect(lambda: self.bulk_report_btn.setEnabled(True))
+        self.bulk_report_btn.setEnabled(False)
+        self.bulk_status_label.setText("Rendering findings...")
+        self.bulk_status_label.setVisible(True)
+        self.bulk_worker.start()
+
+    def stop_bulk_report(self):
+        if self.bulk_worker and self.bulk_worker.isRunning():
+            self.bulk_worker.stop()
+            self.bulk_worker.wait()
+
+    def set_preview(self, preview, markdown_text):
+        """Renders markdown into a preview, unless it is already showing exactly that."""
+        if self.rendered_sources.get(preview) == markdown_text:
+            return
+        self.rendered_sources[preview] = markdown_text
+        preview.setHtml(render_markdown(markdown_text))
 
     def generate_report(self):
-        category = self.category_combo.currentText()
-        if not category:
+        self.render_timer.stop()
+        template_data = self.templates.get(self.category_combo.currentText())
+        if not template_data:
             self.desc_preview.clear()
             self.impact_preview.clear()
             self.validation_widgets['preview'].clear()
             self.validation_widgets['nav_widget'].setVisible(False)
             self.fix_preview.clear()
+            self.rendered_sources.clear()
+            self.validation_text = None
+            self.validation_steps = []
             return
 
-        template_data = command_db.get_template_by_category(category)
-        if not template_data: return
-
         url = self.url_input.text() or "{URL}"
         custom_impact = self.impact_input.toPlainText()
-        
-        self.desc_preview.setHtml(markdown.markdown(template_data.get('description', '').format(URL=url)))
-        self.impact_preview.setHtml(markdown.markdown(custom_impact if custom_impact else template_data.get('impact', '')))
-        self.fix_preview.setHtml(markdown.markdown(template_data.get('fix_recommendation', '')))
-        
-                # Get the full markdown text for validation steps
+
+        self.set_preview(self.desc_preview, template_data.get('description', '').format(URL=url))
+        self.set_preview(self.impact_preview, custom_impact if custom_impact else template_data.get('impact', ''))
+        self.set_preview(self.fix_preview, template_data.get('fix_recommendation', ''))
+
+        # Get the full markdown text for validation steps; the step shown only
+        # goes back to the first one when it actually changes
         validation_text = template_data.get('validation_steps', '')
+        if validation_text == self.validation_text:
+            return
+        self.validation_text = validation_text
         # Split the text into steps using the "## STEP <number>:" pattern as a delimiter
         steps = re.split(r'(?=## STEP \d+:)', validation_text)
         # Filter out any empty strings that might result from the split and strip whitespace
@@ -149,12 +239,13 @@ class ReportTabWidget(QWidget):
     def update_validation_step_view(self):
         if not self.validation_steps:
             self.validation_widgets['preview'].clear()
+            self.rendered_sources.pop(self.validation_widgets['preview'], None)
             self.validation_widgets['nav_widget'].setVisible(False)
             return
 
         self.validation_widgets['nav_widget'].setVisible(len(self.validation_steps) > 1)
         current_step_md = self.validation_steps[self.current_step_index]
-        self.validation_widgets['preview'].setHtml(markdown.markdown(current_step_md))
+        self.set_preview(self.validation_widgets['preview'], current_step_md)
         self.validation_widgets['step_label'].setText(f"Step {self.current_step_index + 1} of {len(self.validation_steps)}")
         self.validation_widgets['prev_btn'].setEnabled(self.current_step_index > 0)
         self.validation_widgets['next_btn'].setEnabled(self.current_step_index < len(self.validation_steps) - 1)
@@ -0,0 +1,311 @@
+from array import array
+import numpy as np
+from PyQt5.QtCore import Qt, QAbstractTableModel, QAbstractListModel, QAbstractProxyModel, QModelIndex, pyqtSignal
+from PyQt5.QtGui import QColor, QBrush
+
+STATUS_COLORS = [
+    (200, 300, QColor("green")),
+    (300, 400, QColor("blue")),
+    (400, 500, QColor("orange")),
+    (500, 600, QColor("red")),
+]
+FALLBACK_STATUS_COLOR = QColor("white")
+
+def status_code_color(status_code):
+    """Returns the foreground colour used for a status code."""
+    for low, high, color in STATUS_COLORS:
+        if low <= status_code < high:
+            return color
+    return FALLBACK_STATUS_COLOR
+
+class ResultsTableModel(QAbstractTableModel):
+    """
+    A read-only table model that serves cells straight out of an HttpxDataset,
+    so no per-cell Qt objects are ever created.
+    """
+    HEADERS = ['⭐', 'Schema', 'Host', 'Path', 'Extension', 'Status Code', 'Length', 'Technology',
+               'Title', 'IP', 'CDN', 'Content Type']
+    FIELDS = [None, 'schema', 'host', 'path', 'extension', 'status_code', 'length', 'technology',
+              'title', 'ip', 'cdn', 'content_type']
+    STAR_COLUMN = 0
+    HOST_COLUMN = 2
+    STATUS_COLUMN = 5
+
+    FETCH_BATCH = 5000
+
+    star_toggled = pyqtSignal(str, bool)
+
+    def __init__(self, dataset, starred_hosts, parent=None):
+        super().__init__(parent)
+        self.dataset = dataset
+        self.starred_hosts = starred_hosts
+        self.row_colors = {}
+        # Rows already in the dataset but not yet exposed to views; they are
+        # revealed through fetchMore() as the user scrolls.
+        self.row_count = len(dataset)
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else self.row_count
+
+    def append_dataset(self, batch):
+        """Adds a parsed batch to the dataset; views pick the rows up via fetchMore()."""
+        self.dataset.extend_dataset(batch)
+
+    def canFetchMore(self, parent=QModelIndex()):
+        return not parent.isValid() and self.row_count < len(self.dataset)
+
+    def fetchMore(self, parent=QModelIndex(), limit=None):
+        remaining = len(self.dataset) - self.row_count
+        count = min(remaining, limit or self.FETCH_BATCH)
+        if parent.isValid() or count <= 0:
+            return
+        self.beginInsertRows(QModelIndex(), self.row_count, self.row_count + count - 1)
+        self.row_count += count
+        self.endInsertRows()
+
+    def fetch_all(self):
+        self.fetchMore(limit=len(self.dataset) - self.row_count)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.HEADERS)
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return self.HEADERS[section]
+        return super().headerData(section, orientation, role)
+
+    def flags(self, index):
+        if not index.isValid():
+            return Qt.NoItemFlags
+        flags = Qt.ItemIsEnabled | Qt.ItemIsSelectable
+        if index.column() == self.STAR_COLUMN:
+            flags |= Qt.ItemIsUserCheckable
+        return flags
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        row, col = index.row(), index.column()
+        if role == Qt.DisplayRole:
+            field = self.FIELDS[col]
+            return None if field is None else str(self.dataset.value(row, field))
+        if role == Qt.CheckStateRole and col == self.STAR_COLUMN:
+            return Qt.Checked if self.dataset.value(row, 'host') in self.starred_hosts else Qt.Unchecked
+        if role == Qt.ForegroundRole and col == self.STATUS_COLUMN:
+            return status_code_color(self.dataset.value(row, 'status_code'))
+        if role == Qt.BackgroundRole:
+            return self.row_colors.get(row)
+        return None
+
+    def setData(self, index, value, role=Qt.EditRole):
+        if role != Qt.CheckStateRole or index.column() != self.STAR_COLUMN:
+            return False
+        host = self.dataset.value(index.row(), 'host')
+        starred = value == Qt.Checked
+        if starred:
+            self.starred_hosts.add(host)
+        else:
+            self.starred_hosts.discard(host)
+        # Every row of the same host shares the star
+        self.dataChanged.emit(self.index(0, self.STAR_COLUMN), self.index(self.rowCount() - 1, self.STAR_COLUMN))
+        self.star_toggled.emit(host, starred)
+        return True
+
+    def set_row_color(self, row, color_hex):
+        if color_hex:
+            self.row_colors[row] = QBrush(QColor(color_hex))
+        else:
+            self.row_colors.pop(row, None)
+        self.dataChanged.emit(self.index(row, 0), self.index(row, self.columnCount() - 1))
+
+    def sort_keys(self, column):
+        """Integer sort keys for every exposed row of a column."""
+        if column == self.STAR_COLUMN:
+            host_column = self.dataset.columns['host']
+            starred = np.array([value in self.starred_hosts for value in host_column.values], dtype=np.int64)
+            return starred[np.array(host_column.codes[:self.row_count], dtype=np.intp)]
+        return self.dataset.sort_keys(self.FIELDS[column])[:self.row_count]
+
+class IndexSortProxyModel(QAbstractProxyModel):
+    """
+    A proxy that presents source rows through an index array. Sorting is a
+    single argsort over precomputed keys instead of per-row lessThan() calls,
+    and filtering applies a precomputed boolean row mask to that array.
+    """
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.order = np.arange(0, dtype=np.int64)
+        self.inverse = None
+        self.sort_column = -1
+        self.sort_order = Qt.AscendingOrder
+        self.row_filter = None
+        self.fetching_for_sort = False
+
+    def setSourceModel(self, model):
+        self.beginResetModel()
+        super().setSourceModel(model)
+        model.modelReset.connect(self.on_source_reset)
+        model.dataChanged.connect(self.on_source_data_changed)
+        model.rowsInserted.connect(self.on_source_rows_inserted)
+        self.order = np.arange(model.rowCount(), dtype=np.int64)
+        self.inverse = None
+        self.endResetModel()
+
+    def on_source_reset(self):
+        self.beginResetModel()
+        self.order = self.filtered(np.arange(self.sourceModel().rowCount(), dtype=np.int64))
+        self.inverse = None
+        self.endResetModel()
+        if self.sort_column >= 0:
+            self.sort(self.sort_column, self.sort_order)
+
+    def on_source_data_changed(self, top_left, bottom_right, roles=()):
+        # Mapping a source range to proxy rows is not contiguous once sorted,
+        # so refresh the whole column span; views only repaint what is visible.
+        if self.rowCount() > 0:
+            self.dataChanged.emit(self.index(0, top_left.column()),
+                                  self.index(self.rowCount() - 1, bottom_right.column()), roles)
+
+    def on_source_rows_inserted(self, parent, first, last):
+        # The source model only ever appends rows
+        new_rows = self.filtered(np.arange(first, last + 1, dtype=np.int64))
+        if len(new_rows) == 0:
+            return
+        self.beginInsertRows(QModelIndex(), len(self.order), len(self.order) + len(new_rows) - 1)
+        self.order = np.concatenate([self.order, new_rows])
+        self.inverse = None
+        self.endInsertRows()
+        if self.sort_column >= 0 and not self.fetching_for_sort:
+            self.merge_new_rows(len(self.order) - len(new_rows))
+
+    def canFetchMore(self, parent=QModelIndex()):
+        return not parent.isValid() and self.sourceModel() is not None and self.sourceModel().canFetchMore()
+
+    def fetchMore(self, parent=QModelIndex()):
+        if not parent.isValid() and self.sourceModel() is not None:
+            # A sorted or filtered view has to place new rows among the old ones, so reveal everything
+            if self.sort_column >= 0 or self.row_filter is not None:
+                self.sourceModel().fetch_all()
+            else:
+                self.sourceModel().fetchMore()
+
+    def index(self, row, column, parent=QModelIndex()):
+        if parent.isValid() or not (0 <= row < self.rowCount()) or not (0 <= column < self.columnCount()):
+            return QModelIndex()
+        return self.createIndex(row, column)
+
+    def parent(self, index=QModelIndex()):
+        return QModelIndex()
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.order)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() or self.sourceModel() is None else self.sourceModel().columnCount()
+
+    def source_row(self, proxy_row):
+        return int(self.order[proxy_row])
+
+    def mapToSource(self, proxy_index):
+        if not proxy_index.isValid():
+            return QModelIndex()
+        return self.sourceModel().index(self.source_row(proxy_index.row()), proxy_index.column())
+
+    def mapFromSource(self, source_index):
+        if not source_index.isValid():
+            return QModelIndex()
+        if self.inverse is None:
+            self.inverse = np.full(self.sourceModel().rowCount(), -1, dtype=np.int64)
+            self.inverse[self.order] = np.arange(len(self.order), dtype=np.int64)
+        proxy_row = int(self.inverse[source_index.row()])
+        return self.index(proxy_row, source_index.column()) if proxy_row >= 0 else QModelIndex()
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if orientation == Qt.Horizontal:
+            return self.sourceModel().headerData(section, orientation, role)
+        return super().headerData(section, orientation, role)
+
+    def filtered(self, rows):
+        """Keeps the rows that pass the current filter; rows past the end of the mask are hidden."""
+        if self.row_filter is None:
+            return rows
+        inside = rows < len(self.row_filter)
+        return rows[inside][self.row_filter[rows[inside]]]
+
+    def set_row_filter(self, mask):
+        """Shows only the source rows whose entry in a boolean mask is True, or every row for None."""
+        self.row_filter = mask
+        self.sort(self.sort_column, self.sort_order)
+
+    def sort(self, column, order=Qt.AscendingOrder):
+        self.sort_column, self.sort_order = column, order
+        if column >= 0 or self.row_filter is not None:
+            # Sorting and filtering apply to every row loaded so far, not just the fetched ones
+            self.fetching_for_sort = True
+            self.sourceModel().fetch_all()
+            self.fetching_for_sort = False
+        if column < 0:
+            new_order = np.arange(self.sourceModel().rowCount(), dtype=np.int64)
+        else:
+            new_order = np.argsort(self.current_keys(), kind='stable').astype(np.int64)
+        self.set_order(self.filtered(new_order))
+
+    def current_keys(self):
+        keys = self.sourceModel().sort_keys(self.sort_column)
+        return -keys if self.sort_order == Qt.DescendingOrder else keys
+
+    def merge_new_rows(self, sorted_count):
+        """
+        Places the rows appended after the first sorted_count entries of the
+        order among the already sorted ones, instead of sorting everything
+        again for every batch that arrives while a file loads.
+        """
+        keys = self.current_keys()
+        old_rows, new_rows = self.order[:sorted_count], self.order[sorted_count:]
+        new_rows = new_rows[np.argsort(keys[new_rows], kind='stable')]
+        # New rows come after old ones with an equal key, as a stable sort would put them
+        positions = np.searchsorted(keys[old_rows], keys[new_rows], side='right')
+        self.set_order(np.insert(old_rows, positions, new_rows))
+
+    def set_order(self, new_order):
+        """Switches to a new row order, keeping persistent indexes (selection, current row) on their rows."""
+        self.layoutAboutToBeChanged.emit()
+        persistent = self.persistentIndexList()
+        source_indexes = [self.mapToSource(index) for index in persistent]
+        self.order = new_order
+        self.inverse = None
+        self.changePersistentIndexList(persistent, [self.mapFromSource(index) for index in source_indexes])
+        self.layoutChanged.emit()
+
+class UrlListModel(QAbstractListModel):
+    """
+    A list of dataset rows shown as URLs. Only row numbers are stored; the
+    URL text is built when a view asks for a visible row.
+    """
+    def __init__(self, dataset, color, parent=None):
+        super().__init__(parent)
+        self.dataset = dataset
+        self.color = QColor(color)
+        self.rows = array('q')
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.rows)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        if role == Qt.DisplayRole:
+            return self.dataset.url(self.rows[index.row()])
+        if role == Qt.ForegroundRole:
+            return self.color
+        return None
+
+    def append_rows(self, rows):
+        if len(rows) == 0:
+            return
+        self.beginInsertRows(QModelIndex(), len(self.rows), len(self.rows) + len(rows) - 1)
+        self.rows.extend(rows)
+        self.endInsertRows()
+
+    def urls(self):
+        return (self.dataset.url(row) for row in self.rows)
@@ -8,6 +8,7 @@ from PyQt5.QtCore import pyqtSignal, QTimer, QSize
 from PyQt5.QtGui import QFont, QIcon
 
 from utils import db as command_db
+from utils.db_worker import run_db_task
 from utils.worker import Worker
 from modules.dialogs import DomainsFileDialog, CommandEditorDialog
 from modules.background_tasks import BackgroundTasksDialog
@@ -124,8 +125,7 @@ class ScanControlWidget(QWidget):
             self.theme_button.setToolTip("Switch to Dark Mode")
 
     def toggle_theme(self):
-        command_db.toggle_theme()
-        self.theme_changed.emit()
+        run_db_task(command_db.toggle_theme, on_result=lambda _: self.theme_changed.emit(), owner=self)
 
     def change_working_directory(self):
         new_dir = QFileDialog.getExistingDirectory(self, "Select New Working Directory", self.working_directory)
@@ -174,9 +174,13 @@ class ScanControlWidget(QWidget):
         return html.replace('\n', '<br>')
 
     def update_progress_bar(self, current_step, total_steps):
+        self.progress_bar.setMaximum(total_steps)
         self.progress_bar.setValue(current_step)
         self.progress_bar.setFormat(f"Step {current_step}/{total_steps}")
 
+    def update_step_progress(self, text):
+        self.progress_bar.setFormat(f"Step {self.progress_bar.value()}/{self.progress_bar.maximum()}: {text}")
+
     def update_timer_display(self):
         self.elapsed_time += 1
         hours, rem = divmod(self.elapsed_time, 3600)
@@ -192,11 +196,10 @@ class ScanControlWidget(QWidget):
         self.output_log.clear()
         self.start_button.setEnabled(False); self.stop_button.setEnabled(True); self.manage_button.setEnabled(False)
         
-        commands = command_db.get_all_commands()
-        total_commands = len(commands)
-        
-        self.progress_bar.setMaximum(total_commands); self.progress_bar.setValue(0)
-        self.progress_bar.setFormat(f"Step 0/{total_commands}"); self.progress_bar.setVisible(True)
+        # The worker reports the step count once it has loaded the commands;
+        # until then the bar shows a busy indicator.
+        self.progress_bar.setMaximum(0); self.progress_bar.setValue(0)
+        self.progress_bar.setFormat("Loading commands..."); self.progress_bar.setVisible(True)
         
         self.elapsed_time = 0; self.timer_label.setText("Elapsed Time: 00:00:00"); self.timer_label.setVisible(True)
         self.scan_timer.start(1000)
@@ -204,6 +207,7 @@ class ScanControlWidget(QWidget):
         self.worker = Worker(target_name=target_name, scope_file=self.scope_file_path, working_directory=self.working_directory)
         self.worker.progress.connect(self.update_log)
         self.worker.progress_updated.connect(self.update_progress_bar)
+        self.worker.step_progress.connect(self.update_step_progress)
         self.worker.scan_updated.connect(self.scan_updated)
         self.worker.background_task_started.connect(self.background_task_started)
         self.worker.finished.connect(self.scan_finished)
@@ -221,6 +225,7 @@ class ScanControlWidget(QWidget):
 
     def scan_finished(self):
         self.scan_timer.stop()
+        self.progress_bar.setMaximum(max(self.progress_bar.maximum(), 1)) # Leave busy mode if no steps ran
         if self.worker and self.worker.is_running:
             self.progress_bar.setValue(self.progress_bar.maximum())
             self.progress_bar.setFormat("Scan Completed")
@@ -1,33 +1,236 @@
+import codecs
 import os
 import shlex
+import shutil
+import signal
+import time
+from collections import deque
 from PyQt5.QtWidgets import (
-    QWidget, QVBoxLayout, QFrame, QTextEdit, QLineEdit, QPushButton,
-    QHBoxLayout, QLabel, QComboBox, QMessageBox, QInputDialog
+    QWidget, QVBoxLayout, QFrame, QPlainTextEdit, QLineEdit, QPushButton, QHBoxLayout, QLabel,
+    QComboBox, QInputDialog, QTableWidget, QTableWidgetItem, QAbstractItemView, QHeaderView,
+    QSpinBox, QSplitter
 )
-from PyQt5.QtCore import QProcess, QSize, Qt
-from PyQt5.QtGui import QFont, QIcon
+from PyQt5.QtCore import QObject, QProcess, QTimer, Qt, pyqtSignal
+from PyQt5.QtGui import QFont, QIcon, QTextCursor
 from utils import db as command_db
+from utils.db_worker import run_db_task
 from modules.dialogs import SudoCommandEditorDialog
 
+DEFAULT_MAX_JOBS = 2
+MAX_JOBS_SETTING = 'sudo_max_jobs'
+# Output kept in memory per job for display; the log on disk has everything
+MAX_TAIL_CHARS = 256 * 1024
+SCROLLBACK_LINES = 5000
+FLUSH_INTERVAL_MS = 100
+# Killed jobs get this long to exit after SIGTERM before they are sent SIGKILL
+KILL_GRACE_MS = 3000
+JOB_LOG_DIR = "sudo_jobs"
+COLUMNS = ["Command", "Status", "Elapsed", "Log"]
+
+def format_duration(seconds):
+    hours, rem = divmod(int(seconds), 3600)
+    minutes, seconds = divmod(rem, 60)
+    return f"{hours:02d}:{minutes:02d}:{seconds:02d}"
+
+class SudoJob(QObject):
+    """
+    One privileged command: its process, status and output. Everything the
+    command writes is streamed to a log file, and the last MAX_TAIL_CHARS are
+    kept in memory for display. The command runs in the working directory,
+    in a process group of its own so that stopping it reaches its children.
+    """
+    output_received = pyqtSignal(object, str)
+    status_changed = pyqtSignal(object)
+
+    def __init__(self, command, working_directory, parent=None):
+        super().__init__(parent)
+        self.command = command
+        self.working_directory = working_directory
+        self.status = "Queued"
+        self.process = None
+        self.started_at = None
+        self.ended_at = None
+        self.tail = deque()
+        self.tail_size = 0
+        self.decoder = codecs.getincrementaldecoder('utf-8')(errors='replace')
+        self.log = None
+        name = f"{time.strftime('%Y%m%d-%H%M%S')}_{id(self):x}.log"
+        self.log_path = os.path.join(working_directory, JOB_LOG_DIR, name)
+
+    def is_running(self):
+        return self.process is not None and self.process.state() != QProcess.NotRunning
+
+    def is_finished(self):
+        return self.status not in ("Queued", "Running", "Stopping")
+
+    def elapsed(self):
+        if self.started_at is None:
+            return 0
+        return (self.ended_at or time.monotonic()) - self.started_at
+
+    def start(self, password):
+        if not password:
+            self.append_text("[ERROR] No sudo password; the command was not started.\n")
+            self.finish("Failed to start")
+            return
+        try:
+            os.makedirs(os.path.dirname(self.log_path), exist_ok=True)
+            self.log = open(self.log_path, 'wb')
+            self.log.write(f"$ {self.command}\n".encode())
+        except OSError as e:
+            self.log = None
+            self.append_text(f"[!] No log file: {e}\n")
+
+        # `sudo -S` reads the password from stdin
+        command_parts = shlex.split(self.command)
+        command_parts.insert(1, '-S')
+        # setsid gives sudo and everything it starts a process group to signal as a whole
+        if shutil.which('setsid'):
+            command_parts.insert(0, 'setsid')
+        self.process = QProcess(self)
+        self.process.setProcessChannelMode(QProcess.MergedChannels)
+        self.process.setWorkingDirectory(self.working_directory)
+        self.process.readyReadStandardOutput.connect(self.handle_output)
+        self.process.finished.connect(self.handle_finish)
+        self.process.errorOccurred.connect(self.handle_error)
+        self.started_at = time.monotonic()
+        self.process.start(command_parts[0], command_parts[1:])
+        try:
+            self.process.write((password + '\n').encode())
+        finally:
+            # Nothing else is sent, so a wrong password fails at once instead of waiting for another try
+            self.process.closeWriteChannel()
+        # A process that failed to start has already been marked as such
+        if not self.is_finished():
+            self.set_status("Running")
+
+    def append_text(self, text):
+        self.tail.append(text)
+        self.tail_size += len(text)
+        while self.tail_size - len(self.tail[0]) > MAX_TAIL_CHARS:
+            self.tail_size -= len(self.tail.popleft())
+        self.output_received.emit(self, text)
+
+    def text(self):
+        return "".join(self.tail)[-MAX_TAIL_CHARS:]
+
+    def handle_output(self):
+        data = self.process.readAllStandardOutput().data()
+        if self.log:
+            self.log.write(data)
+        self.append_text(self.decoder.decode(data))
+
+    def handle_error(self, error):
+        if error == QProcess.FailedToStart:
+            self.append_text(f"[ERROR] Failed to start process: {self.process.errorString()}\n")
+            self.finish("Failed to start")
+
+    def handle_finish(self):
+        if self.status == "Stopping":
+            self.finish("Killed")
+        else:
+            exit_code = self.process.exitCode()
+            self.append_text(f"\n--- Process finished with exit code: {exit_code} ---\n")
+            self.finish("Done" if exit_code == 0 else f"Exit {exit_code}")
+
+    def finish(self, status):
+        if self.is_finished():
+            return
+        self.ended_at = time.monotonic()
+        if self.log:
+            self.log.close()
+            self.log = None
+        self.set_status(status)
+
+    def kill(self):
+        """Asks the command to stop; sudo relays SIGTERM, and SIGKILL follows if it doesn't."""
+        if self.status == "Queued":
+            self.finish("Cancelled")
+        elif self.is_running():
+            self.set_status("Stopping")
+            self.signal_group(signal.SIGTERM)
+            QTimer.singleShot(KILL_GRACE_MS, lambda: self.is_running() and self.signal_group(signal.SIGKILL))
+
+    def signal_group(self, signum):
+        """
+        Sends a signal to the job's process group, or only to sudo if it
+        doesn't lead one (no setsid). Processes running as root in the group
+        can't be signalled directly; sudo relays the signal to the command.
+        """
+        pid = self.process.processId()
+        try:
+            if pid > 0 and os.getpgid(pid) == pid:
+                os.killpg(pid, signum)
+                return
+        except (ProcessLookupError, PermissionError):
+            pass
+        if signum == signal.SIGKILL:
+            self.process.kill()
+        else:
+            self.process.terminate()
+
+    def set_status(self, status):
+        self.status = status
+        self.status_changed.emit(self)
+
 class SudoTerminalWidget(QWidget):
-    """A dedicated terminal for running commands with sudo."""
-    def __init__(self, icon_path, parent=None):
+    """
+    Runs commands with sudo as a table of concurrent jobs. At most max_jobs
+    run at once and the rest wait their turn; every job has its own output,
+    log file, status, elapsed time and kill control, and the sudo password is
+    asked for once and reused by all of them.
+    """
+    def __init__(self, icon_path, working_directory=None, parent=None):
         super().__init__(parent)
         self.icon_path = icon_path
+        self.working_directory = working_directory or os.getcwd()
         self.sudo_password = None
-        self.process = QProcess(self)
+        self.prompting = False
+        self.jobs = []
+        self.max_jobs = DEFAULT_MAX_JOBS
+        self.shown_job = None
 
         # --- Icons ---
         self.run_icon = QIcon(os.path.join(self.icon_path, "run.svg"))
-        
+
         # --- Main Layout ---
         main_layout = QVBoxLayout(self)
-        
-        # --- Output Display ---
-        self.output_display = QTextEdit(readOnly=True)
+
+        # --- Jobs ---
+        jobs_bar_layout = QHBoxLayout()
+        jobs_bar_layout.addWidget(QLabel("Max concurrent jobs:"))
+        self.max_jobs_spin = QSpinBox()
+        self.max_jobs_spin.setRange(1, 32)
+        self.max_jobs_spin.setValue(self.max_jobs)
+        jobs_bar_layout.addWidget(self.max_jobs_spin)
+        jobs_bar_layout.addStretch()
+        self.kill_btn = QPushButton("Kill Selected")
+        self.kill_btn.setEnabled(False)
+        jobs_bar_layout.addWidget(self.kill_btn)
+        self.clear_btn = QPushButton("Clear Finished")
+        jobs_bar_layout.addWidget(self.clear_btn)
+        main_layout.addLayout(jobs_bar_layout)
+
+        splitter = QSplitter(Qt.Vertical)
+        self.jobs_table = QTableWidget(0, len(COLUMNS))
+        self.jobs_table.setHorizontalHeaderLabels(COLUMNS)
+        self.jobs_table.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.jobs_table.setSelectionMode(QAbstractItemView.SingleSelection)
+        self.jobs_table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.jobs_table.verticalHeader().setVisible(False)
+        self.jobs_table.horizontalHeader().setSectionResizeMode(0, QHeaderView.Stretch)
+        for column in range(1, len(COLUMNS)):
+            self.jobs_table.horizontalHeader().setSectionResizeMode(column, QHeaderView.ResizeToContents)
+        splitter.addWidget(self.jobs_table)
+
+        # --- Output Display (of the selected job) ---
+        self.output_display = QPlainTextEdit(readOnly=True)
         self.output_display.setFont(QFont("Courier", 10))
-        main_layout.addWidget(self.output_display)
-        
+        self.output_display.setMaximumBlockCount(SCROLLBACK_LINES)
+        splitter.addWidget(self.output_display)
+        splitter.setSizes([150, 400])
+        main_layout.addWidget(splitter)
+
         # --- Saved Commands ---
         saved_frame = QFrame()
         saved_frame.setFrameShape(QFrame.StyledPanel)
@@ -55,19 +258,45 @@ class SudoTerminalWidget(QWidget):
         custom_layout.addWidget(self.run_custom_btn)
         main_layout.addWidget(custom_frame)
 
+        # Output of the shown job is added to the display at most every FLUSH_INTERVAL_MS
+        self.pending_output = []
+        self.flush_timer = QTimer(self)
+        self.flush_timer.setSingleShot(True)
+        self.flush_timer.setInterval(FLUSH_INTERVAL_MS)
+        self.flush_timer.timeout.connect(self.flush_output)
+        # One ticker updates the elapsed time of every running job
+        self.ticker = QTimer(self)
+        self.ticker.setInterval(1000)
+        self.ticker.timeout.connect(self.update_elapsed)
+
         # --- Connections ---
         self.run_saved_btn.clicked.connect(self.run_saved_command)
         self.run_custom_btn.clicked.connect(self.run_custom_command)
         self.custom_command_input.returnPressed.connect(self.run_custom_command)
-        self.process.readyReadStandardOutput.connect(self.handle_output)
-        self.process.finished.connect(self.handle_finish)
         self.manage_btn.clicked.connect(self.open_sudo_command_editor)
+        self.kill_btn.clicked.connect(self.kill_selected_job)
+        self.clear_btn.clicked.connect(self.clear_finished_jobs)
+        self.jobs_table.itemSelectionChanged.connect(self.show_selected_job)
+        self.max_jobs_spin.valueChanged.connect(self.set_max_jobs)
         self.load_saved_commands()
+        run_db_task(command_db.get_setting, MAX_JOBS_SETTING, on_result=self.on_max_jobs_loaded, owner=self)
 
     def load_saved_commands(self):
         """Loads commands from the dedicated sudo_commands table."""
+        run_db_task(
+            command_db.get_all_sudo_commands,
+            on_result=self.on_saved_commands_loaded,
+            on_loading=self.show_saved_commands_loading,
+            owner=self
+        )
+
+    def show_saved_commands_loading(self):
+        self.saved_commands_combo.clear()
+        self.saved_commands_combo.addItem("Loading...")
+        self.saved_commands_combo.setEnabled(False)
+
+    def on_saved_commands_loaded(self, commands):
         self.saved_commands_combo.clear()
-        commands = command_db.get_all_sudo_commands()
         if commands:
             self.saved_commands_combo.addItems([cmd['command_text'] for cmd in commands])
             self.saved_commands_combo.setEnabled(True)
@@ -75,12 +304,28 @@ class SudoTerminalWidget(QWidget):
             self.saved_commands_combo.addItem("No sudo commands found")
             self.saved_commands_combo.setEnabled(False)
 
+    def on_max_jobs_loaded(self, value):
+        if value and value.isdigit():
+            self.max_jobs_spin.blockSignals(True)
+            self.max_jobs_spin.setValue(int(value))
+            self.max_jobs_spin.blockSignals(False)
+            self.max_jobs = self.max_jobs_spin.value()
+            self.start_queued_jobs()
+
+    def set_max_jobs(self, value):
+        self.max_jobs = value
+        run_db_task(command_db.set_setting, MAX_JOBS_SETTING, str(value))
+        self.start_queued_jobs()
+
+    def set_working_directory(self, path):
+        self.working_directory = path
+
     def open_sudo_command_editor(self):
         """Opens the dialog to manage sudo commands."""
         dialog = SudoCommandEditorDialog(self)
         dialog.exec_()
         self.load_saved_commands() # Reload commands after the dialog is closed
-        
+
     def prompt_for_password(self):
         """Prompts for the sudo password if not already stored."""
         if self.sudo_password is None:
@@ -93,13 +338,13 @@ class SudoTerminalWidget(QWidget):
                 self.sudo_password = text
                 return True
             else:
-                self.output_display.append("\n[ERROR] Sudo password not provided. Command aborted.")
+                self.output_display.appendPlainText("\n[ERROR] Sudo password not provided. Command aborted.")
                 return False
         return True
 
     def run_saved_command(self):
         command = self.saved_commands_combo.currentText()
-        if command and "No sudo commands found" not in command:
+        if command and "No sudo commands found" not in command and command != "Loading...":
             self.execute_command(command)
 
     def run_custom_command(self):
@@ -112,39 +357,138 @@ class SudoTerminalWidget(QWidget):
             self.custom_command_input.clear()
 
     def execute_command(self, command):
-        """Handles the logic of running a command with sudo."""
-        if self.process.state() == QProcess.Running:
-            QMessageBox.warning(self, "Process Busy", "A command is already running.")
+        """Adds a job for the command; it starts now if fewer than max_jobs are running."""
+        if not self.prompt_for_password():
+            return
+        try:
+            shlex.split(command)
+        except ValueError as e:
+            self.output_display.appendPlainText(f"\n[ERROR] Invalid command: {e}")
             return
 
-        if not self.prompt_for_password():
+        job = SudoJob(command, self.working_directory, self)
+        job.output_received.connect(self.on_job_output)
+        job.status_changed.connect(self.on_job_status_changed)
+        self.jobs.append(job)
+        row = self.jobs_table.rowCount()
+        self.jobs_table.insertRow(row)
+        self.jobs_table.setItem(row, 0, QTableWidgetItem(command))
+        self.jobs_table.setItem(row, 1, QTableWidgetItem(job.status))
+        self.jobs_table.setItem(row, 2, QTableWidgetItem(format_duration(0)))
+        log_item = QTableWidgetItem(os.path.basename(job.log_path))
+        log_item.setToolTip(job.log_path)
+        self.jobs_table.setItem(row, 3, log_item)
+        self.jobs_table.selectRow(row)
+        self.start_queued_jobs()
+
+    def start_queued_jobs(self):
+        running = sum(1 for job in self.jobs if job.status in ("Running", "Stopping"))
+        queued = [job for job in self.jobs if job.status == "Queued"]
+        if queued and running < self.max_jobs and self.sudo_password is None:
+            # The password was rejected since these were queued; ask before starting any more
+            if self.prompting:
+                return
+            self.prompting = True
+            try:
+                provided = self.prompt_for_password()
+                if not provided:
+                    for job in queued:
+                        job.finish("Cancelled")
+            finally:
+                self.prompting = False
+            if not provided:
+                return
+            # Jobs may have finished or been started while the dialog was open
+            running = sum(1 for job in self.jobs if job.status in ("Running", "Stopping"))
+        for job in self.jobs:
+            if running >= self.max_jobs:
+                break
+            if job.status == "Queued":
+                job.start(self.sudo_password)
+                running += 1
+        if running and not self.ticker.isActive():
+            self.ticker.start()
+
+    def on_job_output(self, job, text):
+        if job is self.shown_job:
+            self.pending_output.append(text)
+            if not self.flush_timer.isActive():
+                self.flush_timer.start()
+        # A wrong cached password would fail every job from now on; queued jobs wait for it to be asked again
+        if "incorrect password" in text or "Sorry, try again" in text:
+            self.sudo_password = None
+
+    def flush_output(self):
+        if not self.pending_output:
             return
+        text = "".join(self.pending_output)[-MAX_TAIL_CHARS:]
+        self.pending_output = []
+        # Only follow the output if the user hasn't scrolled up to read something
+        scroll_bar = self.output_display.verticalScrollBar()
+        at_bottom = scroll_bar.value() == scroll_bar.maximum()
+        cursor = QTextCursor(self.output_display.document())
+        cursor.movePosition(QTextCursor.End)
+        cursor.insertText(text)
+        if at_bottom:
+            scroll_bar.setValue(scroll_bar.maximum())
 
-        self.output_display.append(f"\n$ {command}")
-        self.set_ui_running(True)
+    def on_job_status_changed(self, job):
+        row = self.jobs.index(job)
+        self.jobs_table.item(row, 1).setText(job.status)
+        self.jobs_table.item(row, 2).setText(format_duration(job.elapsed()))
+        if job is self.shown_job:
+            self.kill_btn.setEnabled(not job.is_finished())
+        if job.is_finished():
+            self.start_queued_jobs()
+            if not any(other.is_running() for other in self.jobs):
+                self.ticker.stop()
 
-        # Use `sudo -S` to read the password from stdin
-        command_parts = shlex.split(command)
-        command_parts.insert(1, '-S')
-        
-        self.process.start(command_parts[0], command_parts[1:])
-        if self.process.waitForStarted():
-            self.process.write((self.sudo_password + '\n').encode())
-        else:
-            self.output_display.append(f"[ERROR] Failed to start process: {self.process.errorString()}")
-            self.set_ui_running(False)
+    def update_elapsed(self):
+        for row, job in enumerate(self.jobs):
+            if job.is_running():
+                self.jobs_table.item(row, 2).setText(format_duration(job.elapsed()))
 
-    def handle_output(self):
-        self.output_display.append(self.process.readAllStandardOutput().data().decode(errors='ignore').strip())
+    def selected_job(self):
+        rows = self.jobs_table.selectionModel().selectedRows()
+        return self.jobs[rows[0].row()] if rows else None
 
-    def handle_finish(self):
-        exit_code = self.process.exitCode()
-        self.output_display.append(f"\n--- Process finished with exit code: {exit_code} ---")
-        self.set_ui_running(False)
-
-    def set_ui_running(self, is_running):
-        """Enables or disables UI elements based on process state."""
-        self.run_saved_btn.setEnabled(not is_running)
-        self.run_custom_btn.setEnabled(not is_running)
-        self.custom_command_input.setEnabled(not is_running)
-        self.saved_commands_combo.setEnabled(not is_running and self.saved_commands_combo.count() > 0 and "No sudo" not in self.saved_commands_combo.currentText())
+    def show_selected_job(self):
+        job = self.selected_job()
+        if job is self.shown_job:
+            return
+        self.shown_job = job
+        self.pending_output = []
+        self.flush_timer.stop()
+        self.output_display.setPlainText(job.text() if job else "")
+        self.output_display.verticalScrollBar().setValue(self.output_display.verticalScrollBar().maximum())
+        self.kill_btn.setEnabled(job is not None and not job.is_finished())
+
+    def kill_selected_job(self):
+        job = self.selected_job()
+        if job:
+            job.kill()
+
+    def clear_finished_jobs(self):
+        for row in reversed(range(len(self.jobs))):
+            job = self.jobs[row]
+            if job.is_finished():
+                self.jobs_table.removeRow(row)
+                del self.jobs[row]
+                job.deleteLater()
+        if self.shown_job not in self.jobs:
+            self.show_selected_job()
+
+    def stop_all_jobs(self):
+        """Stops every job without waiting for its signals, e.g. when the app closes."""
+        # Cancel the queue first so finishing jobs don't start the next ones
+        for job in self.jobs:
+            if job.status == "Queued":
+                job.finish("Cancelled")
+        for job in self.jobs:
+            if job.is_running():
+                job.process.blockSignals(True)
+                job.process.terminate()
+                if not job.process.waitForFinished(1000):
+                    job.process.kill()
+                    job.process.waitForFinished(1000)
+                job.finish("Killed")
@@ -0,0 +1,72 @@
+"""
+Measures the internal port scanner against a farm of local listeners: opens
+--listeners TCP listeners spread over --hosts loopback addresses
+(127.0.0.2, 127.0.0.3, ...) inside a port range, scans the whole range on
+those addresses and checks that exactly the farm's ports come back open:
+
+    python port_scan_benchmark.py --hosts 8 --ports 20000-27999 --listeners 400
+"""
+import argparse
+import os
+import random
+import socket
+import sys
+import tempfile
+import time
+from utils.port_scanner import DEFAULT_CONCURRENCY, parse_ports, run_port_scan
+
+def open_listener_farm(hosts, ports, count):
+    """Listens on `count` random (host, port) pairs; returns the sockets and the endpoints."""
+    sockets, endpoints = [], set()
+    candidates = [(host, port) for host in hosts for port in ports]
+    random.shuffle(candidates)
+    for host, port in candidates:
+        if len(sockets) == count:
+            break
+        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        try:
+            sock.bind((host, port))
+        except OSError:
+            sock.close() # Taken by something else
+            continue
+        sock.listen(16)
+        sockets.append(sock)
+        endpoints.add(f"{host}:{port}")
+    return sockets, endpoints
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the TCP connect port scanner against local listeners.")
+    parser.add_argument('--hosts', type=int, default=8, help="Loopback addresses to scan (default: 8)")
+    parser.add_argument('--ports', default="20000-27999", help="Port range scanned on each address")
+    parser.add_argument('--listeners', type=int, default=400, help="Open ports in the farm")
+    parser.add_argument('--concurrency', type=int, default=DEFAULT_CONCURRENCY)
+    parser.add_argument('--timeout', type=float, default=1.0)
+    args = parser.parse_args(argv)
+
+    hosts = [f"127.0.0.{i}" for i in range(2, 2 + args.hosts)]
+    sockets, expected = open_listener_farm(hosts, parse_ports(args.ports), args.listeners)
+    with tempfile.TemporaryDirectory() as work_dir:
+        input_path = os.path.join(work_dir, "scopeips")
+        output_path = os.path.join(work_dir, "portscan_out")
+        with open(input_path, 'w') as f:
+            f.write("\n".join(hosts) + "\n")
+        started = time.perf_counter()
+        success, message = run_port_scan(input_path, output_path, args.ports, args.concurrency, timeout=args.timeout)
+        elapsed = time.perf_counter() - started
+        with open(output_path) as f:
+            found = {line.strip() for line in f if line.strip()}
+    for sock in sockets:
+        sock.close()
+
+    if not success:
+        print(message, file=sys.stderr)
+        return 1
+    probes = len(hosts) * len(parse_ports(args.ports))
+    print(message)
+    print(f"{probes} probes in {elapsed:.2f}s: {probes / elapsed:,.0f} probes/s")
+    missed, extra = expected - found, found - expected
+    print(f"{len(expected)} listeners, {len(found & expected)} found, {len(missed)} missed, {len(extra)} unexpected")
+    return 0 if not missed and not extra else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,59 @@
+import numpy as np
+import pytest
+from utils.httpx_data import HttpxDataset
+from utils.facet_index import FacetIndex, PostingLists
+
+RECORDS = [
+    {'host': 'example.com', 'path': '/index.php', 'extension': '.php', 'status_code': 200, 'technology': 'PHP,Nginx'},
+    {'host': 'api.example.com', 'path': '/v1/users', 'extension': '', 'status_code': 301, 'technology': 'Nginx'},
+    {'host': 'notexample.com', 'path': '/admin/login.php', 'extension': '.php', 'status_code': 403, 'technology': 'N/A'},
+    {'host': 'dev.api.example.com', 'path': '/static/app.js', 'extension': '.js', 'status_code': 404, 'technology': 'Express'},
+    {'host': 'other.org', 'path': '/Admin/Panel', 'extension': '', 'status_code': 500, 'technology': 'IIS'},
+]
+
+@pytest.fixture
+def index():
+    dataset = HttpxDataset()
+    dataset.extend(RECORDS)
+    return FacetIndex(dataset)
+
+def rows(mask):
+    return np.flatnonzero(mask).tolist()
+
+def test_status_codes_and_classes(index):
+    assert rows(index.status_mask("200")) == [0]
+    assert rows(index.status_mask("3xx, 404")) == [1, 3]
+    assert rows(index.status_mask("4XX 5xx")) == [2, 3, 4]
+    assert rows(index.status_mask("999")) == []
+
+def test_extension_with_or_without_dot(index):
+    assert rows(index.extension_mask("php")) == [0, 2]
+    assert rows(index.extension_mask(".JS, php")) == [0, 2, 3]
+
+def test_technology_tokens(index):
+    assert rows(index.technology_mask("nginx")) == [0, 1]
+    assert rows(index.technology_mask("ph")) == [0]
+    # 'N/A' is a placeholder, not a technology
+    assert rows(index.technology_mask("n/a")) == []
+
+def test_host_suffix_covers_domain_and_subdomains_only(index):
+    assert rows(index.host_suffix_mask("example.com")) == [0, 1, 3]
+    assert rows(index.host_suffix_mask(".api.example.com.")) == [1, 3]
+    assert rows(index.host_suffix_mask("")) == []
+
+def test_path_substring_is_case_insensitive(index):
+    assert rows(index.path_mask("admin")) == [2, 4]
+    assert rows(index.path_mask("ph")) == [0, 2]
+    assert rows(index.path_mask("/v1/users")) == [1]
+    assert rows(index.path_mask("nothing-like-this")) == []
+
+def test_filters_are_anded(index):
+    assert index.filter_mask() is None
+    assert rows(index.filter_mask(status="4xx", extension="php")) == [2]
+    assert rows(index.filter_mask(host_suffix="example.com", path="v1")) == [1]
+
+@pytest.mark.parametrize("wanted", [[0], [1, 2], [0, 1, 2, 3]])
+def test_posting_lists_sparse_and_dense_agree(wanted):
+    codes = np.random.default_rng(0).integers(0, 4, 1000).astype(np.intp)
+    postings = PostingLists(codes, 4)
+    assert np.array_equal(postings.row_mask(wanted), np.isin(codes, wanted))
@@ -0,0 +1,104 @@
+import os
+import sys
+import time
+import pytest
+from utils import fanout
+
+def test_parse_fanout():
+    spec = fanout.parse_fanout("foreach:live_hosts:10 ffuf -u {line}/FUZZ -o ffuf/{line_safe}.json")
+    assert (spec.input_file, spec.jobs, spec.template) == ("live_hosts", 10, "ffuf -u {line}/FUZZ -o ffuf/{line_safe}.json")
+    assert spec.tool == "ffuf"
+
+def test_parse_fanout_defaults_and_clamps_jobs():
+    assert fanout.parse_fanout("foreach:hosts nuclei -u {line}").jobs == fanout.DEFAULT_JOBS
+    assert fanout.parse_fanout("foreach:hosts:0 nuclei -u {line}").jobs == 1
+    assert fanout.parse_fanout("foreach:hosts:1000 nuclei -u {line}").jobs == fanout.MAX_JOBS
+    assert fanout.parse_fanout("foreach:hosts /usr/bin/nuclei -u {index}").tool == "nuclei"
+
+@pytest.mark.parametrize("command", [
+    "foreach:hosts",
+    "foreach:hosts nuclei -u example.com",
+    "foreach:hosts:many nuclei -u {line}",
+])
+def test_parse_fanout_rejects_malformed_steps(command):
+    with pytest.raises(ValueError):
+        fanout.parse_fanout(command)
+
+@pytest.mark.parametrize("template", [
+    "curl '{line}'",
+    'ffuf -u "{line}/FUZZ"',
+    'sh -c "nuclei -u {line}"',
+])
+def test_parse_fanout_rejects_quoted_line_in_shell_steps(template):
+    with pytest.raises(ValueError):
+        fanout.parse_fanout(f"foreach:hosts {template}", use_shell=True)
+    assert fanout.parse_fanout(f"foreach:hosts {template}").template == template
+
+def test_parse_fanout_allows_other_quoting_in_shell_steps():
+    template = "curl {line} -H 'X-Id: {index}' -o \"out dir/{line_safe}\" 2>/dev/null"
+    assert fanout.parse_fanout(f"foreach:hosts {template}", use_shell=True).template == template
+
+def test_output_paths():
+    assert fanout.output_paths("ffuf -u {line} -o 'ffuf out/{line_safe}.json' 2>/dev/null") == ["ffuf out/{line_safe}.json"]
+    assert fanout.output_paths("nmap {line} -oA nmap/{index} --output=x/y") == ["nmap/{index}", "x/y"]
+    assert fanout.output_paths("tool {line} > out/{line_safe}.txt") == ["out/{line_safe}.txt"]
+    assert fanout.output_paths("tool 'unterminated {line}") == []
+
+def test_read_fanout_lines_dedupes_and_skips_comments(tmp_path):
+    path = tmp_path / "hosts"
+    path.write_text("a.com\n\n# comment\n b.com \na.com\n")
+    assert fanout.read_fanout_lines(str(path)) == ["a.com", "b.com"]
+
+def test_safe_name():
+    assert fanout.safe_name("https://a.example.com:8443") == "https_a.example.com_8443"
+    assert fanout.safe_name("...") == "line"
+    assert len(fanout.safe_name("x" * 500)) == 100
+
+def test_expand_without_shell_keeps_a_line_as_one_argument():
+    line = "https://a.com/it's here"
+    assert fanout.expand("tool -u {line} -o out/{line_safe}_{index}.txt", line, 3, use_shell=False) == [
+        "tool", "-u", line, "-o", "out/https_a.com_it_s_here_3.txt"
+    ]
+
+def test_expand_with_shell_quotes_the_line():
+    assert fanout.expand("echo {line} > {index}.txt", "a; rm -rf /", 1, use_shell=True) == "echo 'a; rm -rf /' > 1.txt"
+
+def test_keep_unknown_placeholders():
+    text = "tool -o {output_dir}/x -u {line}".format_map(fanout.KeepUnknownPlaceholders(output_dir="/tmp"))
+    assert text == "tool -o /tmp/x -u {line}"
+
+def test_run_parallel_records_failures_and_logs(tmp_path):
+    instances = [
+        ("ok", [sys.executable, "-c", "print('hello')"], str(tmp_path / "ok.log")),
+        ("fail", [sys.executable, "-c", "raise SystemExit(3)"], str(tmp_path / "fail.log")),
+        ("no log", [sys.executable, "-c", "pass"], str(tmp_path / "missing" / "x.log")),
+    ]
+    updates = []
+    done, failures, missing = fanout.run_parallel(instances, 2, str(tmp_path), progress=lambda *args: updates.append(args))
+    assert done == 3 and not missing
+    assert sorted(key for key, _ in failures) == ["fail", "no log"]
+    assert dict(failures)["fail"] == "exit code 3"
+    assert (tmp_path / "ok.log").read_text().strip() == "hello"
+    assert updates[-1] == (3, 2)
+
+def test_run_parallel_skips_the_rest_when_the_program_is_missing(tmp_path):
+    instances = [(str(i), ["no-such-program-for-fanout"], str(tmp_path / f"{i}.log")) for i in range(5)]
+    done, failures, missing = fanout.run_parallel(instances, 1, str(tmp_path))
+    assert missing and done == 5 and failures == [("0", "command not found")]
+
+def test_stopping_terminates_children_of_a_shell(tmp_path):
+    pid_file = tmp_path / "child.pid"
+    instances = [("sleep", f"sleep 30 & echo $! > {pid_file}; wait", str(tmp_path / "sleep.log"))]
+    started = time.monotonic()
+    done, failures, missing = fanout.run_parallel(instances, 1, str(tmp_path), use_shell=True,
+                                                  should_stop=lambda: pid_file.exists() and pid_file.read_text().strip())
+    assert time.monotonic() - started < 10
+    child = int(pid_file.read_text())
+    for _ in range(100):
+        try:
+            os.kill(child, 0)
+        except ProcessLookupError:
+            break
+        time.sleep(0.05)
+    else:
+        pytest.fail("the shell's child kept running")
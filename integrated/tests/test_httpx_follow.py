@@ -0,0 +1,46 @@
+import json
+from utils.httpx_data import complete_lines_size, parse_httpx_range, parse_httpx_tail, split_file_ranges
+from utils.parse_worker import HttpxParseWorker
+
+def httpx_line(path):
+    return json.dumps({'url': f"https://example.com{path}", 'status_code': 200, 'content_length': 10}) + "\n"
+
+def test_complete_lines_size_stops_at_last_newline(tmp_path):
+    path = tmp_path / "httpx.json"
+    path.write_text(httpx_line("/a") + '{"url": "https://exa')
+    assert complete_lines_size(str(path)) == len(httpx_line("/a"))
+    path.write_text('{"url": "https://exa')
+    assert complete_lines_size(str(path)) == 0
+
+def test_ranges_leave_out_a_partial_last_line(tmp_path):
+    path = tmp_path / "httpx.json"
+    complete = "".join(httpx_line(f"/{n}") for n in range(20))
+    path.write_text(complete + '{"url": "https://exa')
+    ranges = split_file_ranges(str(path), chunk_size=100)
+    assert len(ranges) > 1
+    assert ranges[-1][1] == len(complete)
+    assert sum(len(parse_httpx_range(str(path), start, end)) for start, end in ranges) == 20
+
+def test_follow_picks_up_a_partial_line_once_it_ends(tmp_path, monkeypatch):
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path)) # Keep the parse cache out of the user's cache directory
+    path = tmp_path / "httpx.json"
+    complete = httpx_line("/a") + httpx_line("/b")
+    partial = httpx_line("/c")
+    path.write_text(complete + partial[:15])
+
+    worker = HttpxParseWorker([str(path)])
+    batches = []
+    worker.batch_ready.connect(batches.append)
+    worker.run()
+    assert sum(len(batch) for batch in batches) == 2
+    offset = worker.file_offsets[str(path)]
+    assert offset == len(complete)
+
+    dataset, offset = parse_httpx_tail(str(path), offset)
+    assert len(dataset) == 0 and offset == len(complete)
+
+    with open(path, 'a') as f:
+        f.write(partial[15:])
+    dataset, offset = parse_httpx_tail(str(path), offset)
+    assert [dataset.url(row) for row in range(len(dataset))] == ["https://example.com/c"]
+    assert offset == len(complete) + len(partial)
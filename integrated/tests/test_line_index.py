@@ -0,0 +1,56 @@
+import re
+from utils.line_index import CHECKPOINT_INTERVAL, MAX_LINE_BYTES, FileReader, LineCache, LineIndex, search_lines
+
+LINES = [f"line {i} " + "x" * (MAX_LINE_BYTES + 10 if i % 300 == 7 else i % 40) for i in range(1000)]
+
+def write_lines(path, last="tail"):
+    path.write_text("\n".join(LINES) + "\n" + last)
+
+def indexed(path):
+    reader = FileReader(str(path))
+    index = LineIndex()
+    index.extend(reader, reader.size())
+    return reader, index
+
+def test_index_and_read_lines(tmp_path):
+    path = tmp_path / "out.txt"
+    write_lines(path)
+    reader, index = indexed(path)
+    assert index.line_count == len(LINES)
+    cache = LineCache(index, reader, reader.size())
+    for row in (0, 7, CHECKPOINT_INTERVAL - 1, CHECKPOINT_INTERVAL, 607, len(LINES) - 1):
+        assert cache.line(row) == LINES[row][:MAX_LINE_BYTES]
+    # The unterminated last line is readable too
+    assert cache.line(len(LINES)) == "tail"
+    reader.close()
+
+def test_lines_past_the_known_end_are_not_read(tmp_path):
+    path = tmp_path / "out.txt"
+    write_lines(path)
+    reader, index = indexed(path)
+    cache = LineCache(index, reader, index.checkpoints[1])
+    assert cache.line(CHECKPOINT_INTERVAL - 1) == LINES[CHECKPOINT_INTERVAL - 1]
+    assert cache.line(CHECKPOINT_INTERVAL) == ""
+    reader.close()
+
+def test_search_lines_numbers_matches(tmp_path):
+    path = tmp_path / "out.txt"
+    write_lines(path)
+    reader, _ = indexed(path)
+    assert [line for line, _ in search_lines(reader, re.compile(rb'^line 99\d ', re.MULTILINE))] == list(range(990, 1000))
+    assert list(search_lines(reader, re.compile(rb'tail'))) == [(len(LINES), "tail")]
+    progress = []
+    assert [line for line, _ in search_lines(reader, re.compile(rb'line 5 '), progress=progress.append)] == [5]
+    assert progress[-1] == reader.size()
+    reader.close()
+
+def test_truncated_file_reads_short_instead_of_crashing(tmp_path):
+    path = tmp_path / "out.txt"
+    write_lines(path)
+    reader, index = indexed(path)
+    stale_end = reader.size()
+    path.write_text("short\n")
+    # A memory map would raise SIGBUS here
+    assert LineCache(index, reader, stale_end).line(500) == ""
+    assert list(search_lines(reader, re.compile(rb'line'), end=stale_end)) == []
+    reader.close()
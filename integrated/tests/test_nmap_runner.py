@@ -0,0 +1,99 @@
+import json
+import os
+import sys
+import textwrap
+from utils.nmap_runner import NMAP_DIR, nmap_command, parse_nmap_xml, read_open_ports, run_nmap_hosts
+
+NMAP_XML = """<?xml version="1.0"?>
+<nmaprun>
+  <host>
+    <address addr="10.0.0.5" addrtype="ipv4"/>
+    <address addr="00:11:22:33:44:55" addrtype="mac"/>
+    <hostnames><hostname name="web.example.com" type="PTR"/></hostnames>
+    <ports>
+      <port protocol="tcp" portid="443">
+        <state state="open"/>
+        <service name="http" product="nginx" version="1.18.0" extrainfo="Ubuntu" tunnel="ssl"/>
+        <script id="http-title" output="  Login  "/>
+        <script id="ssl-cert" output="Subject: commonName=web.example.com"/>
+      </port>
+      <port protocol="tcp" portid="22">
+        <state state="open"/>
+        <service name="ssh" extrainfo="protocol 2.0"/>
+      </port>
+      <port protocol="tcp" portid="9999">
+        <state state="filtered"/>
+      </port>
+    </ports>
+  </host>
+</nmaprun>
+"""
+
+def test_read_open_ports_groups_by_host(tmp_path):
+    path = tmp_path / "naabu_out"
+    path.write_text("10.0.0.1:443\n10.0.0.1:80\n[2001:db8::1]:22\n"
+                    '{"ip": "10.0.0.2", "port": 8080}\n{"host": "10.0.0.3", "port": "21"}\n'
+                    "garbage\n10.0.0.1:http\n{broken\n10.0.0.1:443\n")
+    assert read_open_ports(str(path)) == {
+        "10.0.0.1": [80, 443], "2001:db8::1": [22], "10.0.0.2": [8080], "10.0.0.3": [21],
+    }
+
+def test_nmap_command():
+    assert nmap_command("10.0.0.1", [22, 80], "out.xml", "-sV -Pn") == [
+        "nmap", "-p", "22,80", "-sV", "-Pn", "-oX", "out.xml", "10.0.0.1"
+    ]
+    assert nmap_command("2001:db8::1", [443], "out.xml")[-2:] == ["-6", "2001:db8::1"]
+
+def test_parse_nmap_xml_gives_httpx_shaped_records(tmp_path):
+    path = tmp_path / "host.xml"
+    path.write_text(NMAP_XML)
+    https, ssh = parse_nmap_xml(str(path))
+    assert https['url'] == "https://10.0.0.5:443"
+    assert (https['host'], https['port'], https['protocol'], https['state']) == ("10.0.0.5", 443, "tcp", "open")
+    assert (https['product'], https['tech'], https['title']) == ("nginx 1.18.0", ["nginx 1.18.0"], "Login")
+    assert https['hostnames'] == ["web.example.com"]
+    assert set(https['scripts']) == {"http-title", "ssl-cert"}
+    assert (ssh['url'], ssh['tech'], ssh['title']) == ("ssh://10.0.0.5:22", [], "protocol 2.0")
+
+FAKE_NMAP = """\
+    #!{python}
+    import sys
+    args = sys.argv[1:]
+    ports, xml, host = args[args.index('-p') + 1].split(','), args[args.index('-oX') + 1], args[-1]
+    if host == '10.0.0.9':
+        print('failed'); sys.exit(1)
+    if host == '10.0.0.8':
+        open(xml, 'w').write('<nmaprun><host>'); sys.exit(0)
+    state = lambda p: 'closed' if p == '443' else 'open'
+    ports_xml = ''.join(f'<port protocol="tcp" portid="{{p}}"><state state="{{state(p)}}"/><service name="http"/></port>' for p in ports)
+    open(xml, 'w').write(f'<nmaprun><host><address addr="{{host}}" addrtype="ipv4"/><ports>{{ports_xml}}</ports></host></nmaprun>')
+"""
+
+def test_run_nmap_hosts_merges_reports(tmp_path, monkeypatch):
+    bin_dir = tmp_path / "bin"
+    bin_dir.mkdir()
+    fake_nmap = bin_dir / "nmap"
+    fake_nmap.write_text(textwrap.dedent(FAKE_NMAP).format(python=sys.executable))
+    fake_nmap.chmod(0o755)
+    monkeypatch.setenv("PATH", f"{bin_dir}{os.pathsep}{os.environ['PATH']}")
+    naabu_out = tmp_path / "naabu_out"
+    naabu_out.write_text("10.0.0.1:80\n10.0.0.1:443\n10.0.0.2:8080\n10.0.0.9:22\n10.0.0.8:21\n")
+    output = tmp_path / "nmap_out.jsonl"
+    updates = []
+
+    success, message = run_nmap_hosts(str(naabu_out), str(output), concurrency=2,
+                                      progress=lambda *args: updates.append(args))
+
+    assert success, message
+    records = [json.loads(line) for line in output.read_text().splitlines()]
+    assert [(r['host'], r['port']) for r in records] == [("10.0.0.1", 80), ("10.0.0.2", 8080)]
+    assert "2 open ports merged" in message
+    assert "10.0.0.9 (exit code 1)" in message and "1 reports were incomplete" in message
+    assert (tmp_path / NMAP_DIR / "10.0.0.9.log").read_text().strip() == "failed"
+    assert updates[-1] == (4, 4, 1)
+
+def test_run_nmap_hosts_without_nmap(tmp_path, monkeypatch):
+    monkeypatch.setenv("PATH", str(tmp_path))
+    naabu_out = tmp_path / "naabu_out"
+    naabu_out.write_text("10.0.0.1:80\n")
+    assert run_nmap_hosts(str(naabu_out), str(tmp_path / "out")) == (False, "Command not found: nmap")
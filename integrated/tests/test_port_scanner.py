@@ -0,0 +1,52 @@
+import socket
+import pytest
+from utils.port_scanner import TOP_PORTS, format_endpoint, parse_ports, run_port_scan
+from utils.nmap_runner import read_open_ports
+
+def test_parse_ports_lists_and_ranges():
+    assert parse_ports("443, 80,8000-8002,80") == [80, 443, 8000, 8001, 8002]
+    assert parse_ports("top100") == sorted(set(TOP_PORTS))
+    assert parse_ports("full") == list(range(1, 65536))
+    assert parse_ports("22,top100")[0] <= 22
+
+@pytest.mark.parametrize("spec", ["", ",", "0", "65536", "90-80", "http", "1-2-3"])
+def test_parse_ports_rejects_bad_specs(spec):
+    with pytest.raises(ValueError):
+        parse_ports(spec)
+
+def test_format_endpoint_brackets_ipv6():
+    assert format_endpoint("10.0.0.1", 80) == "10.0.0.1:80"
+    assert format_endpoint("2001:db8::1", 443) == "[2001:db8::1]:443"
+
+def unused_port():
+    with socket.socket() as probe:
+        probe.bind(("127.0.0.1", 0))
+        return probe.getsockname()[1]
+
+def test_run_port_scan_finds_loopback_listeners(tmp_path):
+    listeners = []
+    for _ in range(3):
+        listener = socket.socket()
+        listener.bind(("127.0.0.1", 0))
+        listener.listen(16)
+        listeners.append(listener)
+    open_ports = sorted(listener.getsockname()[1] for listener in listeners)
+    closed_port = unused_port()
+    input_path, output_path = tmp_path / "scopeips", tmp_path / "portscan_out"
+    input_path.write_text("127.0.0.1\nnot-an-ip\n127.0.0.1\n")
+    try:
+        ports = ",".join(map(str, open_ports + [closed_port]))
+        success, message = run_port_scan(str(input_path), str(output_path), ports=ports, timeout=1.0)
+    finally:
+        for listener in listeners:
+            listener.close()
+    assert success, message
+    assert sorted(output_path.read_text().split()) == sorted(f"127.0.0.1:{port}" for port in open_ports)
+    # Written like naabu's output, so the nmap step can read it
+    assert read_open_ports(str(output_path)) == {"127.0.0.1": open_ports}
+
+def test_run_port_scan_reports_bad_input(tmp_path):
+    assert run_port_scan(str(tmp_path / "missing"), str(tmp_path / "out"))[0] is False
+    (tmp_path / "scopeips").write_text("127.0.0.1\n")
+    success, message = run_port_scan(str(tmp_path / "scopeips"), str(tmp_path / "out"), ports="70000")
+    assert not success and "Invalid ports" in message
@@ -0,0 +1,70 @@
+import pytest
+from utils.report_batch import BulkReportRenderer, output_format, read_findings, write_bulk_report
+
+TEMPLATES = [{
+    'category': 'XSS',
+    'description': "The endpoint at {URL} reflects input.",
+    'impact': "Session theft.",
+    'validation_steps': "1. Inject a payload.",
+    'fix_recommendation': "Encode output.",
+}]
+
+def test_reads_csv_by_header_name(tmp_path):
+    path = tmp_path / "findings.csv"
+    path.write_text("URL,Category,Extra\nhttps://a/x, XSS ,1\n\nhttps://b/y\n")
+    assert list(read_findings(str(path))) == [
+        {'category': 'XSS', 'url': 'https://a/x', 'notes': ''},
+        {'category': '', 'url': 'https://b/y', 'notes': ''},
+    ]
+
+def test_reads_jsonl_and_flags_malformed_lines(tmp_path):
+    path = tmp_path / "findings.jsonl"
+    path.write_text('{"category": "XSS", "url": "https://a/x", "notes": "seen"}\n'
+                    'not json\n'
+                    '[1, 2]\n'
+                    '\n'
+                    '{"category": "SQLi", "url": null}\n')
+    assert list(read_findings(str(path))) == [
+        {'category': 'XSS', 'url': 'https://a/x', 'notes': 'seen'},
+        None,
+        None,
+        {'category': 'SQLi', 'url': '', 'notes': ''},
+    ]
+
+def test_empty_csv_has_no_findings(tmp_path):
+    path = tmp_path / "empty.csv"
+    path.write_text("")
+    assert list(read_findings(str(path))) == []
+
+def test_output_format_follows_extension():
+    assert output_format("report.HTML") == 'html'
+    assert output_format("report.md") == 'markdown'
+    assert output_format("report") == 'markdown'
+
+def test_markdown_rendering_and_counters():
+    renderer = BulkReportRenderer(TEMPLATES)
+    section = renderer.render({'category': 'XSS', 'url': 'https://a/x', 'notes': ''})
+    assert section.startswith("## 1. XSS\n")
+    assert "The endpoint at https://a/x reflects input." in section
+    assert "Session theft." in section
+    # Notes replace the template's impact
+    assert "Custom impact" in renderer.render({'category': 'XSS', 'url': 'https://a/y', 'notes': 'Custom impact'})
+    assert renderer.render({'category': 'Unknown', 'url': '', 'notes': ''}) is None
+    assert renderer.render(None) is None
+    assert (renderer.rendered, renderer.malformed, renderer.unknown_categories) == (2, 1, {'Unknown': 1})
+    assert "Skipped 1 with no matching template: Unknown (1)" in renderer.summary()
+
+def test_template_with_stray_braces_still_substitutes_the_url():
+    renderer = BulkReportRenderer([dict(TEMPLATES[0], description="Payload {x} at {URL}")])
+    assert "Payload {x} at https://a/x" in renderer.render({'category': 'XSS', 'url': 'https://a/x', 'notes': ''})
+
+def test_write_bulk_report_html_escapes_urls(tmp_path):
+    pytest.importorskip("markdown")
+    findings = tmp_path / "findings.csv"
+    findings.write_text('category,url\nXSS,"https://a/?q=<script>"\n')
+    output = tmp_path / "report.html"
+    renderer = write_bulk_report(str(findings), str(output), TEMPLATES)
+    text = output.read_text()
+    assert renderer.rendered == 1
+    assert text.startswith("<!DOCTYPE html>") and text.rstrip().endswith("</html>")
+    assert "&lt;script&gt;" in text and "<script>" not in text
@@ -0,0 +1,104 @@
+import asyncio
+import shutil
+import ssl
+import subprocess
+import threading
+import pytest
+from utils.tls_names import TlsNameCache, certificate_names, clean_hostnames, der_items, run_tls_names
+
+def tlv(tag, content):
+    """A DER element; lengths over 127 use the long form."""
+    if len(content) < 0x80:
+        length = bytes([len(content)])
+    else:
+        size = (len(content).bit_length() + 7) // 8
+        length = bytes([0x80 | size]) + len(content).to_bytes(size, 'big')
+    return bytes([tag]) + length + content
+
+def sequence(*items):
+    return tlv(0x30, b''.join(items))
+
+def build_certificate(common_name, dns_names, critical=False, version=True):
+    """Just enough of an X.509 certificate for certificate_names() to walk."""
+    oid_cn, oid_san = b'\x55\x04\x03', b'\x55\x1d\x11'
+    name = sequence(tlv(0x31, sequence(tlv(0x06, oid_cn), tlv(0x0c, common_name.encode()))))
+    general_names = sequence(*(tlv(0x82, dns.encode()) for dns in dns_names), tlv(0x87, b'\x7f\x00\x00\x01'))
+    san = sequence(tlv(0x06, oid_san), *([tlv(0x01, b'\xff')] if critical else []), tlv(0x04, general_names))
+    fields = [tlv(0x02, b'\x01'), sequence(), name, sequence(), name, sequence(), tlv(0xa3, sequence(san))]
+    if version:
+        fields.insert(0, tlv(0xa0, tlv(0x02, b'\x02')))
+    return sequence(sequence(*fields), sequence(), tlv(0x03, b'\x00'))
+
+def test_der_items_handles_long_lengths():
+    data = tlv(0x04, b'x' * 300) + tlv(0x05, b'')
+    assert list(der_items(data)) == [(0x04, 4, 304), (0x05, 306, 306)]
+    with pytest.raises(ValueError):
+        list(der_items(data[:100]))
+
+@pytest.mark.parametrize("critical", [False, True])
+@pytest.mark.parametrize("version", [False, True])
+def test_certificate_names_reads_cn_and_dns_sans(critical, version):
+    der = build_certificate("Example CA Product", ["www.example.com", "*.api.example.com"], critical, version)
+    assert certificate_names(der) == ["Example CA Product", "www.example.com", "*.api.example.com"]
+
+def test_clean_hostnames():
+    names = ["WWW.Example.com.", "*.api.example.com", "www.example.com", "localhost", "Example Product",
+             "127.0.0.1", "a" * 64 + ".example.com", "_dmarc.example.com"]
+    assert clean_hostnames(names) == ["www.example.com", "api.example.com", "_dmarc.example.com"]
+
+def test_cache_expires_entries(tmp_path):
+    cache = TlsNameCache(str(tmp_path / "cache.db"))
+    cache.store({("10.0.0.1", 443): (["a.example.com"], None), ("10.0.0.2", 443): (None, "timeout")})
+    now = cache.conn.execute("SELECT MAX(fetched_at) FROM tls_names").fetchone()[0]
+    wanted = [("10.0.0.1", 443), ("10.0.0.2", 443), ("10.0.0.3", 443)]
+    assert cache.lookup(wanted, now=now + 60) == {("10.0.0.1", 443): ["a.example.com"], ("10.0.0.2", 443): None}
+    # Failures are retried after a day, certificates after a week
+    assert cache.lookup(wanted, now=now + 2 * 24 * 3600) == {("10.0.0.1", 443): ["a.example.com"]}
+    assert cache.lookup(wanted, now=now + 8 * 24 * 3600) == {}
+    cache.close()
+
+@pytest.fixture
+def tls_server(tmp_path):
+    """A loopback TLS server with a self-signed certificate for two names; yields its port."""
+    if shutil.which("openssl") is None:
+        pytest.skip("openssl is needed to make a test certificate")
+    cert, key = tmp_path / "cert.pem", tmp_path / "key.pem"
+    subprocess.run(["openssl", "req", "-x509", "-newkey", "ec", "-pkeyopt", "ec_paramgen_curve:prime256v1", "-nodes",
+                    "-keyout", str(key), "-out", str(cert), "-days", "1", "-subj", "/CN=Test Appliance",
+                    "-addext", "subjectAltName=DNS:www.example.com,DNS:*.api.example.com,IP:127.0.0.1"],
+                   check=True, capture_output=True)
+    context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+    context.load_cert_chain(str(cert), str(key))
+    loop = asyncio.new_event_loop()
+    started = threading.Event()
+    ports = []
+
+    async def handle(reader, writer):
+        writer.close()
+
+    async def serve():
+        server = await asyncio.start_server(handle, "127.0.0.1", 0, ssl=context)
+        ports.append(server.sockets[0].getsockname()[1])
+        started.set()
+
+    thread = threading.Thread(target=lambda: (loop.run_until_complete(serve()), loop.run_forever()), daemon=True)
+    thread.start()
+    started.wait(10)
+    yield ports[0]
+    loop.call_soon_threadsafe(loop.stop)
+    thread.join(5)
+
+def test_run_tls_names_against_a_local_server(tmp_path, monkeypatch, tls_server):
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path)) # Keep the cache file out of the user's cache directory
+    input_path, output_path = tmp_path / "scopeips", tmp_path / "tls_names_out"
+    input_path.write_text(f"127.0.0.1:{tls_server}\nnot-an-ip\n")
+
+    success, message = run_tls_names(str(input_path), str(output_path), timeout=5)
+    assert success, message
+    assert output_path.read_text().split() == ["api.example.com", "www.example.com"]
+    assert "1 contacted" in message
+
+    # A rerun is answered from the cache
+    success, message = run_tls_names(str(input_path), str(output_path), timeout=5)
+    assert "1 cached, 0 contacted" in message
+    assert output_path.read_text().split() == ["api.example.com", "www.example.com"]
@@ -0,0 +1,36 @@
+from utils.url_classifier import (
+    HIGH_RISK, INTERESTING, SENSITIVE_EXTENSION, UrlClassifier, get_url_classifier, keyword_pattern
+)
+
+def make_classifier():
+    return UrlClassifier(["admin", "Backup"], ["login", "api"])
+
+def test_keyword_categories_are_case_insensitive():
+    classifier = make_classifier()
+    assert classifier.classify("https://example.com/ADMIN/panel") == HIGH_RISK
+    assert classifier.classify("https://example.com/Login") == INTERESTING
+    assert classifier.classify("https://example.com/api/admin") == HIGH_RISK | INTERESTING
+    assert classifier.classify("https://example.com/about") == 0
+
+def test_extensions_match_any_dotted_suffix_of_the_last_segment():
+    classifier = make_classifier()
+    assert classifier.classify("https://example.com/dump.SQL") == SENSITIVE_EXTENSION
+    assert classifier.classify("https://example.com/site.tar.gz") == SENSITIVE_EXTENSION
+    assert classifier.classify("https://example.com/.env") == SENSITIVE_EXTENSION
+    # Only the last path segment counts
+    assert classifier.classify("https://example.com/dir.zip/page") == 0
+    assert classifier.classify("https://example.com/backup.zip") == HIGH_RISK | SENSITIVE_EXTENSION
+
+def test_empty_keyword_lists_match_nothing():
+    assert keyword_pattern([]) is None
+    assert keyword_pattern(["", None]) is None
+    assert UrlClassifier([], []).classify("https://example.com/admin") == 0
+
+def test_classify_all_keeps_order():
+    urls = ["https://a/admin", "https://a/x", "https://a/login.json"]
+    assert make_classifier().classify_all(urls) == [HIGH_RISK, 0, INTERESTING | SENSITIVE_EXTENSION]
+
+def test_classifier_is_reused_until_the_keywords_change():
+    first = get_url_classifier(["admin"], ["login"])
+    assert get_url_classifier(["admin"], ["login"]) is first
+    assert get_url_classifier(["admin", "root"], ["login"]) is not first
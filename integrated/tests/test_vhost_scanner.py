@@ -0,0 +1,167 @@
+import asyncio
+import json
+import threading
+import pytest
+from utils.vhost_scanner import (
+    MAX_BODY_BYTES, Response, base_domains, build_candidates, fingerprint, read_response, read_targets,
+    run_vhost_scan, same_page
+)
+
+def parse(data, limit=None):
+    async def read():
+        reader = asyncio.StreamReader(**({'limit': limit} if limit else {}))
+        reader.feed_data(data)
+        reader.feed_eof()
+        return await read_response(reader)
+    return asyncio.run(read())
+
+def test_read_response_content_length_and_keep_alive():
+    response = parse(b"HTTP/1.1 200 OK\r\nContent-Length: 5\r\nX-Test: a:b\r\n\r\nhelloEXTRA")
+    assert (response.status, response.body, response.keep_alive) == (200, b"hello", True)
+    assert response.headers['x-test'] == "a:b"
+
+def test_read_response_chunked_with_trailers():
+    response = parse(b"HTTP/1.1 200 OK\r\nTransfer-Encoding: chunked\r\n\r\n"
+                     b"5;ext=1\r\nhello\r\n6\r\n world\r\n0\r\nTrailer: x\r\n\r\n")
+    assert response.body == b"hello world" and response.keep_alive
+
+def test_read_response_skips_interim_responses():
+    response = parse(b"HTTP/1.1 100 Continue\r\n\r\nHTTP/1.1 404 Not Found\r\nContent-Length: 0\r\n\r\n")
+    assert response.status == 404 and response.body == b""
+
+def test_read_response_until_close():
+    response = parse(b"HTTP/1.0 200 OK\r\n\r\nbody until close")
+    assert response.body == b"body until close" and not response.keep_alive
+
+def test_read_response_keeps_only_the_start_of_huge_bodies():
+    size = MAX_BODY_BYTES + 1000
+    response = parse(b"HTTP/1.1 200 OK\r\nContent-Length: %d\r\n\r\n" % size + b"x" * size)
+    assert len(response.body) == MAX_BODY_BYTES
+
+@pytest.mark.parametrize("data", [
+    b"",
+    b"SSH-2.0-OpenSSH_8.9\r\n",
+    b"HTTP/1.1 200 OK\r\nTransfer-Encoding: chunked\r\n\r\nzz\r\n",
+    b"HTTP/1.1 200 OK\r\nContent-Length: 10\r\n\r\nshort",
+])
+def test_read_response_raises_connection_error_on_bad_responses(data):
+    with pytest.raises((ConnectionError, asyncio.IncompleteReadError)):
+        parse(data)
+
+def test_read_response_header_line_over_the_stream_limit():
+    with pytest.raises(ConnectionError):
+        parse(b"HTTP/1.1 200 OK\r\nX-Big: " + b"a" * 2000 + b"\r\n\r\n", limit=1024)
+
+def page(body, status=200, headers=None):
+    return Response(status, headers or {}, body, True)
+
+def test_fingerprint_removes_the_requested_host():
+    first = fingerprint(page(b"<title>Welcome</title>No site for a.example.com", 302,
+                             {'location': "https://a.example.com/login"}), "a.example.com")
+    second = fingerprint(page(b"<title>Welcome</title>No site for b.example.com", 302,
+                              {'location': "https://b.example.com/login"}), "b.example.com")
+    assert first['location'] == "https://{HOST}/login" and first['title'] == "Welcome"
+    assert same_page(first, second)
+
+def test_same_page_tolerates_small_word_count_changes():
+    words = lambda count: fingerprint(page(b"<title>T</title>" + b"w " * count), "x")
+    assert same_page(words(100), words(104))
+    assert not same_page(words(100), words(120))
+    # Big pages are allowed a proportional difference
+    assert same_page(words(1000), words(1040))
+    assert not same_page(fingerprint(page(b"<title>Admin</title>"), "x"), fingerprint(page(b"<title>T</title>"), "x"))
+    assert not same_page(fingerprint(page(b"", 404), "x"), fingerprint(page(b"", 200), "x"))
+
+def test_read_targets(tmp_path):
+    path = tmp_path / "scopeips"
+    path.write_text("10.0.0.1\n# comment\n10.0.0.2:8443\n[2001:db8::1]:80\nexample.com\n10.0.0.1\n")
+    assert read_targets(str(path), [80, 443]) == [
+        ("10.0.0.1", 80), ("10.0.0.1", 443), ("10.0.0.2", 8443), ("2001:db8::1", 80)
+    ]
+
+def test_candidates_and_base_domains():
+    subdomains = ["WWW.example.com.", "api.example.com", "mail.example.org"]
+    assert base_domains(subdomains) == ["example.com", "example.org"]
+    assert build_candidates(subdomains, ["dev", "www"], ["example.com"]) == [
+        "www.example.com", "api.example.com", "mail.example.org", "dev.example.com"
+    ]
+
+VHOSTS = {"admin.example.com": "<title>Admin</title>Sign in", "intranet.example.com": "<title>Intranet</title>"}
+
+@pytest.fixture
+def vhost_server():
+    """
+    A loopback keep-alive server for VHOSTS whose default site mentions the
+    requested host and changes a little on every request; yields its port.
+    """
+    loop = asyncio.new_event_loop()
+    started = threading.Event()
+    ports = []
+    served = [0]
+
+    async def handle(reader, writer):
+        try:
+            while True:
+                host = ""
+                line = await reader.readline()
+                if not line:
+                    break
+                while line not in (b"\r\n", b""):
+                    if line.lower().startswith(b"host:"):
+                        host = line[5:].strip().decode()
+                    line = await reader.readline()
+                served[0] += 1
+                if host.startswith("broken."):
+                    writer.write(b"HTTP/1.1 200 OK\r\nTransfer-Encoding: chunked\r\n\r\nzz\r\n")
+                    break
+                body = VHOSTS.get(host) or f"<title>Welcome</title>No site for {host}, request {served[0]}"
+                writer.write(b"HTTP/1.1 200 OK\r\nContent-Length: %d\r\n\r\n%s" % (len(body), body.encode()))
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def serve():
+        server = await asyncio.start_server(handle, "127.0.0.1", 0)
+        ports.append(server.sockets[0].getsockname()[1])
+        started.set()
+
+    thread = threading.Thread(target=lambda: (loop.run_until_complete(serve()), loop.run_forever()), daemon=True)
+    thread.start()
+    started.wait(10)
+    yield ports[0]
+    loop.call_soon_threadsafe(loop.stop)
+    thread.join(5)
+
+def test_run_vhost_scan_finds_configured_hosts(tmp_path, vhost_server):
+    (tmp_path / "scopeips").write_text(f"127.0.0.1:{vhost_server}\n")
+    (tmp_path / "subdomains").write_text("www.example.com\nbroken.example.com\n")
+    (tmp_path / "words").write_text("\n".join(["admin", "intranet", "dev", "test", "staging"] +
+                                              [f"w{i}" for i in range(200)]) + "\n")
+    output = tmp_path / "vhosts_out"
+
+    success, message = run_vhost_scan(str(tmp_path / "scopeips"), str(output), str(tmp_path / "subdomains"),
+                                      str(tmp_path / "words"), connections=4, timeout=5)
+
+    assert success, message
+    records = [json.loads(line) for line in output.read_text().splitlines()]
+    assert sorted(record['input'] for record in records) == sorted(VHOSTS)
+    admin = next(record for record in records if record['input'] == "admin.example.com")
+    assert admin['url'] == f"http://admin.example.com:{vhost_server}/"
+    assert (admin['host'], admin['title'], admin['status_code']) == ("127.0.0.1", "Admin", 200)
+    # The malformed response is a failed request, not the end of the scan
+    assert "1 requests failed" in message
+
+def test_run_vhost_scan_skips_unreachable_targets(tmp_path):
+    (tmp_path / "scopeips").write_text("127.0.0.1:1\n")
+    (tmp_path / "subdomains").write_text("www.example.com\n")
+    success, message = run_vhost_scan(str(tmp_path / "scopeips"), str(tmp_path / "out"), str(tmp_path / "subdomains"),
+                                      timeout=2)
+    assert success and "Skipped 1 unreachable: 127.0.0.1:1" in message
+    assert (tmp_path / "out").read_text() == ""
+
+def test_run_vhost_scan_needs_candidates(tmp_path):
+    (tmp_path / "scopeips").write_text("127.0.0.1\n")
+    assert run_vhost_scan(str(tmp_path / "scopeips"), str(tmp_path / "out"))[0] is False
+    assert run_vhost_scan(str(tmp_path / "missing"), str(tmp_path / "out"), str(tmp_path / "missing"))[0] is False
@@ -0,0 +1,42 @@
+import numpy as np
+
+# Charts never draw more than this many bars/slices, whatever the dataset size
+DEFAULT_TOP_N = 20
+HISTOGRAM_BINS = 40
+
+DARK_THEME = {'face': '#2e3440', 'text': 'white', 'edge': '#2e3440'}
+LIGHT_THEME = {'face': 'white', 'text': 'black', 'edge': 'white'}
+
+def bar_chart_spec(labels, counts, title, top_n=DEFAULT_TOP_N, log_scale=False, xlabel='Count'):
+    """
+    A horizontal bar chart of the top_n entries of already-sorted (labels,
+    counts), plus an 'Other (k values)' bar summing the rest.
+    """
+    shown_labels = [str(label) for label in labels[:top_n]]
+    shown_counts = list(counts[:top_n])
+    if len(counts) > top_n:
+        shown_labels.append(f"Other ({len(counts) - top_n} values)")
+        shown_counts.append(int(sum(counts[top_n:])))
+    return {'kind': 'bar', 'labels': shown_labels, 'values': shown_counts, 'title': title,
+            'xlabel': xlabel, 'log_scale': log_scale}
+
+def pie_chart_spec(labels, sizes, title):
+    return {'kind': 'pie', 'labels': list(labels), 'values': list(sizes), 'title': title}
+
+def histogram_spec(values, title, log_scale=False, bins=HISTOGRAM_BINS, xlabel='Value'):
+    """
+    Bins a numeric column with NumPy so only bin edges and counts reach the
+    renderer. With log_scale the bins are logarithmic (zeros get their own
+    bin) and the count axis is logarithmic too.
+    """
+    values = np.asarray(values, dtype=np.int64)
+    if log_scale and len(values) and values.max() > 0:
+        positive = values[values > 0]
+        edges = np.unique(np.geomspace(max(positive.min(), 1), positive.max() + 1, bins + 1))
+        counts, edges = np.histogram(positive, bins=edges)
+        zero_count = int(len(values) - len(positive))
+    else:
+        counts, edges = np.histogram(values, bins=bins) if len(values) else (np.zeros(0), np.zeros(1))
+        zero_count = 0
+    return {'kind': 'histogram', 'counts': counts.tolist(), 'edges': edges.tolist(), 'zero_count': zero_count,
+            'title': title, 'xlabel': xlabel, 'log_scale': log_scale}
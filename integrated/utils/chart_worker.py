@@ -0,0 +1,75 @@
+from PyQt5.QtCore import QThread, pyqtSignal
+from PyQt5.QtGui import QImage
+# Only the Agg canvas is used here: no pyplot state, so figures can be drawn off the GUI thread
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.ticker import EngFormatter, LogLocator
+
+PIE_COLORS = ['#5e81ac', '#bf616a', '#d08770', '#a3be8c', '#b48ead']
+
+def render_chart(spec, width, height, theme, dpi=100):
+    """Draws a chart spec from utils.chart_data into an RGBA QImage of the given pixel size."""
+    fig = Figure(figsize=(width / dpi, height / dpi), dpi=dpi, facecolor=theme['face'])
+    canvas = FigureCanvasAgg(fig)
+    axes = fig.add_subplot(111, facecolor=theme['face'])
+    axes.tick_params(axis='x', colors=theme['text'])
+    axes.tick_params(axis='y', colors=theme['text'])
+    axes.xaxis.label.set_color(theme['text'])
+    axes.yaxis.label.set_color(theme['text'])
+    for spine in axes.spines.values():
+        spine.set_color(theme['text'])
+
+    if spec['kind'] == 'bar':
+        y_pos = range(len(spec['labels']))
+        axes.barh(y_pos, spec['values'], align='center', color='#81a1c1', height=0.6, log=spec['log_scale'])
+        axes.set_yticks(y_pos)
+        axes.set_yticklabels(spec['labels'], fontsize=9)
+        axes.invert_yaxis()
+        axes.set_xlabel(spec['xlabel'] + (" (log scale)" if spec['log_scale'] else ""), fontsize=10)
+        low, high = axes.get_xlim()
+        if spec['log_scale'] and low > 0 and high / low < 100:
+            # Too few powers of ten to label; use short labels at 1/2/5 steps instead
+            axes.xaxis.set_major_formatter(EngFormatter())
+            axes.xaxis.set_minor_locator(LogLocator(subs=(2.0, 5.0)))
+            axes.xaxis.set_minor_formatter(EngFormatter())
+    elif spec['kind'] == 'histogram':
+        edges = spec['edges']
+        axes.stairs(spec['counts'], edges, fill=True, color='#88c0d0', edgecolor=theme['edge'])
+        if spec['log_scale']:
+            axes.set_xscale('log')
+            axes.set_yscale('log')
+        axes.set_xlabel(spec['xlabel'], fontsize=12)
+        axes.set_ylabel("Frequency", fontsize=12)
+        if spec['zero_count']:
+            axes.text(0.99, 0.98, f"{spec['zero_count']} rows with value 0 not shown", transform=axes.transAxes,
+                      ha='right', va='top', fontsize=9, color=theme['text'])
+    elif spec['kind'] == 'pie':
+        axes.pie(spec['values'], labels=spec['labels'], autopct='%1.1f%%', shadow=True, startangle=90,
+                 colors=PIE_COLORS, textprops={'color': theme['text']})
+        axes.axis('equal')
+
+    axes.set_title(spec['title'], fontsize=12, fontweight='bold', color=theme['text'])
+    fig.tight_layout()
+    canvas.draw()
+    buffer = canvas.buffer_rgba()
+    image = QImage(bytes(buffer), int(buffer.shape[1]), int(buffer.shape[0]), QImage.Format_RGBA8888)
+    # QImage doesn't own the bytes it was built on; detach before they go away
+    return image.copy()
+
+class ChartRenderWorker(QThread):
+    """Worker thread that renders one chart spec into an image."""
+    image_ready = pyqtSignal(int, QImage) # request generation, image
+    error = pyqtSignal(int, str)
+
+    def __init__(self, generation, spec, width, height, theme, parent=None):
+        super().__init__(parent)
+        self.generation = generation
+        self.spec = spec
+        self.size = (width, height)
+        self.theme = theme
+
+    def run(self):
+        try:
+            self.image_ready.emit(self.generation, render_chart(self.spec, *self.size, self.theme))
+        except Exception as e:
+            self.error.emit(self.generation, f"Could not draw chart: {e}")
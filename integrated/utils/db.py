@@ -2,6 +2,16 @@ import sqlite3
 import os
 
 DB_FILE = "recon_automator.db"
+APP_NAME = "recon_automator"
+
+def cache_path(filename):
+    """
+    Path of a cache file in the per-user cache directory, so caches don't
+    depend on the directory the app was started from.
+    """
+    cache_dir = os.path.join(os.environ.get('XDG_CACHE_HOME') or os.path.expanduser('~/.cache'), APP_NAME)
+    os.makedirs(cache_dir, exist_ok=True)
+    return os.path.join(cache_dir, filename)
 
 # New, more colorful dark theme stylesheet
 dark_theme_stylesheet = """
@@ -205,15 +215,16 @@ def initialize_db():
         # Default standard commands
         default_commands = [
             ("internal:run_ipparser --scope_file {scope_file} --output scopeips", 0, 0, 1),
-            ("httpx -title -tech-detect -sc -cl -fr -o httpx_out -l scopeips", 0, 0, 2),
+            # httpx steps write -json; the Playground picks up title, IP, CDN and content type from it
+            ("httpx -title -tech-detect -sc -cl -fr -ip -cdn -json -o httpx_out -l scopeips", 0, 0, 2),
             ("internal:run_domain_enum --subdomains httpx_out_domains --scope scopeips --output domains", 0, 0, 3),
             ("subfinder -dL domains -o subfinder_out", 0, 0, 4),
             ("internal:run_reverse_dns --input scopeips --output reverse_dns_out", 0, 0, 5),
             ("internal:run_domain_enum --subdomains subfinder_out --scope scopeips --output subdomains", 0, 0, 6),
             ("internal:run_domain_enum --subdomains reverse_dns_out --scope scopeips --output subdomains", 0, 0, 7),
-            ("httpx -title -tech-detect -sc -cl -fr -o httpx_out_subdomains -l subdomains", 0, 0, 8),
+            ("httpx -title -tech-detect -sc -cl -fr -ip -cdn -json -o httpx_out_subdomains -l subdomains", 0, 0, 8),
             ("internal:run_format_ips --input scopeips --output scopeips_80808443", 0, 0, 9),
-            ("httpx -l scopeips_80808443 -title -tech-detect -sc -cl -fr -o httpx_out_80808443", 0, 0, 10),
+            ("httpx -l scopeips_80808443 -title -tech-detect -sc -cl -fr -ip -cdn -json -o httpx_out_80808443", 0, 0, 10),
             ("katana -list subdomains -jc -o katana_out_subdomains", 0, 0, 11)
         ]
         cursor.executemany("INSERT INTO commands (command_text, run_in_background, use_shell, execution_order) VALUES (?, ?, ?, ?)", default_commands)
@@ -338,6 +349,11 @@ def set_setting(key, value):
     conn.commit()
     conn.close()
 
+def get_active_theme():
+    """Retrieves the active theme name together with its stylesheet."""
+    theme_name = get_setting('active_theme')
+    return theme_name, get_setting(f"{theme_name}_theme_stylesheet")
+
 def toggle_theme():
     """Switches the active theme between 'light' and 'dark'."""
     current_theme = get_setting('active_theme')
@@ -385,6 +401,10 @@ def get_interesting_keywords():
     cursor.execute("SELECT keyword FROM interesting_keywords")
     return [row[0] for row in cursor.fetchall()]
 
+def get_risk_keywords():
+    """Retrieves the high-risk and interesting keyword lists in one call."""
+    return get_high_risk_keywords(), get_interesting_keywords()
+
 def get_all_template_categories():
     """Retrieves all available vulnerability categories for the report generator."""
     conn = get_db_connection()
@@ -0,0 +1,103 @@
+import sys
+import queue
+import itertools
+from PyQt5 import sip
+from PyQt5.QtCore import QThread, QTimer, pyqtSignal
+
+# Queries that haven't answered within this many milliseconds switch their
+# widget into a loading state instead of leaving it frozen/stale.
+LOADING_DELAY_MS = 30
+
+class DbWorker(QThread):
+    """
+    A dedicated thread that executes database functions one at a time, in
+    submission order, and hands the results back to the GUI thread.
+    """
+    result_ready = pyqtSignal(int, object)
+    error = pyqtSignal(int, str)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.tasks = queue.Queue()
+        self.pending = {}
+        self.request_ids = itertools.count(1)
+        # The QThread object lives in the GUI thread, so these slots run there.
+        self.result_ready.connect(self.dispatch_result)
+        self.error.connect(self.dispatch_error)
+
+    def submit(self, func, args, kwargs, on_result, on_error, on_loading, owner):
+        request_id = next(self.request_ids)
+        self.pending[request_id] = (on_result, on_error, owner)
+        self.tasks.put((request_id, func, args, kwargs))
+        if on_loading is not None:
+            QTimer.singleShot(LOADING_DELAY_MS, lambda: self.show_loading(request_id, on_loading))
+        return request_id
+
+    def is_pending(self, request_id):
+        return request_id in self.pending
+
+    def show_loading(self, request_id, on_loading):
+        if request_id in self.pending and self.owner_alive(self.pending[request_id][2]):
+            on_loading()
+
+    def owner_alive(self, owner):
+        return owner is None or not sip.isdeleted(owner)
+
+    def dispatch_result(self, request_id, result):
+        on_result, _, owner = self.pending.pop(request_id, (None, None, None))
+        if on_result is not None and self.owner_alive(owner):
+            on_result(result)
+
+    def dispatch_error(self, request_id, message):
+        _, on_error, owner = self.pending.pop(request_id, (None, None, None))
+        if not self.owner_alive(owner):
+            return
+        if on_error is not None:
+            on_error(message)
+        else:
+            print(f"[DB] {message}", file=sys.stderr)
+
+    def stop(self):
+        self.tasks.put(None)
+        self.wait()
+
+    def run(self):
+        while True:
+            task = self.tasks.get()
+            if task is None:
+                break
+            request_id, func, args, kwargs = task
+            try:
+                result = func(*args, **kwargs)
+            except Exception as e:
+                self.error.emit(request_id, f"{getattr(func, '__name__', 'query')} failed: {e}")
+            else:
+                self.result_ready.emit(request_id, result)
+
+_db_worker = None
+
+def get_db_worker():
+    """Returns the shared DB worker thread, starting it on first use."""
+    global _db_worker
+    if _db_worker is None:
+        _db_worker = DbWorker()
+        _db_worker.start()
+    return _db_worker
+
+def run_db_task(func, *args, on_result=None, on_error=None, on_loading=None, owner=None, **kwargs):
+    """
+    Queues func(*args, **kwargs) on the DB thread and returns a request id.
+
+    on_result/on_error are called on the GUI thread when the task completes.
+    on_loading is called only if the task is still running after
+    LOADING_DELAY_MS. If `owner` (a QObject) has been deleted by then, the
+    callbacks are dropped.
+    """
+    return get_db_worker().submit(func, args, kwargs, on_result, on_error, on_loading, owner)
+
+def shutdown_db_worker():
+    """Drains the queue and stops the DB thread. Called when the app closes."""
+    global _db_worker
+    if _db_worker is not None:
+        _db_worker.stop()
+        _db_worker = None
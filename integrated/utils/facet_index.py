@@ -0,0 +1,178 @@
+import re
+from bisect import bisect_left
+import numpy as np
+
+# Matching values that cover fewer rows than 1/SPARSE_FRACTION of the dataset
+# are resolved through their posting lists; broader matches use a gather.
+SPARSE_FRACTION = 32
+STATUS_CLASS = re.compile(r'^([1-5])xx$', re.IGNORECASE)
+
+class PostingLists:
+    """
+    An inverted index from value codes to the rows holding them, stored as
+    one array of row numbers grouped by code plus the offset of each group.
+    """
+    def __init__(self, codes, value_count):
+        self.codes = codes
+        self.rows = np.argsort(codes, kind='stable')
+        self.offsets = np.zeros(value_count + 1, dtype=np.int64)
+        np.cumsum(np.bincount(codes, minlength=value_count), out=self.offsets[1:])
+
+    def row_mask(self, value_codes):
+        """Returns a boolean mask of the rows holding any of the given value codes."""
+        value_codes = np.asarray(value_codes, dtype=np.intp)
+        mask = np.zeros(len(self.codes), dtype=bool)
+        if len(value_codes) == 0:
+            return mask
+        starts = self.offsets[value_codes]
+        lengths = self.offsets[value_codes + 1] - starts
+        total = lengths.sum()
+        if total * SPARSE_FRACTION < len(self.codes):
+            # Positions of every selected group laid end to end, without a Python loop
+            positions = np.arange(total) + np.repeat(starts - (np.cumsum(lengths) - lengths), lengths)
+            mask[self.rows[positions]] = True
+        else:
+            value_mask = np.zeros(len(self.offsets) - 1, dtype=bool)
+            value_mask[value_codes] = True
+            mask = value_mask[self.codes]
+        return mask
+
+class FacetIndex:
+    """
+    Facet and substring indexes over an HttpxDataset, built once so that
+    filters resolve as bitmap intersections instead of row scans.
+    Covers status code, extension, technology token, host suffix and a
+    trigram index over paths.
+    """
+    def __init__(self, dataset):
+        self.row_count = len(dataset)
+        columns = dataset.columns
+
+        self.status_values, status_codes = np.unique(np.array(columns['status_code'].values, dtype=np.int64), return_inverse=True)
+        self.status = PostingLists(status_codes.astype(np.intp), len(self.status_values))
+
+        self.extensions = [value.lower() for value in columns['extension'].values]
+        self.extension = self.string_postings(columns['extension'])
+
+        self.technology = self.string_postings(columns['technology'])
+        self.tech_tokens = {}
+        for code, value in enumerate(columns['technology'].values):
+            for token in value.split(','):
+                token = token.strip().lower()
+                if token and token != 'n/a':
+                    self.tech_tokens.setdefault(token, []).append(code)
+
+        self.host = self.string_postings(columns['host'])
+        # Hosts spelled backwards and sorted, so a domain and its subdomains form one contiguous range
+        reversed_hosts = sorted(((host or '').lower()[::-1], code) for code, host in enumerate(columns['host'].values))
+        self.reversed_hosts = [host for host, _ in reversed_hosts]
+        self.reversed_host_codes = np.array([code for _, code in reversed_hosts], dtype=np.intp)
+
+        self.path = self.string_postings(columns['path'])
+        self.paths = [value.lower() for value in columns['path'].values]
+        self.build_path_trigrams()
+
+    def build_path_trigrams(self):
+        """
+        Builds a trigram -> path codes index over the UTF-8 bytes of every distinct
+        path. Every trigram of every path is packed into one integer alongside
+        its path code, so deduplicating and grouping is a single sort.
+        """
+        encoded = [path.encode('utf-8') for path in self.paths]
+        lengths = np.fromiter(map(len, encoded), dtype=np.int64, count=len(encoded))
+        data = np.frombuffer(b''.join(encoded), dtype=np.uint8).astype(np.int64)
+        owners = np.repeat(np.arange(len(encoded), dtype=np.int64), lengths)
+        # Only trigrams that start and end inside the same path
+        inside = owners[:-2] == owners[2:]
+        trigrams = ((data[:-2] << 16) | (data[1:-1] << 8) | data[2:])[inside]
+        pairs = trigrams * len(encoded) + owners[:-2][inside]
+        # Sorting in place and dropping neighbours is much cheaper than np.unique here
+        pairs.sort()
+        pairs = pairs[np.append(True, pairs[1:] != pairs[:-1])] if len(pairs) else pairs
+        pair_trigrams = pairs // max(len(encoded), 1)
+        starts = np.flatnonzero(np.append(True, pair_trigrams[1:] != pair_trigrams[:-1])) if len(pairs) else pairs
+        self.trigram_ids = pair_trigrams[starts]
+        self.trigram_offsets = np.append(starts, len(pairs))
+        self.trigram_codes = (pairs % max(len(encoded), 1)).astype(np.intp)
+
+    def trigram_codes_for(self, trigram):
+        """Path codes containing a 3-byte trigram, or None if no path does."""
+        trigram_id = (trigram[0] << 16) | (trigram[1] << 8) | trigram[2]
+        position = np.searchsorted(self.trigram_ids, trigram_id)
+        if position == len(self.trigram_ids) or self.trigram_ids[position] != trigram_id:
+            return None
+        return self.trigram_codes[self.trigram_offsets[position]:self.trigram_offsets[position + 1]]
+
+    @staticmethod
+    def string_postings(column):
+        return PostingLists(np.array(column.codes, dtype=np.intp), len(column.values))
+
+    def status_mask(self, text):
+        """Rows whose status matches any of a comma/space separated list such as '200, 3xx'."""
+        wanted = np.zeros(len(self.status_values), dtype=bool)
+        for term in re.split(r'[,\s]+', text.strip()):
+            if not term:
+                continue
+            class_match = STATUS_CLASS.match(term)
+            if class_match:
+                wanted |= self.status_values // 100 == int(class_match.group(1))
+            elif term.isdigit():
+                wanted |= self.status_values == int(term)
+        return self.status.row_mask(np.flatnonzero(wanted))
+
+    def extension_mask(self, text):
+        """Rows whose extension is any of a comma separated list; the leading dot is optional."""
+        terms = {term if term.startswith('.') else '.' + term for term in (t.strip().lower() for t in text.split(',')) if term}
+        return self.extension.row_mask([code for code, value in enumerate(self.extensions) if value in terms])
+
+    def technology_mask(self, text):
+        """Rows with a detected technology whose name contains the text."""
+        needle = text.strip().lower()
+        codes = set()
+        for token, token_codes in self.tech_tokens.items():
+            if needle in token:
+                codes.update(token_codes)
+        return self.technology.row_mask(sorted(codes))
+
+    def host_suffix_mask(self, text):
+        """Rows whose host is the given domain or one of its subdomains."""
+        domain = text.strip().lower().strip('.')[::-1]
+        if not domain:
+            return np.zeros(self.row_count, dtype=bool)
+        exact = bisect_left(self.reversed_hosts, domain)
+        # '/' sorts right after '.', so this range is exactly the subdomains
+        start, end = bisect_left(self.reversed_hosts, domain + '.'), bisect_left(self.reversed_hosts, domain + '/')
+        codes = self.reversed_host_codes[start:end]
+        if exact < len(self.reversed_hosts) and self.reversed_hosts[exact] == domain:
+            codes = np.append(codes, self.reversed_host_codes[exact])
+        return self.host.row_mask(codes)
+
+    def path_mask(self, text):
+        """Rows whose path contains the text, narrowed through the trigram index."""
+        needle = text.strip().lower()
+        needle_bytes = needle.encode('utf-8')
+        if len(needle_bytes) < 3:
+            candidates = range(len(self.paths))
+        else:
+            postings = sorted((self.trigram_codes_for(needle_bytes[i:i + 3]) for i in range(len(needle_bytes) - 2)),
+                              key=lambda codes: -1 if codes is None else len(codes))
+            if postings[0] is None:
+                return np.zeros(self.row_count, dtype=bool)
+            candidates = postings[0]
+            for codes in postings[1:]:
+                candidates = np.intersect1d(candidates, codes, assume_unique=True)
+        return self.path.row_mask([code for code in candidates if needle in self.paths[code]])
+
+    def filter_mask(self, status='', extension='', technology='', host_suffix='', path=''):
+        """
+        ANDs together every non-empty filter and returns the matching rows as a
+        boolean mask, or None when no filter is set.
+        """
+        mask = None
+        for text, facet in ((status, self.status_mask), (extension, self.extension_mask),
+                            (technology, self.technology_mask), (host_suffix, self.host_suffix_mask),
+                            (path, self.path_mask)):
+            if text.strip():
+                facet_mask = facet(text)
+                mask = facet_mask if mask is None else mask & facet_mask
+        return mask
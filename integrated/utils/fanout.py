@@ -0,0 +1,193 @@
+import os
+import re
+import shlex
+import signal
+import subprocess
+import time
+from collections import deque
+
+# foreach:<input file>[:<jobs>] <command>, where the command uses the placeholders below
+FANOUT_PREFIX = "foreach:"
+DEFAULT_JOBS = 8
+MAX_JOBS = 64
+# Per-instance stdout/stderr goes here, relative to the target's output directory
+FANOUT_LOG_DIR = "foreach_logs"
+PLACEHOLDERS = ('{line}', '{line_safe}', '{index}')
+# Flags whose value is the file a tool writes its results to
+OUTPUT_FLAGS = ('-o', '-output', '--output', '-oN', '-oX', '-oG', '-oA', '>', '>>')
+PROGRESS_INTERVAL = 0.25
+
+class KeepUnknownPlaceholders(dict):
+    """
+    Mapping for str.format_map that leaves placeholders it doesn't know (such
+    as {line}) in the text for a later stage to fill in.
+    """
+    def __missing__(self, key):
+        return "{" + key + "}"
+
+class FanoutSpec:
+    """A parsed foreach: step: the input file, how many instances run at once and the command template."""
+    def __init__(self, input_file, jobs, template):
+        self.input_file = input_file
+        self.jobs = jobs
+        self.template = template
+
+    @property
+    def tool(self):
+        try:
+            program = shlex.split(self.template)[0]
+        except (ValueError, IndexError):
+            return "foreach"
+        return os.path.basename(program)
+
+def parse_fanout(command_text, use_shell=False):
+    """
+    Parses 'foreach:hosts[:jobs] tool ... {line} ...' into a FanoutSpec.
+    Raises ValueError if the step is malformed, including a shell step that
+    puts {line} inside quotes: expand() quotes it for the shell already.
+    """
+    head, _, template = command_text[len(FANOUT_PREFIX):].strip().partition(" ")
+    template = template.strip()
+    input_file, _, jobs = head.partition(":")
+    if not input_file or not template:
+        raise ValueError("expected 'foreach:<input file>[:<jobs>] <command>'")
+    if not any(placeholder in template for placeholder in PLACEHOLDERS):
+        raise ValueError("the command never uses {line}, so every instance would be the same")
+    if use_shell and quoted_placeholder(template):
+        raise ValueError("{line} is quoted for the shell already; remove the quotes around it")
+    try:
+        jobs = int(jobs) if jobs else DEFAULT_JOBS
+    except ValueError:
+        raise ValueError(f"'{jobs}' is not a number of parallel jobs")
+    return FanoutSpec(input_file, max(1, min(jobs, MAX_JOBS)), template)
+
+def quoted_placeholder(template):
+    """Whether {line} appears inside single or double quotes in a shell command."""
+    quote = None
+    pos = 0
+    while pos < len(template):
+        char = template[pos]
+        if char == '\\' and quote != "'":
+            pos += 2
+            continue
+        if char in ('"', "'") and quote in (None, char):
+            quote = None if quote else char
+        elif quote and template.startswith('{line}', pos):
+            return True
+        pos += 1
+    return False
+
+def output_paths(template):
+    """The paths a command template declares as its output, e.g. the value of -o or a > redirection."""
+    try:
+        args = shlex.split(template)
+    except ValueError:
+        return []
+    paths = []
+    for flag, value in zip(args, args[1:]):
+        if flag in OUTPUT_FLAGS:
+            paths.append(value)
+    for arg in args:
+        flag, sep, value = arg.partition('=')
+        if sep and flag in OUTPUT_FLAGS:
+            paths.append(value)
+    return paths
+
+def read_fanout_lines(path):
+    """The distinct non-empty, non-comment lines of an input file, in file order."""
+    with open(path, 'r', encoding='utf-8', errors='replace') as f:
+        lines = (line.strip() for line in f)
+        return list(dict.fromkeys(line for line in lines if line and not line.startswith('#')))
+
+def safe_name(line):
+    """A filename-safe form of an input line, e.g. https://a.example.com:8443 -> https_a.example.com_8443."""
+    return re.sub(r'[^A-Za-z0-9._-]+', '_', line).strip('_.')[:100] or "line"
+
+def expand(template, line, index, use_shell):
+    """
+    The command for one input line: a string for the shell (with the line
+    quoted, so the template must not quote {line} itself) or an argument list. Without a shell the template is split first,
+    so a line with spaces or quotes stays a single argument.
+    """
+    def fill(text, value):
+        return text.replace('{line_safe}', safe_name(line)).replace('{index}', str(index)).replace('{line}', value)
+
+    if use_shell:
+        return fill(template, shlex.quote(line))
+    return [fill(arg, line) for arg in shlex.split(template)]
+
+def run_parallel(instances, jobs, cwd, use_shell=False, should_stop=None, progress=None):
+    """
+    Runs (key, command, log path) instances as separate processes, at most
+    `jobs` at a time, each writing its console output to its own log file. A
+    failing instance is recorded and the others carry on; if the program
+    doesn't exist at all the remaining instances are skipped.
+
+    progress(done, failure count) is called at most every PROGRESS_INTERVAL
+    seconds and once at the end, and should_stop() returning True terminates
+    the running instances and skips the rest. Each instance runs in its own
+    process group so that terminating it also reaches what a shell started.
+
+    Returns (done, [(key, reason), ...] for the failures, whether the program was missing).
+    """
+    pending = deque(instances)
+    total = len(pending)
+    running = {} # Popen -> (key, log file)
+    failures = []
+    done = 0
+    missing = False
+    last_update = 0
+    while pending or running:
+        if should_stop and should_stop():
+            pending.clear()
+            for proc in running:
+                try:
+                    os.killpg(proc.pid, signal.SIGTERM)
+                except ProcessLookupError:
+                    pass
+            for proc, (_, log) in running.items():
+                proc.wait()
+                log.close()
+            running.clear()
+            break
+
+        while pending and len(running) < jobs:
+            key, command, log_path = pending.popleft()
+            try:
+                log = open(log_path, 'w')
+            except OSError as e:
+                done += 1
+                failures.append((key, f"could not open the log file: {e.strerror or e}"))
+                continue
+            try:
+                proc = subprocess.Popen(command, shell=use_shell, cwd=cwd, stdin=subprocess.DEVNULL,
+                                        stdout=log, stderr=subprocess.STDOUT, start_new_session=True)
+            except FileNotFoundError:
+                log.close()
+                missing = True
+                done += 1 + len(pending)
+                failures.append((key, "command not found"))
+                pending.clear()
+                break
+            except (OSError, ValueError) as e:
+                log.close()
+                done += 1
+                failures.append((key, str(e)))
+                continue
+            running[proc] = (key, log)
+
+        finished = [proc for proc in running if proc.poll() is not None]
+        for proc in finished:
+            key, log = running.pop(proc)
+            log.close()
+            done += 1
+            if proc.returncode != 0:
+                failures.append((key, f"exit code {proc.returncode}"))
+
+        now = time.monotonic()
+        if progress and (now - last_update >= PROGRESS_INTERVAL or done == total):
+            last_update = now
+            progress(done, len(failures))
+        if not finished:
+            time.sleep(0.05)
+    return done, failures, missing
@@ -0,0 +1,428 @@
+import os
+import re
+import json
+import zlib
+import struct
+import ipaddress
+from array import array
+from urllib.parse import urlparse
+import numpy as np
+
+try:
+    import orjson
+    json_loads = orjson.loads
+except ImportError:
+    json_loads = json.loads
+
+ANSI_ESCAPE = re.compile(r'\x1B(?:[@-Z\\-_]|\[[0-?]*[ -/]*[@-~])')
+# Large files are parsed as byte ranges of roughly this size, split at line boundaries
+CHUNK_SIZE = 8 * 1024 * 1024
+# How much of a file looks_like_httpx() reads
+SNIFF_BYTES = 64 * 1024
+SNIFF_LINES = 20
+HTTPX_LINE = re.compile(
+    r"^(?P<url>https?://[^\s]+)\s+"
+    r"\[\s*(?P<status_code>[\d,\s]+)\s*\]\s+"
+    r"\[\s*(?P<length>\d+)\s*\]\s+"
+    r"(?:\[\s*(?P<technology>[^\]]+)\s*\])?"
+)
+# Status code buckets reported by the statistics dialog; anything else is 'Other'
+STATUS_CLASSES = (
+    ('2xx (Success)', 2), ('3xx (Redirection)', 3),
+    ('4xx (Client Error)', 4), ('5xx (Server Error)', 5),
+)
+SUMMARY_PERCENTILES = (25, 50, 75, 90, 99)
+
+class StringColumn:
+    """
+    A dictionary-encoded text column. Each distinct string is stored once and
+    rows only hold a small integer code pointing into the string table.
+    """
+    def __init__(self):
+        self.values = []
+        self.codes_by_value = {}
+        self.codes = array('I')
+        self.reset_order()
+
+    def reset_order(self):
+        # The distinct strings sorted so far, kept so that sorting after an
+        # append only has to place the strings that are new
+        self.sorted_values = np.empty(0, dtype=object)
+        self.sorted_codes = np.empty(0, dtype=np.int64)
+
+    def code_for(self, value):
+        code = self.codes_by_value.get(value)
+        if code is None:
+            code = len(self.values)
+            self.codes_by_value[value] = code
+            self.values.append(value)
+        return code
+
+    def append(self, value):
+        self.codes.append(self.code_for(value))
+
+    def __getitem__(self, row):
+        return self.values[self.codes[row]]
+
+    def __getstate__(self):
+        # The reverse lookup is rebuilt on arrival; no need to ship it between processes
+        return self.values, self.codes
+
+    def __setstate__(self, state):
+        self.values, self.codes = state
+        self.codes_by_value = {value: code for code, value in enumerate(self.values)}
+        self.reset_order()
+
+    def __len__(self):
+        return len(self.codes)
+
+    def extend_column(self, other):
+        """Appends another StringColumn by remapping its codes into this table."""
+        if len(other) == 0: return
+        mapping = np.array([self.code_for(value) for value in other.values], dtype=np.uint32)
+        self.codes.frombytes(mapping[np.array(other.codes, dtype=np.intp)].tobytes())
+
+    def to_blobs(self):
+        encoded = [value.encode('utf-8', 'surrogatepass') for value in self.values]
+        return [array('I', map(len, encoded)).tobytes(), b''.join(encoded), self.codes.tobytes()]
+
+    @classmethod
+    def from_blobs(cls, lengths_blob, values_blob, codes_blob):
+        column = cls()
+        lengths = array('I')
+        lengths.frombytes(lengths_blob)
+        offset = 0
+        for length in lengths:
+            column.values.append(values_blob[offset:offset + length].decode('utf-8', 'surrogatepass'))
+            offset += length
+        column.codes_by_value = {value: code for code, value in enumerate(column.values)}
+        column.codes.frombytes(codes_blob)
+        return column
+
+    def sort_keys(self):
+        """Returns one integer per row that orders the same way as the strings."""
+        sorted_count = len(self.sorted_codes)
+        if sorted_count < len(self.values):
+            # Strings are only ever added, so merge the new ones into the existing order
+            new_codes = sorted(range(sorted_count, len(self.values)), key=self.values.__getitem__)
+            new_values = np.empty(len(new_codes), dtype=object)
+            new_values[:] = [self.values[code] for code in new_codes]
+            positions = np.searchsorted(self.sorted_values, new_values)
+            self.sorted_values = np.insert(self.sorted_values, positions, new_values)
+            self.sorted_codes = np.insert(self.sorted_codes, positions, new_codes)
+        ranks = np.empty(len(self.values), dtype=np.int64)
+        ranks[self.sorted_codes] = np.arange(len(self.values))
+        return ranks[np.array(self.codes, dtype=np.intp)]
+
+    def value_counts(self):
+        """Returns (values, counts) ordered by count, ties in first-seen order."""
+        counts = np.bincount(np.array(self.codes, dtype=np.intp), minlength=len(self.values))
+        order = np.argsort(-counts, kind='stable')
+        order = order[counts[order] > 0]
+        return [self.values[code] for code in order], counts[order].tolist()
+
+class IntColumn:
+    """A plain integer column backed by a compact array."""
+    def __init__(self):
+        self.values = array('q')
+
+    def append(self, value):
+        self.values.append(value)
+
+    def __getitem__(self, row):
+        return self.values[row]
+
+    def __len__(self):
+        return len(self.values)
+
+    def extend_column(self, other):
+        self.values.extend(other.values)
+
+    def to_blobs(self):
+        return [self.values.tobytes()]
+
+    @classmethod
+    def from_blobs(cls, values_blob):
+        column = cls()
+        column.values.frombytes(values_blob)
+        return column
+
+    def sort_keys(self):
+        return np.array(self.values, dtype=np.int64)
+
+    def value_counts(self):
+        """Returns (values, counts) ordered by count, ties in ascending value order."""
+        values, counts = np.unique(np.array(self.values, dtype=np.int64), return_counts=True)
+        order = np.argsort(-counts, kind='stable')
+        return values[order].tolist(), counts[order].tolist()
+
+    def summary(self):
+        """Count, mean, spread, extremes and percentiles of the column."""
+        values = np.array(self.values, dtype=np.int64)
+        if len(values) == 0:
+            return {'count': 0}
+        summary = {
+            'count': len(values), 'mean': float(values.mean()), 'std': float(values.std()),
+            'min': int(values.min()), 'max': int(values.max()),
+        }
+        for percentile, value in zip(SUMMARY_PERCENTILES, np.percentile(values, SUMMARY_PERCENTILES)):
+            summary[f'p{percentile}'] = float(value)
+        return summary
+
+class HttpxDataset:
+    """
+    Column-oriented storage for parsed httpx records. Memory grows with the
+    number of distinct strings rather than with rows x columns of Python objects.
+    """
+    COLUMNS = (
+        ('schema', str), ('host', str), ('path', str), ('extension', str),
+        ('status_code', int), ('length', int), ('technology', str),
+        ('title', str), ('ip', str), ('cdn', str), ('content_type', str),
+    )
+    # Bump whenever parsing or COLUMNS change so cached datasets are rebuilt
+    FORMAT_VERSION = 3
+
+    def __init__(self):
+        self.columns = {name: StringColumn() if kind is str else IntColumn() for name, kind in self.COLUMNS}
+        self.sort_key_cache = {}
+        self.stats_cache = {}
+
+    def __len__(self):
+        return len(self.columns['host'])
+
+    def append_record(self, record):
+        self.extend([record])
+
+    def extend(self, records):
+        columns = [(name, self.columns[name], '' if kind is str else 0) for name, kind in self.COLUMNS]
+        for record in records:
+            for name, column, default in columns:
+                column.append(record.get(name) or default)
+        self.clear_caches()
+
+    def extend_dataset(self, other):
+        """Appends every row of another dataset without going through dicts."""
+        for name, _ in self.COLUMNS:
+            self.columns[name].extend_column(other.columns[name])
+        self.clear_caches()
+
+    def clear_caches(self):
+        self.sort_key_cache.clear()
+        self.stats_cache.clear()
+
+    def to_bytes(self):
+        """Serializes the dataset into a compact, compressed binary blob."""
+        blobs = [blob for name, _ in self.COLUMNS for blob in self.columns[name].to_blobs()]
+        header = struct.pack(f'<I{len(blobs)}Q', len(blobs), *(len(blob) for blob in blobs))
+        return zlib.compress(header + b''.join(blobs), 1)
+
+    @classmethod
+    def from_bytes(cls, data):
+        """Rebuilds a dataset produced by to_bytes(); raises ValueError if it doesn't fit."""
+        data = zlib.decompress(data)
+        (count,) = struct.unpack_from('<I', data)
+        expected = sum(3 if kind is str else 1 for _, kind in cls.COLUMNS)
+        if count != expected:
+            raise ValueError("Serialized dataset has a different column layout")
+        lengths = struct.unpack_from(f'<{count}Q', data, 4)
+        offset = 4 + 8 * count
+        blobs = []
+        for length in lengths:
+            blobs.append(data[offset:offset + length])
+            offset += length
+        dataset = cls()
+        for name, kind in cls.COLUMNS:
+            if kind is str:
+                dataset.columns[name] = StringColumn.from_blobs(blobs.pop(0), blobs.pop(0), blobs.pop(0))
+            else:
+                dataset.columns[name] = IntColumn.from_blobs(blobs.pop(0))
+        return dataset
+
+    def value(self, row, name):
+        return self.columns[name][row]
+
+    def record(self, row):
+        return {name: self.columns[name][row] for name, _ in self.COLUMNS}
+
+    def url(self, row):
+        return f"{self.value(row, 'schema')}://{self.value(row, 'host')}{self.value(row, 'path')}"
+
+    def urls(self):
+        return [self.url(row) for row in range(len(self))]
+
+    def sort_keys(self, name):
+        """Precomputed (and cached until the next append) sort keys for a column."""
+        if name not in self.sort_key_cache:
+            self.sort_key_cache[name] = self.columns[name].sort_keys()
+        return self.sort_key_cache[name]
+
+    def cached_stat(self, key, compute):
+        """Returns compute(), memoized on this dataset until rows are added."""
+        if key not in self.stats_cache:
+            self.stats_cache[key] = compute()
+        return self.stats_cache[key]
+
+    def value_counts(self, name):
+        """(values, counts) for a column, most common first."""
+        return self.cached_stat(('value_counts', name), self.columns[name].value_counts)
+
+    def numeric_summary(self, name):
+        """Numeric summary of an integer column, see IntColumn.summary()."""
+        return self.cached_stat(('summary', name), self.columns[name].summary)
+
+    def status_class_counts(self):
+        """Row counts per STATUS_CLASSES bucket plus 'Other', zero buckets left out."""
+        def compute():
+            classes = np.array(self.columns['status_code'].values, dtype=np.int64) // 100
+            bucket_counts = np.bincount(np.clip(classes, 0, 6), minlength=7)
+            counts = {label: int(bucket_counts[bucket]) for label, bucket in STATUS_CLASSES}
+            counts['Other'] = len(classes) - sum(counts.values())
+            return {label: count for label, count in counts.items() if count > 0}
+        return self.cached_stat(('status_classes',), compute)
+
+def parse_httpx_line(line):
+    """Parses one line of httpx output (text or -json) into a record dict, or None."""
+    if line.lstrip().startswith('{'):
+        return parse_httpx_json_line(line)
+    return parse_httpx_text_line(line)
+
+def parse_httpx_json_line(line):
+    """Parses one line of httpx -json output into a record dict, or None."""
+    try:
+        data = json_loads(line)
+    except ValueError:
+        return None
+    if not isinstance(data, dict) or not data.get('url') or data.get('failed'):
+        return None
+    parsed_url = urlparse(data['url'])
+    # With -fr the chain holds every hop; the last one is what was finally served
+    chain = data.get('chain_status_codes') or []
+    status_code = chain[-1] if chain else data.get('status_code', 0)
+    _, extension = os.path.splitext(parsed_url.path)
+    # Recent httpx versions put the resolved address in 'host'; older ones only in 'a'
+    ip = data.get('host', '')
+    if not is_ip_address(ip):
+        ip = (data.get('a') or [''])[0]
+    cdn = data.get('cdn_name') or ('yes' if data.get('cdn') else '')
+    return {
+        'schema': parsed_url.scheme, 'host': parsed_url.hostname, 'path': parsed_url.path,
+        'extension': extension if extension else 'N/A', 'status_code': int(status_code or 0),
+        'length': int(data.get('content_length') or 0), 'technology': ','.join(data.get('tech') or []) or 'N/A',
+        'title': data.get('title', ''), 'ip': ip, 'cdn': cdn, 'content_type': data.get('content_type', '')
+    }
+
+def is_ip_address(value):
+    try:
+        ipaddress.ip_address(value)
+        return True
+    except ValueError:
+        return False
+
+def parse_httpx_text_line(line):
+    """Parses one line of httpx text output into a record dict, or None."""
+    match = HTTPX_LINE.match(ANSI_ESCAPE.sub('', line).strip())
+    if not match: return None
+    data = match.groupdict()
+    parsed_url = urlparse(data['url'])
+    final_status_code = data['status_code'].split(',')[-1].strip()
+    _, extension = os.path.splitext(parsed_url.path)
+    return {
+        'schema': parsed_url.scheme, 'host': parsed_url.hostname, 'path': parsed_url.path,
+        'extension': extension if extension else 'N/A', 'status_code': int(final_status_code),
+        'length': int(data['length']), 'technology': (data.get('technology') or 'N/A').strip()
+    }
+
+def parse_httpx_file(file_path):
+    """Parses a single httpx output file into a list of record dicts."""
+    records = []
+    with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
+        for line in f:
+            record = parse_httpx_line(line)
+            if record is not None:
+                records.append(record)
+    return records
+
+def looks_like_httpx(file_path):
+    """Whether any of the first non-empty lines of a file parse as httpx output (text or -json)."""
+    with open(file_path, 'rb') as f:
+        sample = f.read(SNIFF_BYTES)
+    lines = sample.decode('utf-8', errors='ignore').split('\n')
+    if len(sample) == SNIFF_BYTES:
+        # The last line is probably cut off
+        lines.pop()
+    lines = [line for line in lines if line.strip()][:SNIFF_LINES]
+    return any(parse_httpx_line(line) is not None for line in lines)
+
+def complete_lines_size(file_path, size=None):
+    """
+    The offset just past the last newline within the first `size` bytes of a
+    file (all of it by default), or 0. Bytes after it are a last line that
+    may still be being written.
+    """
+    with open(file_path, 'rb') as f:
+        end = os.fstat(f.fileno()).st_size if size is None else size
+        while end > 0:
+            start = max(0, end - SNIFF_BYTES)
+            f.seek(start)
+            newline = f.read(end - start).rfind(b'\n')
+            if newline >= 0:
+                return start + newline + 1
+            end = start
+    return 0
+
+def split_file_ranges(file_path, chunk_size=CHUNK_SIZE):
+    """
+    Splits the complete lines of a file into (start, end) byte ranges that
+    each end on a line boundary; an unterminated last line is left for
+    follow mode to pick up once it is written out.
+    """
+    size = complete_lines_size(file_path)
+    ranges = []
+    start = 0
+    with open(file_path, 'rb') as f:
+        while start < size:
+            f.seek(min(start + chunk_size, size))
+            f.readline()
+            end = min(f.tell(), size)
+            ranges.append((start, end))
+            start = end
+    return ranges
+
+def parse_httpx_range(file_path, start, end):
+    """
+    Parses the lines in the byte range [start, end) of a file into an
+    HttpxDataset. Runs in worker processes, so it must stay free of Qt.
+    """
+    with open(file_path, 'rb') as f:
+        f.seek(start)
+        text = f.read(end - start).decode('utf-8', errors='ignore')
+    dataset = HttpxDataset()
+    dataset.extend(record for record in map(parse_httpx_line, text.split('\n')) if record is not None)
+    return dataset
+
+def parse_httpx_tail(file_path, offset, max_bytes=CHUNK_SIZE):
+    """
+    Parses the complete lines appended to a file after `offset`, reading at
+    most max_bytes, and returns (dataset, offset just past the last complete
+    line). If `offset` falls inside a line, the rest of that line is skipped
+    since its start was already read. A single line longer than max_bytes is
+    read to its end, so the offset always moves past it once it is complete.
+    """
+    with open(file_path, 'rb') as f:
+        skip_partial = False
+        if offset > 0:
+            f.seek(offset - 1)
+            skip_partial = f.read(1) != b'\n'
+        data = f.read(max_bytes)
+        if b'\n' not in data:
+            chunks = [data]
+            while chunks[-1] and b'\n' not in chunks[-1]:
+                chunks.append(f.read(max_bytes))
+            data = b''.join(chunks)
+    end = data.rfind(b'\n') + 1
+    start = data.find(b'\n') + 1 if skip_partial else 0
+    dataset = HttpxDataset()
+    if end > start:
+        lines = data[start:end].decode('utf-8', errors='ignore').split('\n')
+        dataset.extend(record for record in map(parse_httpx_line, lines) if record is not None)
+    return dataset, offset + end
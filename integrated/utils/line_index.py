@@ -0,0 +1,183 @@
+import os
+from array import array
+from collections import OrderedDict
+import numpy as np
+
+# Every CHECKPOINT_INTERVAL-th line start is stored; others are found by
+# scanning forward from the nearest checkpoint, which keeps the index tiny
+CHECKPOINT_INTERVAL = 256
+SCAN_BLOCK = 16 * 1024 * 1024
+# Lines are read for display in blocks of this size
+READ_BLOCK = 64 * 1024
+# Longer lines are cut short for display (minified JS, base64 blobs, ...)
+MAX_LINE_BYTES = 4096
+
+class FileReader:
+    """
+    Reads a file by offset with os.pread. Unlike a memory map, a file that is
+    truncated or rewritten in place underneath it only makes reads come back
+    short, instead of killing the process with SIGBUS.
+    """
+    def __init__(self, file_path):
+        self.fd = os.open(file_path, os.O_RDONLY)
+
+    def size(self):
+        return os.fstat(self.fd).st_size
+
+    def inode(self):
+        return os.fstat(self.fd).st_ino
+
+    def read(self, pos, count):
+        return os.pread(self.fd, count, pos) if count > 0 else b''
+
+    def close(self):
+        if self.fd is not None:
+            os.close(self.fd)
+            self.fd = None
+
+def decode_line(data):
+    return data.decode('utf-8', errors='replace').rstrip('\r')
+
+class LineIndex:
+    """
+    A sparse line-offset index for a (possibly growing) text file: the byte
+    offset of every CHECKPOINT_INTERVAL-th line. line_count counts complete
+    (newline-terminated) lines, and indexed_bytes is the offset just past the
+    last newline seen. Whatever follows indexed_bytes is an unterminated last
+    line that may still grow.
+
+    extend() is called from an indexing thread while the GUI thread reads
+    lines; readers must stay below a line count that extend() has already
+    returned, since the checkpoints they need are in place by then.
+    """
+    def __init__(self):
+        self.checkpoints = array('q', [0])
+        self.line_count = 0
+        self.indexed_bytes = 0
+
+    def extend(self, reader, end, should_stop=None, progress=None):
+        """Indexes the lines of the file between indexed_bytes and end."""
+        pos = self.indexed_bytes
+        while pos < end:
+            if should_stop and should_stop():
+                return
+            data = reader.read(pos, min(SCAN_BLOCK, end - pos))
+            if not data:
+                return # Truncated since `end` was taken; the viewer starts over
+            line_starts = np.flatnonzero(np.frombuffer(data, dtype=np.uint8) == 10) + (pos + 1)
+            if len(line_starts):
+                # Line number of each new line start; keep the ones on a checkpoint
+                numbers = np.arange(self.line_count + 1, self.line_count + 1 + len(line_starts))
+                self.checkpoints.extend(line_starts[numbers % CHECKPOINT_INTERVAL == 0].tolist())
+                self.line_count += len(line_starts)
+                self.indexed_bytes = int(line_starts[-1])
+            pos += len(data)
+            if progress:
+                progress(pos)
+
+    def read_lines(self, reader, first, count, end):
+        """Up to `count` lines starting at line `first`, decoded for display, reading no further than `end`."""
+        skip = first % CHECKPOINT_INTERVAL
+        pos = self.checkpoints[first // CHECKPOINT_INTERVAL]
+        lines = []
+        current = bytearray() # Start of the line being read, up to MAX_LINE_BYTES
+        while len(lines) < skip + count:
+            data = reader.read(pos, min(READ_BLOCK, end - pos))
+            if not data:
+                if current:
+                    lines.append(bytes(current)) # Unterminated last line
+                break
+            pos += len(data)
+            start = 0
+            while len(lines) < skip + count:
+                line_end = data.find(b'\n', start)
+                stop = len(data) if line_end == -1 else line_end
+                if len(current) < MAX_LINE_BYTES:
+                    current += data[start:min(stop, start + MAX_LINE_BYTES - len(current))]
+                if line_end == -1:
+                    break
+                lines.append(bytes(current))
+                current = bytearray()
+                start = line_end + 1
+        return [decode_line(line) for line in lines[skip:]]
+
+class LineCache:
+    """
+    Reads lines through a LineIndex in blocks that start on a checkpoint, and
+    keeps the most recently used blocks so redrawing and scrolling back and
+    forth don't rescan the file.
+    """
+    CACHED_BLOCKS = 64
+
+    def __init__(self, line_index, reader=None, end=0):
+        self.line_index = line_index
+        self.reader = reader
+        # Bytes known to the viewer; lines past it aren't read until it is indexed
+        self.end = end
+        self.blocks = OrderedDict()
+
+    def line(self, row):
+        block, offset = divmod(row, CHECKPOINT_INTERVAL)
+        lines = self.blocks.get(block)
+        if lines is None:
+            lines = self.line_index.read_lines(self.reader, block * CHECKPOINT_INTERVAL, CHECKPOINT_INTERVAL, self.end)
+            self.blocks[block] = lines
+            if len(self.blocks) > self.CACHED_BLOCKS:
+                self.blocks.popitem(last=False)
+        else:
+            self.blocks.move_to_end(block)
+        return lines[offset] if offset < len(lines) else ""
+
+    def forget(self, row):
+        """Drops the cached block holding a line, e.g. an unterminated last line that grew."""
+        self.blocks.pop(row // CHECKPOINT_INTERVAL, None)
+
+def read_window(reader, start, end):
+    """The bytes from start up to the last line boundary within about SCAN_BLOCK, or up to end."""
+    data = reader.read(start, min(SCAN_BLOCK, end - start))
+    while start + len(data) < end:
+        cut = data.rfind(b'\n') + 1
+        if cut:
+            return data[:cut]
+        # One line longer than a whole block: read on until it ends
+        more = reader.read(start + len(data), min(SCAN_BLOCK, end - start - len(data)))
+        if not more:
+            break
+        data += more
+    return data
+
+def search_lines(reader, pattern, start=0, end=None, first_line=0, should_stop=None, progress=None):
+    """
+    Yields (line number, line text) for each line of the file between start
+    and end that a compiled bytes regex matches, in file order. first_line is
+    the number of the line that starts at `start`. The file is read in
+    windows of about SCAN_BLOCK that end on a line boundary, so a search with
+    few matches can still be stopped and report progress(position) as it goes.
+    """
+    end = reader.size() if end is None else end
+    line = first_line
+    window_start = start
+    while window_start < end:
+        if should_stop and should_stop():
+            return
+        window = read_window(reader, window_start, end)
+        if not window:
+            return # Truncated while searching
+        pos = counted = 0
+        while pos < len(window):
+            match = pattern.search(window, pos)
+            if match is None:
+                break
+            line_start = window.rfind(b'\n', counted, match.start()) + 1 or counted
+            line += window.count(b'\n', counted, line_start)
+            line_end = window.find(b'\n', match.start())
+            if line_end == -1:
+                line_end = len(window)
+            yield line, decode_line(window[line_start:min(line_end, line_start + MAX_LINE_BYTES)])
+            # One result per line; carry on from the next one
+            line += 1
+            pos = counted = line_end + 1
+        line += window.count(b'\n', min(counted, len(window)))
+        window_start += len(window)
+        if progress:
+            progress(window_start)
@@ -0,0 +1,89 @@
+import re
+import time
+from PyQt5.QtCore import QThread, pyqtSignal
+from utils.line_index import FileReader, search_lines
+
+class LineIndexWorker(QThread):
+    """
+    Worker thread that extends a LineIndex over whatever has been written to
+    the file since it was last indexed, reporting progress after every block.
+    """
+    lines_indexed = pyqtSignal(int, int, int) # line count, offset past the last newline, bytes scanned
+    error = pyqtSignal(str)
+
+    def __init__(self, file_path, line_index, parent=None):
+        super().__init__(parent)
+        self.file_path = file_path
+        self.line_index = line_index
+        self.is_running = True
+
+    def stop(self):
+        self.is_running = False
+
+    def run(self):
+        try:
+            # A descriptor of our own, so the viewer can drop its copy when the file is rewritten
+            reader = FileReader(self.file_path)
+            try:
+                index = self.line_index
+                index.extend(
+                    reader, reader.size(), should_stop=lambda: not self.is_running,
+                    progress=lambda scanned: self.lines_indexed.emit(index.line_count, index.indexed_bytes, scanned)
+                )
+            finally:
+                reader.close()
+        except (OSError, ValueError) as e:
+            self.error.emit(f"Failed to index {self.file_path}: {e}")
+
+class LineSearchWorker(QThread):
+    """
+    Worker thread that runs a regex over a file's lines and streams the
+    matching (line number, text) pairs back in batches.
+    """
+    matches_found = pyqtSignal(object) # list of (line number, text)
+    progress_updated = pyqtSignal(int, int)
+    error = pyqtSignal(str)
+
+    MAX_RESULTS = 10000
+    BATCH_INTERVAL = 0.1
+
+    def __init__(self, file_path, pattern, end, ignore_case=True, parent=None):
+        super().__init__(parent)
+        self.file_path = file_path
+        self.pattern = pattern
+        self.end = end
+        self.flags = re.MULTILINE | (re.IGNORECASE if ignore_case else 0)
+        self.result_count = 0
+        self.is_running = True
+
+    def stop(self):
+        self.is_running = False
+
+    def run(self):
+        try:
+            pattern = re.compile(self.pattern.encode('utf-8'), self.flags)
+        except re.error as e:
+            self.error.emit(f"Invalid regex: {e}")
+            return
+        try:
+            reader = FileReader(self.file_path)
+            try:
+                batch = []
+                last_emit = time.monotonic()
+                end = min(self.end, reader.size())
+                progress = lambda pos: self.progress_updated.emit(pos, end)
+                for match in search_lines(reader, pattern, end=end, should_stop=lambda: not self.is_running, progress=progress):
+                    batch.append(match)
+                    self.result_count += 1
+                    if self.result_count >= self.MAX_RESULTS:
+                        break
+                    if time.monotonic() - last_emit >= self.BATCH_INTERVAL:
+                        self.matches_found.emit(batch)
+                        batch = []
+                        last_emit = time.monotonic()
+                if batch:
+                    self.matches_found.emit(batch)
+            finally:
+                reader.close()
+        except (OSError, ValueError) as e:
+            self.error.emit(f"Search failed: {e}")
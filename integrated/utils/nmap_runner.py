@@ -0,0 +1,148 @@
+import json
+import os
+import shlex
+import xml.etree.ElementTree as ET
+from utils import fanout
+
+DEFAULT_NMAP_ARGS = "-sCV -Pn"
+DEFAULT_CONCURRENCY = 4
+# Per-host XML and console output, relative to the target's output directory
+NMAP_DIR = "nmap_hosts"
+
+def read_open_ports(path):
+    """
+    Groups the open ports of a naabu (or run_port_scan) output file by IP:
+    {ip: [port, ...]} in first-seen host order, ports sorted. Reads ip:port,
+    [ipv6]:port and naabu -json lines.
+    """
+    hosts = {}
+    with open(path, 'r', encoding='utf-8', errors='replace') as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            if line.startswith('{'):
+                try:
+                    data = json.loads(line)
+                    host, port = data.get('ip') or data.get('host'), int(data['port'])
+                except (ValueError, KeyError, TypeError):
+                    continue
+            else:
+                host, _, port = line.rpartition(':')
+                host = host.strip('[]')
+                if not host or not port.isdigit():
+                    continue
+                port = int(port)
+            hosts.setdefault(host, set()).add(port)
+    return {host: sorted(ports) for host, ports in hosts.items()}
+
+def nmap_command(host, ports, xml_path, nmap_args=DEFAULT_NMAP_ARGS):
+    command = ['nmap', '-p', ','.join(map(str, ports))] + shlex.split(nmap_args) + ['-oX', xml_path]
+    if ':' in host:
+        command.append('-6')
+    return command + [host]
+
+def parse_nmap_xml(path):
+    """
+    One record per open port in an nmap XML report; closed and filtered
+    ports are left out. Each record is shaped like an httpx -json line (url,
+    host, tech, title) so the Playground can load the summary, with the nmap
+    details alongside.
+    """
+    records = []
+    root = ET.parse(path).getroot()
+    for host in root.iter('host'):
+        address = next((a.get('addr') for a in host.iter('address') if a.get('addrtype') in ('ipv4', 'ipv6')), '')
+        hostnames = [name.get('name') for name in host.iter('hostname') if name.get('name')]
+        for port in host.iter('port'):
+            state = port.find('state')
+            if state is None or state.get('state') != 'open':
+                continue
+            service = port.find('service')
+            service = service.attrib if service is not None else {}
+            scripts = {script.get('id'): (script.get('output') or '').strip() for script in port.iter('script')}
+            name = service.get('name') or 'unknown'
+            if service.get('tunnel') == 'ssl' and name == 'http':
+                name = 'https'
+            product = " ".join(filter(None, (service.get('product'), service.get('version'))))
+            endpoint = f"[{address}]" if ':' in address else address
+            records.append({
+                'url': f"{name}://{endpoint}:{port.get('portid')}",
+                'host': address,
+                'port': int(port.get('portid')),
+                'protocol': port.get('protocol'),
+                'state': state.get('state'),
+                'service': name,
+                'product': product,
+                'extrainfo': service.get('extrainfo', ''),
+                'tech': [product] if product else [],
+                'title': scripts.get('http-title') or service.get('extrainfo', ''),
+                'hostnames': hostnames,
+                'scripts': scripts,
+            })
+    return records
+
+def run_nmap_hosts(input_file_path, output_file_path, concurrency=DEFAULT_CONCURRENCY, nmap_args=DEFAULT_NMAP_ARGS,
+                   should_stop=None, progress=None):
+    """
+    Runs one nmap per host over all of that host's open ports from a naabu
+    output file, `concurrency` hosts at a time. Each host gets its own XML
+    report (and console log) in NMAP_DIR next to the output file; the reports
+    are merged into the output file as JSON lines, one per port.
+
+    progress(done, total, failure count) is called as hosts finish, and
+    should_stop() returning True stops the remaining scans.
+
+    Returns:
+        tuple: A tuple containing a boolean for success and a message.
+    """
+    try:
+        hosts = read_open_ports(input_file_path)
+    except FileNotFoundError:
+        return False, f"Input file for nmap not found: {input_file_path}"
+    if not hosts:
+        return True, f"No open ports in {os.path.basename(input_file_path)}, nothing to scan."
+
+    host_dir = os.path.join(os.path.dirname(output_file_path), NMAP_DIR)
+    os.makedirs(host_dir, exist_ok=True)
+    instances = []
+    xml_paths = {}
+    for host, ports in hosts.items():
+        base = os.path.join(host_dir, fanout.safe_name(host))
+        xml_paths[host] = base + ".xml"
+        instances.append((host, nmap_command(host, ports, xml_paths[host], nmap_args), base + ".log"))
+
+    done, failures, missing = fanout.run_parallel(
+        instances, max(1, concurrency), os.path.dirname(output_file_path), should_stop=should_stop,
+        progress=lambda done, failed: progress and progress(done, len(instances), failed)
+    )
+    if missing:
+        return False, "Command not found: nmap"
+
+    failed_hosts = {host for host, _ in failures}
+    port_count = 0
+    unreadable = 0
+    with open(output_file_path, 'w') as out_file:
+        for host in hosts:
+            if host in failed_hosts or not os.path.exists(xml_paths[host]):
+                continue
+            try:
+                records = parse_nmap_xml(xml_paths[host])
+            except ET.ParseError:
+                # Interrupted scans leave a truncated report
+                unreadable += 1
+                continue
+            for record in records:
+                out_file.write(json.dumps(record) + "\n")
+            port_count += len(records)
+
+    message = (f"Scanned {done - len(failures)}/{len(hosts)} hosts ({sum(map(len, hosts.values()))} ports) "
+               f"with one nmap per host; {port_count} open ports merged into {os.path.basename(output_file_path)}.")
+    if failures:
+        message += " Failed: " + ", ".join(f"{host} ({reason})" for host, reason in failures[:10])
+        if len(failures) > 10:
+            message += f" and {len(failures) - 10} more"
+        message += f"; see {NMAP_DIR}/<host>.log."
+    if unreadable:
+        message += f" {unreadable} reports were incomplete."
+    return True, message
@@ -0,0 +1,87 @@
+import os
+import time
+import sqlite3
+from utils.httpx_data import HttpxDataset
+from utils.db import cache_path
+
+CACHE_FILE = "parse_cache.db"
+# Total size of cached datasets; least recently used entries are evicted past this
+MAX_CACHE_BYTES = 256 * 1024 * 1024
+
+def get_cache_connection():
+    """Establishes a connection to the parse cache, creating its table if needed."""
+    conn = sqlite3.connect(cache_path(CACHE_FILE))
+    # Only takes effect on a new file; lets evictions give space back to the filesystem
+    conn.execute("PRAGMA auto_vacuum = FULL")
+    conn.execute("""
+    CREATE TABLE IF NOT EXISTS parsed_files (
+        path TEXT PRIMARY KEY, size INTEGER NOT NULL, mtime_ns INTEGER NOT NULL,
+        format_version INTEGER NOT NULL, data BLOB NOT NULL,
+        data_size INTEGER NOT NULL, last_used REAL NOT NULL )""")
+    return conn
+
+def file_signature(file_path):
+    """Returns the (absolute path, size, mtime) triple a cache entry is keyed on."""
+    stat = os.stat(file_path)
+    return os.path.abspath(file_path), stat.st_size, stat.st_mtime_ns
+
+def is_cached(signature):
+    """Cheap check for a valid cache entry without loading it."""
+    path, size, mtime_ns = signature
+    conn = get_cache_connection()
+    try:
+        return conn.execute(
+            "SELECT 1 FROM parsed_files WHERE path = ? AND size = ? AND mtime_ns = ? AND format_version = ?",
+            (path, size, mtime_ns, HttpxDataset.FORMAT_VERSION)
+        ).fetchone() is not None
+    finally:
+        conn.close()
+
+def get_cached_dataset(signature):
+    """Returns the cached HttpxDataset for an unchanged file, or None."""
+    path, size, mtime_ns = signature
+    conn = get_cache_connection()
+    try:
+        row = conn.execute(
+            "SELECT data FROM parsed_files WHERE path = ? AND size = ? AND mtime_ns = ? AND format_version = ?",
+            (path, size, mtime_ns, HttpxDataset.FORMAT_VERSION)
+        ).fetchone()
+        if row is None:
+            # Drop stale entries for this path right away
+            conn.execute("DELETE FROM parsed_files WHERE path = ?", (path,))
+            conn.commit()
+            return None
+        try:
+            dataset = HttpxDataset.from_bytes(row[0])
+        except Exception:
+            conn.execute("DELETE FROM parsed_files WHERE path = ?", (path,))
+            conn.commit()
+            return None
+        conn.execute("UPDATE parsed_files SET last_used = ? WHERE path = ?", (time.time(), path))
+        conn.commit()
+        return dataset
+    finally:
+        conn.close()
+
+def store_dataset(signature, dataset):
+    """Caches a parsed dataset and evicts the least recently used entries over budget."""
+    path, size, mtime_ns = signature
+    data = dataset.to_bytes()
+    if len(data) > MAX_CACHE_BYTES:
+        return
+    conn = get_cache_connection()
+    try:
+        conn.execute(
+            "INSERT OR REPLACE INTO parsed_files (path, size, mtime_ns, format_version, data, data_size, last_used) VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (path, size, mtime_ns, HttpxDataset.FORMAT_VERSION, data, len(data), time.time())
+        )
+        total = conn.execute("SELECT COALESCE(SUM(data_size), 0) FROM parsed_files").fetchone()[0]
+        if total > MAX_CACHE_BYTES:
+            for old_path, old_size in conn.execute("SELECT path, data_size FROM parsed_files ORDER BY last_used").fetchall():
+                if total <= MAX_CACHE_BYTES:
+                    break
+                conn.execute("DELETE FROM parsed_files WHERE path = ?", (old_path,))
+                total -= old_size
+        conn.commit()
+    finally:
+        conn.close()
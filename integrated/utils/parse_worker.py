@@ -0,0 +1,159 @@
+import os
+import time
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from PyQt5.QtCore import QThread, pyqtSignal
+from utils.httpx_data import HttpxDataset, complete_lines_size, parse_httpx_line, parse_httpx_range, split_file_ranges
+from utils import parse_cache
+from utils.facet_index import FacetIndex
+from utils.process_pool import get_parse_pool
+
+class HttpxParseWorker(QThread):
+    """
+    Worker thread that parses httpx output files and streams dataset batches.
+    Unchanged files come from the parse cache. When more than one byte range
+    needs parsing, the ranges go to a process pool and come back in file order.
+    """
+    batch_ready = pyqtSignal(object)         # HttpxDataset holding the new rows
+    progress_updated = pyqtSignal(int, int)  # bytes parsed, total bytes
+    file_started = pyqtSignal(int, int, str) # file number, file count, path
+    error = pyqtSignal(str)
+    finished = pyqtSignal()
+
+    BATCH_SIZE = 5000
+    BATCH_INTERVAL = 0.25 # seconds; keeps the GUI thread from drowning in tiny batches
+
+    def __init__(self, file_paths, parent=None):
+        super().__init__(parent)
+        self.file_paths = file_paths
+        self.is_running = True
+        # Offset just past the last complete line read from each fully loaded file; follow mode continues from here
+        self.file_offsets = {}
+
+    def stop(self):
+        self.is_running = False
+
+    def run(self):
+        total_bytes = sum(os.path.getsize(fp) for fp in self.file_paths if os.path.isfile(fp))
+        self.bytes_done = 0
+
+        # Plan every file first so the pool can work on all of them at once
+        plans = []
+        for file_path in self.file_paths:
+            try:
+                signature = parse_cache.file_signature(file_path)
+                ranges = None if parse_cache.is_cached(signature) else split_file_ranges(file_path)
+                plans.append((file_path, signature, ranges, None))
+            except Exception as e:
+                plans.append((file_path, None, None, e))
+
+        futures = {}
+        if sum(len(ranges) for _, _, ranges, _ in plans if ranges) > 1:
+            pool = get_parse_pool()
+            for index, (file_path, _, ranges, _) in enumerate(plans):
+                if ranges:
+                    futures[index] = [pool.submit(parse_httpx_range, file_path, start, end) for start, end in ranges]
+
+        for index, (file_path, signature, ranges, failure) in enumerate(plans):
+            if not self.is_running:
+                break
+            self.file_started.emit(index + 1, len(plans), file_path)
+            try:
+                if failure is not None:
+                    raise failure
+                if index in futures:
+                    file_dataset = self.collect_ranges(futures[index], ranges, total_bytes)
+                    offset = ranges[-1][1]
+                elif ranges is None:
+                    cached = parse_cache.get_cached_dataset(signature)
+                    if cached is not None:
+                        self.bytes_done += signature[1]
+                        self.batch_ready.emit(cached)
+                        self.progress_updated.emit(self.bytes_done, total_bytes)
+                        self.file_offsets[file_path] = complete_lines_size(file_path, signature[1])
+                        continue
+                    # Evicted since planning; fall back to parsing here
+                    file_dataset, offset = self.parse_file(file_path, total_bytes)
+                else:
+                    file_dataset, offset = self.parse_file(file_path, total_bytes)
+                if self.is_running:
+                    # A file that is still being written has moved past the signature taken
+                    # while planning; its rows wouldn't match that entry
+                    if parse_cache.file_signature(file_path) == signature:
+                        parse_cache.store_dataset(signature, file_dataset)
+                    self.file_offsets[file_path] = offset
+            except Exception as e:
+                self.error.emit(f"Could not read/parse {os.path.basename(file_path)}: {e}")
+
+        for file_futures in futures.values():
+            for future in file_futures:
+                future.cancel()
+        self.progress_updated.emit(self.bytes_done, total_bytes)
+        self.finished.emit()
+
+    def collect_ranges(self, futures, ranges, total_bytes):
+        """Waits for a file's ranges in order, emitting each one as soon as it is ready."""
+        file_dataset = HttpxDataset()
+        for future, (start, end) in zip(futures, ranges):
+            chunk = None
+            while self.is_running and chunk is None:
+                try:
+                    chunk = future.result(timeout=0.1)
+                except FutureTimeoutError:
+                    continue
+            if chunk is None:
+                break
+            file_dataset.extend_dataset(chunk)
+            self.bytes_done += end - start
+            self.batch_ready.emit(chunk)
+            self.progress_updated.emit(self.bytes_done, total_bytes)
+        return file_dataset
+
+    def parse_file(self, file_path, total_bytes):
+        """
+        Parses the complete lines of one file in this thread, emitting batches
+        as it goes. Returns all of its rows and the offset just past the last
+        complete line; an unterminated last line is still being written and is
+        left for follow mode.
+        """
+        file_dataset = HttpxDataset()
+        batch = []
+        offset = 0
+        last_emit = time.monotonic()
+        with open(file_path, 'rb') as f:
+            for raw_line in f:
+                if not self.is_running or not raw_line.endswith(b'\n'):
+                    break
+                offset += len(raw_line)
+                self.bytes_done += len(raw_line)
+                record = parse_httpx_line(raw_line.decode('utf-8', errors='ignore'))
+                if record is not None:
+                    batch.append(record)
+                if len(batch) >= self.BATCH_SIZE or (batch and time.monotonic() - last_emit >= self.BATCH_INTERVAL):
+                    self.emit_batch(batch, file_dataset)
+                    self.progress_updated.emit(self.bytes_done, total_bytes)
+                    batch = []
+                    last_emit = time.monotonic()
+        if batch:
+            self.emit_batch(batch, file_dataset)
+        return file_dataset, offset
+
+    def emit_batch(self, records, file_dataset):
+        batch_dataset = HttpxDataset()
+        batch_dataset.extend(records)
+        file_dataset.extend_dataset(batch_dataset)
+        self.batch_ready.emit(batch_dataset)
+
+class FacetIndexWorker(QThread):
+    """Builds the Playground's filter indexes off the GUI thread once a dataset has loaded."""
+    index_ready = pyqtSignal(object) # FacetIndex
+    error = pyqtSignal(str)
+
+    def __init__(self, dataset, parent=None):
+        super().__init__(parent)
+        self.dataset = dataset
+
+    def run(self):
+        try:
+            self.index_ready.emit(FacetIndex(self.dataset))
+        except Exception as e:
+            self.error.emit(f"Could not build filter indexes: {e}")
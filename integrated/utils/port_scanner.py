@@ -0,0 +1,302 @@
+import asyncio
+import errno
+import ipaddress
+import os
+import socket
+import struct
+import time
+
+try:
+    import resource
+except ImportError:
+    resource = None # Windows
+
+# The 100 most common TCP ports (nmap's top 100), used for '-ports top100'
+TOP_PORTS = (
+    7, 9, 13, 21, 22, 23, 25, 26, 37, 53, 79, 80, 81, 88, 106, 110, 111, 113, 119, 135, 139, 143, 144,
+    179, 199, 389, 427, 443, 444, 445, 465, 513, 514, 515, 543, 544, 548, 554, 587, 631, 646, 873,
+    990, 993, 995, 1025, 1026, 1027, 1028, 1029, 1110, 1433, 1720, 1723, 1755, 1900, 2000, 2001,
+    2049, 2121, 2717, 3000, 3128, 3306, 3389, 3986, 4899, 5000, 5009, 5051, 5060, 5101, 5190, 5357,
+    5432, 5631, 5666, 5800, 5900, 6000, 6001, 6646, 7070, 8000, 8008, 8009, 8080, 8081, 8443, 8888,
+    9100, 9999, 10000, 32768, 49152, 49153, 49154, 49155, 49156, 49157
+)
+DEFAULT_PORTS = "top100"
+DEFAULT_CONCURRENCY = 1000
+INITIAL_CONCURRENCY = 64
+DEFAULT_TIMEOUT = 1.0
+# Connection attempts per second against any one host; 0 means unlimited
+DEFAULT_HOST_RATE = 0
+# Descriptors left for the rest of the process when capping concurrency to the open-file limit
+RESERVED_FDS = 64
+# These mean the local machine ran out of something, not that the port is closed
+RESOURCE_ERRNOS = {errno.EMFILE, errno.ENFILE, errno.ENOBUFS, errno.EAGAIN, errno.EADDRNOTAVAIL}
+PROGRESS_INTERVAL = 0.5
+# Close open connections with a RST so scanning doesn't leave sockets in TIME_WAIT
+LINGER_RESET = struct.pack('ii', 1, 0)
+
+def parse_ports(spec):
+    """
+    The sorted port numbers of a spec such as '80,443,8000-8100', 'top100' or
+    'full' (1-65535). Raises ValueError for anything else.
+    """
+    ports = set()
+    for part in spec.replace(' ', '').split(','):
+        if not part:
+            continue
+        if part == 'top100':
+            ports.update(TOP_PORTS)
+        elif part in ('full', 'all', '-'):
+            ports.update(range(1, 65536))
+        elif '-' in part:
+            low, high = (int(value) for value in part.split('-', 1))
+            if not 1 <= low <= high <= 65535:
+                raise ValueError(f"invalid port range: {part}")
+            ports.update(range(low, high + 1))
+        else:
+            port = int(part)
+            if not 1 <= port <= 65535:
+                raise ValueError(f"invalid port: {part}")
+            ports.add(port)
+    if not ports:
+        raise ValueError("no ports given")
+    return sorted(ports)
+
+def max_usable_concurrency(requested):
+    """Caps the number of simultaneous sockets to what the open-file limit allows."""
+    if resource is None:
+        return requested
+    soft, _ = resource.getrlimit(resource.RLIMIT_NOFILE)
+    if soft == resource.RLIM_INFINITY:
+        return requested
+    return max(1, min(requested, soft - RESERVED_FDS))
+
+def format_endpoint(host, port):
+    return f"[{host}]:{port}" if ':' in host else f"{host}:{port}"
+
+class PortScanner:
+    """
+    An unprivileged TCP connect scanner on asyncio. Targets are visited port by
+    port across all hosts, so consecutive probes hit different machines.
+
+    Concurrency adapts like TCP congestion control: it starts at
+    INITIAL_CONCURRENCY, doubles after each round of probes that ran into no
+    local resource errors, and is halved (and stops doubling) as soon as one
+    happens, e.g. running out of file descriptors or ephemeral ports. The
+    probe that hit the error is retried. host_rate limits how many connections
+    per second any single host sees.
+    """
+    def __init__(self, hosts, ports, timeout=DEFAULT_TIMEOUT, max_concurrency=DEFAULT_CONCURRENCY,
+                 host_rate=DEFAULT_HOST_RATE, on_open=None, should_stop=None, progress=None):
+        self.hosts = hosts
+        self.ports = ports
+        self.timeout = timeout
+        self.max_concurrency = max_usable_concurrency(max_concurrency)
+        self.limit = min(INITIAL_CONCURRENCY, self.max_concurrency)
+        self.host_interval = 1 / host_rate if host_rate else 0
+        self.on_open = on_open
+        self.should_stop = should_stop
+        self.progress = progress
+        self.total = len(hosts) * len(ports)
+        self.scanned = 0
+        self.open_count = 0
+        self.resource_errors = 0
+        self.peak_concurrency = self.limit
+        self.slow_start = True
+        self.round_completed = 0
+        self.next_host_slot = {}
+        self.retry = []
+        self.stopped = False
+
+    def targets(self):
+        for port in self.ports:
+            for host in self.hosts:
+                yield host, port
+
+    def run(self):
+        """Scans every (host, port) and returns the number of open ports found."""
+        asyncio.run(self.scan())
+        return self.open_count
+
+    async def scan(self):
+        self.loop = asyncio.get_running_loop()
+        self.pending = self.targets()
+        self.workers = 0
+        self.done = asyncio.Event()
+        self.last_progress = time.monotonic()
+        if self.total == 0:
+            return
+        self.spawn_workers()
+        await self.done.wait()
+        if self.progress:
+            self.progress(self.scanned, self.total, self.open_count)
+
+    def spawn_workers(self):
+        while self.workers < self.limit:
+            self.workers += 1
+            self.loop.create_task(self.worker())
+
+    async def worker(self):
+        try:
+            while self.workers <= self.limit and not self.stopped:
+                target = self.retry.pop() if self.retry else next(self.pending, None)
+                if target is None:
+                    break
+                if await self.probe(*target):
+                    self.scanned += 1
+                    self.on_probe_completed()
+                else:
+                    self.retry.append(target)
+        finally:
+            self.workers -= 1
+            if self.workers == 0:
+                self.done.set()
+
+    def on_probe_completed(self):
+        self.round_completed += 1
+        if self.round_completed >= self.limit and self.limit < self.max_concurrency:
+            # A full round without resource errors: open up
+            self.round_completed = 0
+            growth = self.limit if self.slow_start else max(1, self.limit // 10)
+            self.limit = min(self.limit + growth, self.max_concurrency)
+            self.peak_concurrency = max(self.peak_concurrency, self.limit)
+            self.spawn_workers()
+        now = time.monotonic()
+        if now - self.last_progress >= PROGRESS_INTERVAL:
+            self.last_progress = now
+            if self.should_stop and self.should_stop():
+                self.stopped = True
+            if self.progress:
+                self.progress(self.scanned, self.total, self.open_count)
+
+    def on_resource_error(self):
+        self.resource_errors += 1
+        self.slow_start = False
+        self.round_completed = 0
+        self.limit = max(1, self.limit // 2)
+
+    async def wait_for_host(self, host):
+        if not self.host_interval:
+            return
+        now = self.loop.time()
+        slot = max(now, self.next_host_slot.get(host, now))
+        self.next_host_slot[host] = slot + self.host_interval
+        if slot > now:
+            await asyncio.sleep(slot - now)
+
+    async def connect(self, sock, address):
+        """
+        Connects a non-blocking socket; returns False on timeout and raises
+        OSError if the connection fails. Waits on the selector directly rather
+        than through sock_connect() and wait_for(), which cost a task and
+        several callbacks per probe and would dominate a fast scan.
+        """
+        try:
+            sock.connect(address)
+            return True
+        except BlockingIOError:
+            pass
+        future = self.loop.create_future()
+        def settle(result):
+            if not future.done():
+                future.set_result(result)
+        try:
+            self.loop.add_writer(sock.fileno(), settle, True)
+        except NotImplementedError:
+            # Event loops without add_writer(), e.g. the proactor loop on Windows
+            try:
+                await asyncio.wait_for(self.loop.sock_connect(sock, address), self.timeout)
+                return True
+            except asyncio.TimeoutError:
+                return False
+        timer = self.loop.call_later(self.timeout, settle, False)
+        try:
+            connected = await future
+        finally:
+            timer.cancel()
+            self.loop.remove_writer(sock.fileno())
+        if connected:
+            error = sock.getsockopt(socket.SOL_SOCKET, socket.SO_ERROR)
+            if error:
+                raise OSError(error, os.strerror(error))
+        return connected
+
+    async def probe(self, host, port):
+        """
+        Tries to connect to host:port. Returns False if the attempt failed for
+        local reasons and should be retried, True once the port's state is known.
+        """
+        await self.wait_for_host(host)
+        try:
+            sock = socket.socket(socket.AF_INET6 if ':' in host else socket.AF_INET, socket.SOCK_STREAM)
+        except OSError as e:
+            if e.errno in RESOURCE_ERRNOS:
+                self.on_resource_error()
+                await asyncio.sleep(0.05)
+                return False
+            raise
+        sock.setblocking(False)
+        try:
+            connected = await self.connect(sock, (host, port))
+        except OSError as e:
+            sock.close()
+            if e.errno in RESOURCE_ERRNOS:
+                self.on_resource_error()
+                await asyncio.sleep(0.05)
+                return False
+            return True # Refused, unreachable, ...
+        if not connected:
+            sock.close()
+            return True # Filtered, or the host is down
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_LINGER, LINGER_RESET)
+        sock.close()
+        self.open_count += 1
+        if self.on_open:
+            self.on_open(host, port)
+        return True
+
+def run_port_scan(input_file_path, output_file_path, ports=DEFAULT_PORTS, concurrency=DEFAULT_CONCURRENCY,
+                  host_rate=DEFAULT_HOST_RATE, timeout=DEFAULT_TIMEOUT, should_stop=None, progress=None):
+    """
+    TCP connect scans every IP in the input file (one per line, like scopeips)
+    on the given ports, without root. Open ports are written to the output
+    file as they are found, one ip:port per line like naabu's output, so the
+    steps that read naabu_out can read this file too.
+
+    progress(scanned, total, open_count) is called about every
+    PROGRESS_INTERVAL seconds, and should_stop() returning True ends the scan
+    early with the results so far.
+
+    Returns:
+        tuple: A tuple containing a boolean for success and a message.
+    """
+    try:
+        port_list = parse_ports(ports)
+    except ValueError as e:
+        return False, f"Invalid ports '{ports}': {e}"
+    try:
+        with open(input_file_path, 'r') as file:
+            entries = [line.strip() for line in file if line.strip()]
+    except FileNotFoundError:
+        return False, f"Input file for port scan not found: {input_file_path}"
+
+    hosts = []
+    for entry in dict.fromkeys(entries):
+        try:
+            hosts.append(str(ipaddress.ip_address(entry)))
+        except ValueError:
+            print(f"Skipping invalid IP in port scan input: {entry}")
+
+    started = time.monotonic()
+    with open(output_file_path, 'w') as out_file:
+        def write_open(host, port):
+            out_file.write(format_endpoint(host, port) + "\n")
+            out_file.flush()
+
+        scanner = PortScanner(hosts, port_list, timeout=timeout, max_concurrency=concurrency, host_rate=host_rate,
+                              on_open=write_open, should_stop=should_stop, progress=progress)
+        scanner.run()
+
+    elapsed = time.monotonic() - started
+    stopped = " (stopped early)" if scanner.stopped else ""
+    return True, (f"Found {scanner.open_count} open ports on {len(hosts)} hosts in {elapsed:.1f}s "
+                  f"({scanner.scanned / max(elapsed, 1e-6):.0f} probes/s, up to {scanner.peak_concurrency} at once){stopped}.")
@@ -0,0 +1,21 @@
+import os
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+_parse_pool = None
+
+def get_parse_pool():
+    """
+    Returns the shared process pool used for parsing, creating it on first use.
+    Workers are spawned rather than forked because the GUI process is threaded.
+    """
+    global _parse_pool
+    if _parse_pool is None:
+        _parse_pool = ProcessPoolExecutor(max_workers=os.cpu_count() or 1, mp_context=multiprocessing.get_context('spawn'))
+    return _parse_pool
+
+def shutdown_parse_pool():
+    global _parse_pool
+    if _parse_pool is not None:
+        _parse_pool.shutdown(wait=False, cancel_futures=True)
+        _parse_pool = None
@@ -0,0 +1,180 @@
+import csv
+import html
+import json
+import os
+
+try:
+    import orjson
+    json_loads = orjson.loads
+except ImportError:
+    json_loads = json.loads
+
+# Stands in for {URL} while a template is compiled, then split on
+URL_PLACEHOLDER = "BULKREPORTURLPLACEHOLDER"
+FINDING_FIELDS = ('category', 'url', 'notes')
+HTML_HEADER = """<!DOCTYPE html>
+<html>
+<head>
+<meta charset="utf-8">
+<title>{title}</title>
+<style>
+body {{ font-family: 'Segoe UI', Arial, sans-serif; max-width: 960px; margin: auto; }}
+h2 {{ border-bottom: 1px solid #ccc; padding-bottom: 4px; }}
+pre, code {{ background: #f4f4f4; }}
+</style>
+</head>
+<body>
+<h1>{title}</h1>
+"""
+HTML_FOOTER = "</body>\n</html>\n"
+
+def output_format(path):
+    """'html' for .html/.htm output paths, 'markdown' for anything else."""
+    return 'html' if os.path.splitext(path)[1].lower() in ('.html', '.htm') else 'markdown'
+
+def read_findings(path):
+    """
+    Yields findings as {'category', 'url', 'notes'} dicts from a CSV file with
+    those column headers or from a JSONL file of objects with those keys, one
+    at a time. Lines that aren't valid JSON objects are yielded as None.
+    """
+    if os.path.splitext(path)[1].lower() in ('.jsonl', '.json'):
+        with open(path, 'rb') as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                try:
+                    record = json_loads(line)
+                except ValueError:
+                    yield None
+                    continue
+                if not isinstance(record, dict):
+                    yield None
+                    continue
+                yield {field: str(record.get(field) or '').strip() for field in FINDING_FIELDS}
+    else:
+        with open(path, newline='', encoding='utf-8', errors='replace') as f:
+            reader = csv.reader(f)
+            header = next(reader, None)
+            if header is None:
+                return
+            columns = {name.strip().lower(): i for i, name in enumerate(header)}
+            indexes = [(field, columns.get(field)) for field in FINDING_FIELDS]
+            for row in reader:
+                if not row:
+                    continue
+                yield {field: row[i].strip() if i is not None and i < len(row) else '' for field, i in indexes}
+
+class CompiledTemplate:
+    """
+    A report template with everything that doesn't depend on the finding
+    rendered once: the description is pre-split around its {URL} placeholder
+    and the other sections are already converted to the output format.
+    """
+    def __init__(self, template, convert):
+        description = template.get('description') or ''
+        try:
+            description = description.format(URL=URL_PLACEHOLDER)
+        except (KeyError, IndexError, ValueError):
+            # Stray braces in the template; substitute {URL} only
+            description = description.replace('{URL}', URL_PLACEHOLDER)
+        self.description_parts = convert(description).split(URL_PLACEHOLDER)
+        self.impact = convert(template.get('impact') or '')
+        self.validation_steps = convert(template.get('validation_steps') or '')
+        self.fix_recommendation = convert(template.get('fix_recommendation') or '')
+
+    def description(self, url):
+        return url.join(self.description_parts)
+
+class BulkReportRenderer:
+    """
+    Renders findings one at a time into Markdown or HTML sections using the
+    report templates (rows of the report_templates table). A single markdown
+    converter is shared by every finding, and findings whose category has no
+    template are counted in unknown_categories instead of rendered.
+    """
+    def __init__(self, templates, fmt='markdown'):
+        self.fmt = fmt
+        if fmt == 'html':
+            import markdown
+            self.markdown = markdown.Markdown()
+            convert = self.to_html
+        else:
+            convert = str
+        self.templates = {template['category']: CompiledTemplate(template, convert) for template in templates}
+        self.rendered = 0
+        self.malformed = 0
+        self.unknown_categories = {}
+
+    def to_html(self, text):
+        return self.markdown.reset().convert(text)
+
+    def header(self, title):
+        if self.fmt == 'html':
+            return HTML_HEADER.format(title=html.escape(title))
+        return f"# {title}\n\n"
+
+    def footer(self):
+        return HTML_FOOTER if self.fmt == 'html' else ""
+
+    def render(self, finding):
+        """Returns the finding's section of the report, or None if it can't be rendered."""
+        if finding is None:
+            self.malformed += 1
+            return None
+        template = self.templates.get(finding['category'])
+        if template is None:
+            category = finding['category'] or '(none)'
+            self.unknown_categories[category] = self.unknown_categories.get(category, 0) + 1
+            return None
+        self.rendered += 1
+        url = finding['url'] or '{URL}'
+        notes = finding['notes']
+        if self.fmt == 'html':
+            escaped_url = html.escape(url)
+            impact = self.to_html(notes) if notes else template.impact
+            return (f"<h2>{self.rendered}. {html.escape(finding['category'])}</h2>\n"
+                    f"<p><b>URL:</b> <code>{escaped_url}</code></p>\n"
+                    f"<h3>Description</h3>\n{template.description(escaped_url)}\n"
+                    f"<h3>Impact</h3>\n{impact}\n"
+                    f"<h3>Validation Steps</h3>\n{template.validation_steps}\n"
+                    f"<h3>Recommended Fix</h3>\n{template.fix_recommendation}\n")
+        return (f"## {self.rendered}. {finding['category']}\n\n"
+                f"**URL:** `{url}`\n\n"
+                f"### Description\n\n{template.description(url)}\n\n"
+                f"### Impact\n\n{notes or template.impact}\n\n"
+                f"### Validation Steps\n\n{template.validation_steps}\n\n"
+                f"### Recommended Fix\n\n{template.fix_recommendation}\n\n")
+
+    def summary(self):
+        lines = [f"Rendered {self.rendered} findings."]
+        if self.unknown_categories:
+            skipped = ", ".join(f"{category} ({count})" for category, count in sorted(self.unknown_categories.items()))
+            lines.append(f"Skipped {sum(self.unknown_categories.values())} with no matching template: {skipped}")
+        if self.malformed:
+            lines.append(f"Skipped {self.malformed} malformed lines.")
+        return "\n".join(lines)
+
+def write_bulk_report(findings_path, output_path, templates, progress=None, should_stop=None, progress_every=500):
+    """
+    Streams every finding in findings_path through the templates into a single
+    report at output_path (HTML or Markdown, by extension), holding only one
+    finding in memory at a time. progress(count) is called every
+    progress_every findings; should_stop() returning True ends the report early.
+    Returns the BulkReportRenderer, whose counters describe what was written.
+    """
+    renderer = BulkReportRenderer(templates, output_format(output_path))
+    title = f"Findings Report: {os.path.basename(findings_path)}"
+    with open(output_path, 'w', encoding='utf-8') as out:
+        out.write(renderer.header(title))
+        for count, finding in enumerate(read_findings(findings_path), 1):
+            section = renderer.render(finding)
+            if section is not None:
+                out.write(section)
+            if count % progress_every == 0:
+                if progress:
+                    progress(count)
+                if should_stop and should_stop():
+                    break
+        out.write(renderer.footer())
+    return renderer
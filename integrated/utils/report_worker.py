@@ -0,0 +1,29 @@
+from PyQt5.QtCore import QThread, pyqtSignal
+from utils.report_batch import write_bulk_report
+
+class BulkReportWorker(QThread):
+    """Worker thread that renders a whole findings file into one report."""
+    progress_updated = pyqtSignal(int) # findings read so far
+    report_ready = pyqtSignal(object) # the BulkReportRenderer, for its counts
+    error = pyqtSignal(str)
+
+    def __init__(self, findings_path, output_path, templates, parent=None):
+        super().__init__(parent)
+        self.findings_path = findings_path
+        self.output_path = output_path
+        self.templates = templates
+        self.is_running = True
+
+    def stop(self):
+        self.is_running = False
+
+    def run(self):
+        try:
+            renderer = write_bulk_report(
+                self.findings_path, self.output_path, self.templates,
+                progress=self.progress_updated.emit, should_stop=lambda: not self.is_running
+            )
+            if self.is_running:
+                self.report_ready.emit(renderer)
+        except Exception as e:
+            self.error.emit(f"Failed to generate report: {e}")
@@ -0,0 +1,47 @@
+from array import array
+from PyQt5.QtCore import QThread, pyqtSignal
+from utils.url_classifier import HIGH_RISK, INTERESTING, SENSITIVE_EXTENSION
+
+class RiskAnalysisWorker(QThread):
+    """
+    Worker thread that classifies the URLs of an HttpxDataset and streams the
+    matching row numbers back in batches, one array per risk category.
+    """
+    batch_ready = pyqtSignal(object, object, object) # high risk, interesting, sensitive extension rows
+    progress_updated = pyqtSignal(int, int)
+    error = pyqtSignal(str)
+    finished = pyqtSignal()
+
+    BATCH_SIZE = 5000
+
+    def __init__(self, dataset, classifier, parent=None):
+        super().__init__(parent)
+        self.dataset = dataset
+        self.classifier = classifier
+        self.is_running = True
+
+    def stop(self):
+        self.is_running = False
+
+    def run(self):
+        # Rows appended while we run are left for the next analysis
+        total = len(self.dataset)
+        try:
+            for start in range(0, total, self.BATCH_SIZE):
+                if not self.is_running:
+                    break
+                high_risk, interesting, sensitive = array('q'), array('q'), array('q')
+                for row in range(start, min(start + self.BATCH_SIZE, total)):
+                    flags = self.classifier.classify(self.dataset.url(row))
+                    # A high-risk URL is not repeated in the interesting list
+                    if flags & HIGH_RISK:
+                        high_risk.append(row)
+                    elif flags & INTERESTING:
+                        interesting.append(row)
+                    if flags & SENSITIVE_EXTENSION:
+                        sensitive.append(row)
+                self.batch_ready.emit(high_risk, interesting, sensitive)
+                self.progress_updated.emit(min(start + self.BATCH_SIZE, total), total)
+        except Exception as e:
+            self.error.emit(f"Risk analysis failed: {e}")
+        self.finished.emit()
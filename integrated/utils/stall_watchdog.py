@@ -0,0 +1,113 @@
+import os
+import sys
+import threading
+import time
+import traceback
+from PyQt5.QtCore import QObject, QTimer
+
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_THRESHOLD_MS = 200
+HEARTBEAT_MS = 50
+
+def call_site(stack):
+    """
+    The innermost frame of a stack that belongs to this app, which is what a
+    stall gets attributed to. Falls back to the innermost frame of all.
+    """
+    for frame in reversed(stack):
+        if frame.filename.startswith(APP_DIR) and not frame.filename.endswith("stall_watchdog.py"):
+            return (os.path.relpath(frame.filename, APP_DIR), frame.lineno, frame.name)
+    frame = stack[-1]
+    return (frame.filename, frame.lineno, frame.name)
+
+class StallWatchdog(QObject):
+    """
+    Detects when the Qt main loop stops processing events. A timer on the main
+    thread bumps a heartbeat every HEARTBEAT_MS; a plain Python thread checks it
+    and, once the main thread has gone threshold_ms without a beat, grabs the
+    main thread's Python stack with sys._current_frames(). When the loop comes
+    back the stall's length is added to the totals for its call site.
+    """
+    def __init__(self, threshold_ms=DEFAULT_THRESHOLD_MS, parent=None):
+        super().__init__(parent)
+        self.threshold = threshold_ms / 1000
+        self.lock = threading.Lock()
+        self.last_beat = time.perf_counter()
+        self.pending_stack = None # Captured for the stall in progress, if any
+        # call site -> {'count', 'total', 'max', 'stack'}
+        self.stalls = {}
+        self.stopped = threading.Event()
+        self.thread = None
+        self.heartbeat = QTimer(self)
+        self.heartbeat.setInterval(HEARTBEAT_MS)
+        self.heartbeat.timeout.connect(self.beat)
+
+    def start(self):
+        self.last_beat = time.perf_counter()
+        self.stopped.clear()
+        self.heartbeat.start()
+        self.thread = threading.Thread(target=self.watch, name="stall-watchdog", daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        self.heartbeat.stop()
+        self.stopped.set()
+        if self.thread is not None:
+            self.thread.join()
+            self.thread = None
+
+    def beat(self):
+        now = time.perf_counter()
+        with self.lock:
+            gap = now - self.last_beat
+            self.last_beat = now
+            stack, self.pending_stack = self.pending_stack, None
+        if stack is not None:
+            # The gap includes one normal heartbeat interval
+            self.record(stack, max(gap - HEARTBEAT_MS / 1000, 0))
+
+    def watch(self):
+        main_id = threading.main_thread().ident
+        while not self.stopped.wait(HEARTBEAT_MS / 1000):
+            with self.lock:
+                beat = self.last_beat
+                if self.pending_stack is not None or time.perf_counter() - beat < self.threshold:
+                    continue
+            frame = sys._current_frames().get(main_id)
+            if frame is None:
+                continue
+            stack = traceback.extract_stack(frame)
+            del frame
+            with self.lock:
+                # Only keep it if the main thread is still stuck in the same stall
+                if self.last_beat == beat:
+                    self.pending_stack = stack
+
+    def record(self, stack, seconds):
+        with self.lock:
+            entry = self.stalls.setdefault(call_site(stack), {'count': 0, 'total': 0.0, 'max': 0.0, 'stack': stack})
+            entry['count'] += 1
+            entry['total'] += seconds
+            if seconds >= entry['max']:
+                entry['max'] = seconds
+                entry['stack'] = stack
+
+    def clear(self):
+        with self.lock:
+            self.stalls.clear()
+
+    def report(self):
+        """The stalls seen so far, worst call site (by total blocked time) first."""
+        with self.lock:
+            entries = sorted(self.stalls.items(), key=lambda item: item[1]['total'], reverse=True)
+        if not entries:
+            return f"No main-thread stalls over {self.threshold * 1000:.0f} ms so far."
+        lines = [f"Main-thread stalls over {self.threshold * 1000:.0f} ms, by call site:", ""]
+        for (filename, lineno, name), entry in entries:
+            lines.append(f"{filename}:{lineno} in {name}")
+            lines.append(f"  {entry['count']} stalls, {entry['total'] * 1000:.0f} ms total, "
+                         f"{entry['max'] * 1000:.0f} ms worst")
+            lines.append("  Stack of the worst one:")
+            lines.extend("  " + line for line in "".join(traceback.format_list(entry['stack'])).splitlines())
+            lines.append("")
+        return "\n".join(lines)
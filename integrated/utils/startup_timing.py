@@ -0,0 +1,38 @@
+import sys
+import time
+from contextlib import contextmanager
+
+# Taken when this module is first imported, which main.py does before anything else
+START = time.perf_counter()
+phases = []
+first_paint = None
+# Set by main.py for --startup-timing
+enabled = False
+
+@contextmanager
+def timed(label):
+    """Records how long the enclosed block (an import, a tab construction, ...) took."""
+    began = time.perf_counter()
+    try:
+        yield
+    finally:
+        phases.append((label, time.perf_counter() - began))
+        if enabled and first_paint is not None:
+            # Lazily built tabs after startup are reported as they happen
+            print(f"{label}: {phases[-1][1] * 1000:.1f} ms", file=sys.stderr)
+
+def mark_first_paint():
+    global first_paint
+    if first_paint is None:
+        first_paint = time.perf_counter() - START
+
+def report():
+    """Returns the timings gathered so far as a printable table."""
+    lines = ["Startup timing:"]
+    lines.extend(f"  {label:<40} {seconds * 1000:8.1f} ms" for label, seconds in phases)
+    if first_paint is not None:
+        lines.append(f"  {'time to first paint':<40} {first_paint * 1000:8.1f} ms")
+    return "\n".join(lines)
+
+def print_report():
+    print(report(), file=sys.stderr)
@@ -0,0 +1,253 @@
+import asyncio
+import ipaddress
+import json
+import re
+import sqlite3
+import ssl
+import time
+from utils.db import cache_path
+from utils.port_scanner import parse_ports
+
+DEFAULT_TLS_PORTS = "443,8443"
+DEFAULT_CONCURRENCY = 100
+DEFAULT_TIMEOUT = 5.0
+CACHE_FILE = "tls_cache.db"
+# Certificates rarely change; endpoints that didn't answer are tried again sooner
+CACHE_TTL = 7 * 24 * 3600
+FAILED_CACHE_TTL = 24 * 3600
+PROGRESS_INTERVAL = 0.5
+HOSTNAME = re.compile(r'^(?=.{1,253}$)([a-z0-9_](?:[a-z0-9_-]{0,61}[a-z0-9])?\.)+[a-z][a-z0-9-]{0,62}$')
+
+OID_COMMON_NAME = b'\x55\x04\x03'
+OID_SUBJECT_ALT_NAME = b'\x55\x1d\x11'
+TAG_SEQUENCE = 0x30
+TAG_EXTENSIONS = 0xa3 # [3] in TBSCertificate
+TAG_DNS_NAME = 0x82 # dNSName in GeneralName
+
+def der_items(data, start=0, end=None):
+    """Yields (tag, value start, value end) for each DER element in data[start:end]."""
+    end = len(data) if end is None else end
+    pos = start
+    while pos < end:
+        tag = data[pos]
+        length = data[pos + 1]
+        pos += 2
+        if length & 0x80:
+            size = length & 0x7f
+            length = int.from_bytes(data[pos:pos + size], 'big')
+            pos += size
+        if pos + length > end:
+            raise ValueError("truncated DER element")
+        yield tag, pos, pos + length
+        pos += length
+
+def certificate_names(der):
+    """
+    The subject common name and the DNS subject alternative names of a
+    DER-encoded X.509 certificate. Only the handful of fields needed are
+    decoded, so no crypto library is required.
+    """
+    names = []
+    _, cert_start, cert_end = next(der_items(der))
+    _, tbs_start, tbs_end = next(der_items(der, cert_start, cert_end))
+    fields = list(der_items(der, tbs_start, tbs_end))
+    if fields and fields[0][0] == 0xa0:
+        fields = fields[1:] # Explicit version
+    # serial, signature, issuer, validity, subject, subjectPublicKeyInfo, [extensions]
+    if len(fields) > 4 and fields[4][0] == TAG_SEQUENCE:
+        for _, rdn_start, rdn_end in der_items(der, fields[4][1], fields[4][2]):
+            for _, attr_start, attr_end in der_items(der, rdn_start, rdn_end):
+                (_, oid_start, oid_end), (_, value_start, value_end) = list(der_items(der, attr_start, attr_end))[:2]
+                if der[oid_start:oid_end] == OID_COMMON_NAME:
+                    names.append(der[value_start:value_end].decode('utf-8', 'replace'))
+    for tag, ext_start, ext_end in fields[6:]:
+        if tag != TAG_EXTENSIONS:
+            continue
+        _, list_start, list_end = next(der_items(der, ext_start, ext_end))
+        for _, item_start, item_end in der_items(der, list_start, list_end):
+            parts = list(der_items(der, item_start, item_end))
+            if der[parts[0][1]:parts[0][2]] != OID_SUBJECT_ALT_NAME:
+                continue
+            _, value_start, value_end = parts[-1] # After the optional 'critical' flag
+            _, names_start, names_end = next(der_items(der, value_start, value_end))
+            for name_tag, name_start, name_end in der_items(der, names_start, names_end):
+                if name_tag == TAG_DNS_NAME:
+                    names.append(der[name_start:name_end].decode('ascii', 'replace'))
+    return names
+
+def clean_hostnames(names):
+    """
+    Lower-cased, de-duplicated hostnames from certificate names. Wildcards
+    become their parent domain, and common names that aren't hostnames
+    (product names, 'localhost', IP addresses) are dropped.
+    """
+    hostnames = []
+    for name in names:
+        name = name.strip().lower().rstrip('.')
+        if name.startswith('*.'):
+            name = name[2:]
+        if HOSTNAME.match(name) and name not in hostnames:
+            hostnames.append(name)
+    return hostnames
+
+def make_tls_context():
+    """A client context that accepts any certificate and as many old servers as OpenSSL allows."""
+    context = ssl.SSLContext(ssl.PROTOCOL_TLS_CLIENT)
+    context.check_hostname = False
+    context.verify_mode = ssl.CERT_NONE
+    try:
+        context.minimum_version = ssl.TLSVersion.MINIMUM_SUPPORTED
+        context.set_ciphers('ALL:@SECLEVEL=0')
+    except (ValueError, ssl.SSLError):
+        pass
+    return context
+
+class TlsNameCache:
+    """
+    Remembers the certificate names seen per ip:port across runs, in
+    CACHE_FILE in the user's cache directory unless another path is given,
+    so a rerun only contacts endpoints whose entry has expired.
+    """
+    def __init__(self, path=None):
+        self.conn = sqlite3.connect(path or cache_path(CACHE_FILE))
+        self.conn.execute("""
+        CREATE TABLE IF NOT EXISTS tls_names (
+            ip TEXT NOT NULL, port INTEGER NOT NULL, names TEXT, error TEXT,
+            fetched_at REAL NOT NULL, PRIMARY KEY (ip, port) )""")
+
+    def lookup(self, endpoints, now=None):
+        """{(ip, port): names or None for a failed fetch} for the endpoints with a fresh entry."""
+        now = time.time() if now is None else now
+        found = {}
+        wanted = set(endpoints)
+        ips = sorted({ip for ip, _ in wanted})
+        # SQLite caps the number of bound parameters per statement
+        for i in range(0, len(ips), 500):
+            chunk = ips[i:i + 500]
+            rows = self.conn.execute(
+                f"SELECT ip, port, names, fetched_at FROM tls_names WHERE ip IN ({','.join('?' * len(chunk))})", chunk
+            )
+            for ip, port, names, fetched_at in rows:
+                ttl = CACHE_TTL if names is not None else FAILED_CACHE_TTL
+                if (ip, port) in wanted and now - fetched_at < ttl:
+                    found[(ip, port)] = json.loads(names) if names is not None else None
+        return found
+
+    def store(self, results):
+        """Saves {(ip, port): (names or None, error)}."""
+        now = time.time()
+        self.conn.executemany(
+            "INSERT OR REPLACE INTO tls_names (ip, port, names, error, fetched_at) VALUES (?, ?, ?, ?, ?)",
+            [(ip, port, json.dumps(names) if names is not None else None, error, now)
+             for (ip, port), (names, error) in results.items()]
+        )
+        self.conn.commit()
+
+    def close(self):
+        self.conn.close()
+
+async def fetch_certificate_names(ip, port, context, timeout):
+    """Returns (names, None) for the endpoint's certificate, or (None, reason) if there isn't one."""
+    try:
+        _, writer = await asyncio.wait_for(asyncio.open_connection(ip, port, ssl=context), timeout)
+    except asyncio.TimeoutError:
+        return None, "timeout"
+    except (OSError, ssl.SSLError) as e:
+        return None, type(e).__name__
+    try:
+        der = writer.get_extra_info('ssl_object').getpeercert(binary_form=True)
+    finally:
+        writer.transport.abort()
+    if not der:
+        return None, "no certificate"
+    try:
+        return certificate_names(der), None
+    except (ValueError, IndexError, StopIteration):
+        return None, "unparsable certificate"
+
+async def harvest(endpoints, concurrency, timeout, should_stop=None, progress=None):
+    """Fetches the certificate names of (ip, port) endpoints, `concurrency` at a time."""
+    context = make_tls_context()
+    results = {}
+    pending = iter(endpoints)
+    last_progress = time.monotonic()
+    stopped = False
+
+    async def worker():
+        nonlocal last_progress, stopped
+        for endpoint in pending:
+            if stopped:
+                return
+            results[endpoint] = await fetch_certificate_names(*endpoint, context, timeout)
+            now = time.monotonic()
+            if now - last_progress >= PROGRESS_INTERVAL:
+                last_progress = now
+                stopped = bool(should_stop and should_stop())
+                if progress:
+                    progress(len(results), len(endpoints))
+
+    await asyncio.gather(*(worker() for _ in range(max(1, min(concurrency, len(endpoints))))))
+    return results
+
+def read_endpoints(input_file_path, ports):
+    """(ip, port) pairs for each IP in the file on every port, or the given port for ip:port lines."""
+    endpoints = []
+    with open(input_file_path, 'r') as file:
+        for line in file:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                endpoints.extend((str(ipaddress.ip_address(line)), port) for port in ports)
+                continue
+            except ValueError:
+                pass
+            host, _, port = line.rpartition(':')
+            try:
+                endpoints.append((str(ipaddress.ip_address(host.strip('[]'))), int(port)))
+            except ValueError:
+                print(f"Skipping invalid entry in TLS name input: {line}")
+    return list(dict.fromkeys(endpoints))
+
+def run_tls_names(input_file_path, output_file_path, ports=DEFAULT_TLS_PORTS, concurrency=DEFAULT_CONCURRENCY,
+                  timeout=DEFAULT_TIMEOUT, refresh=False, should_stop=None, progress=None):
+    """
+    Connects to every IP of the input file (such as scopeips) on the TLS
+    ports, reads each certificate's subject CN and DNS SANs without checking
+    trust, and writes the unique hostnames to the output file, ready for
+    run_domain_enum. Lines of the form ip:port are only tried on that port.
+    Results are cached per ip:port across runs unless refresh is set.
+
+    Returns:
+        tuple: A tuple containing a boolean for success and a message.
+    """
+    try:
+        port_list = parse_ports(ports)
+    except ValueError as e:
+        return False, f"Invalid ports '{ports}': {e}"
+    try:
+        endpoints = read_endpoints(input_file_path, port_list)
+    except FileNotFoundError:
+        return False, f"Input file for TLS names not found: {input_file_path}"
+
+    cache = TlsNameCache()
+    try:
+        cached = {} if refresh else cache.lookup(endpoints)
+        to_fetch = [endpoint for endpoint in endpoints if endpoint not in cached]
+        fetched = asyncio.run(harvest(to_fetch, concurrency, timeout, should_stop, progress)) if to_fetch else {}
+        cache.store(fetched)
+    finally:
+        cache.close()
+
+    names_by_endpoint = dict(cached)
+    names_by_endpoint.update((endpoint, names) for endpoint, (names, _) in fetched.items())
+    hostnames = sorted(set(clean_hostnames(
+        name for names in names_by_endpoint.values() if names for name in names
+    )))
+    with open(output_file_path, 'w') as out_file:
+        for hostname in hostnames:
+            out_file.write(f"{hostname}\n")
+
+    with_certificates = sum(1 for names in names_by_endpoint.values() if names is not None)
+    return True, (f"Found {len(hostnames)} hostnames in {with_certificates} certificates from {len(endpoints)} "
+                  f"endpoints ({len(cached)} cached, {len(fetched)} contacted).")
@@ -0,0 +1,67 @@
+import re
+
+# Category flags returned by UrlClassifier.classify()
+HIGH_RISK = 1
+INTERESTING = 2
+SENSITIVE_EXTENSION = 4
+
+SENSITIVE_EXTENSIONS = (
+    ".xls", ".xml", ".xlsx", ".json", ".pdf", ".sql", ".doc", ".docx",
+    ".pptx", ".txt", ".zip", ".tar.gz", ".tgz", ".bak", ".7z", ".rar",
+    ".log", ".cache", ".secret", ".db", ".backup", ".yml", ".gz",
+    ".config", ".csv", ".yaml", ".md", ".md5", ".tar", ".xz", ".7zip",
+    ".p12", ".pem", ".key", ".crt", ".csr", ".sh", ".pl", ".py",
+    ".java", ".class", ".jar", ".war", ".ear", ".sqlitedb", ".sqlite3",
+    ".dbf", ".db3", ".accdb", ".mdb", ".sqlcipher", ".gitignore", ".env",
+    ".ini", ".conf", ".properties", ".plist", ".cfg"
+)
+
+def keyword_pattern(keywords):
+    """Compiles a keyword list into one alternation, or None if there is nothing to match."""
+    keywords = sorted({keyword.lower() for keyword in keywords if keyword}, key=len, reverse=True)
+    if not keywords:
+        return None
+    return re.compile('|'.join(map(re.escape, keywords)))
+
+class UrlClassifier:
+    """
+    Sorts URLs into risk categories with one lowercase pass per URL: each
+    keyword category is a single compiled regex and extensions are a set
+    lookup on the dotted suffixes of the last path segment.
+    """
+    def __init__(self, high_risk_keywords, interesting_keywords, extensions=SENSITIVE_EXTENSIONS):
+        self.high_risk = keyword_pattern(high_risk_keywords)
+        self.interesting = keyword_pattern(interesting_keywords)
+        self.extensions = frozenset(extension.lower() for extension in extensions)
+
+    def classify(self, url):
+        """Returns the HIGH_RISK | INTERESTING | SENSITIVE_EXTENSION flags that apply to a URL."""
+        url = url.lower()
+        flags = 0
+        if self.high_risk is not None and self.high_risk.search(url):
+            flags |= HIGH_RISK
+        if self.interesting is not None and self.interesting.search(url):
+            flags |= INTERESTING
+        tail = url[url.rfind('/') + 1:]
+        dot = tail.find('.')
+        while dot >= 0:
+            if tail[dot:] in self.extensions:
+                flags |= SENSITIVE_EXTENSION
+                break
+            dot = tail.find('.', dot + 1)
+        return flags
+
+    def classify_all(self, urls):
+        return [self.classify(url) for url in urls]
+
+_classifier = None
+_classifier_key = None
+
+def get_url_classifier(high_risk_keywords, interesting_keywords):
+    """Returns a classifier for the given keyword lists, compiling a new one only when they change."""
+    global _classifier, _classifier_key
+    key = (tuple(sorted(high_risk_keywords)), tuple(sorted(interesting_keywords)))
+    if key != _classifier_key:
+        _classifier = UrlClassifier(high_risk_keywords, interesting_keywords)
+        _classifier_key = key
+    return _classifier
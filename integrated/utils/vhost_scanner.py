@@ -0,0 +1,365 @@
+import asyncio
+import ipaddress
+import json
+import re
+import secrets
+import ssl
+import time
+from utils.port_scanner import parse_ports, format_endpoint
+
+DEFAULT_VHOST_PORTS = "80,443"
+# Ports spoken to over TLS; everything else is plain HTTP
+TLS_PORTS = {443, 8443, 9443}
+# Keep-alive connections per ip:port, and ip:ports scanned at once
+DEFAULT_CONNECTIONS = 16
+DEFAULT_PARALLEL_TARGETS = 4
+DEFAULT_TIMEOUT = 10.0
+# Random hostnames requested per ip:port to learn what an unknown vhost looks like
+BASELINE_SAMPLES = 3
+# Bodies are read completely to keep the connection usable, but only this much is kept
+MAX_BODY_BYTES = 1024 * 1024
+# A response whose word count is within this of a baseline's is considered the same page
+WORD_TOLERANCE = 5
+WORD_TOLERANCE_RATIO = 0.05
+PROGRESS_INTERVAL = 0.5
+TITLE = re.compile(rb'<title[^>]*>(.*?)</title>', re.IGNORECASE | re.DOTALL)
+USER_AGENT = "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0 Safari/537.36"
+
+class Response:
+    def __init__(self, status, headers, body, keep_alive):
+        self.status = status
+        self.headers = headers
+        self.body = body
+        self.keep_alive = keep_alive
+
+async def read_body(reader, length):
+    """Reads exactly `length` bytes and keeps the first MAX_BODY_BYTES."""
+    kept = await reader.readexactly(min(length, MAX_BODY_BYTES))
+    remaining = length - len(kept)
+    while remaining > 0:
+        remaining -= len(await reader.readexactly(min(remaining, 64 * 1024)))
+    return kept
+
+async def read_response(reader):
+    """Reads one HTTP/1.1 response from a stream; raises ConnectionError if the server hung up or didn't speak HTTP."""
+    try:
+        return await read_message(reader)
+    except ValueError as e:
+        # A bad chunk size, or a line longer than the stream's limit
+        raise ConnectionError(f"malformed response: {e}")
+
+async def read_message(reader):
+    while True:
+        status_line = await reader.readline()
+        if not status_line:
+            raise ConnectionError("connection closed")
+        parts = status_line.split(None, 2)
+        if len(parts) < 2 or not parts[0].startswith(b'HTTP/') or not parts[1].isdigit():
+            raise ConnectionError("not an HTTP response")
+        status = int(parts[1])
+        headers = {}
+        while True:
+            line = await reader.readline()
+            if line in (b'\r\n', b'\n', b''):
+                break
+            name, _, value = line.partition(b':')
+            headers[name.strip().lower().decode('latin-1')] = value.strip().decode('latin-1')
+        if status >= 200 or status == 101:
+            break # 1xx interim responses are followed by the real one
+
+    keep_alive = headers.get('connection', '').lower() != 'close' and parts[0] != b'HTTP/1.0'
+    if status in (204, 304) or 100 <= status < 200:
+        body = b''
+    elif 'chunked' in headers.get('transfer-encoding', '').lower():
+        chunks, size = [], 0
+        while True:
+            chunk_size = int((await reader.readline()).split(b';')[0].strip() or b'0', 16)
+            if chunk_size == 0:
+                while (await reader.readline()) not in (b'\r\n', b'\n', b''):
+                    pass # Trailers
+                break
+            chunk = await read_body(reader, chunk_size)
+            if size < MAX_BODY_BYTES:
+                chunks.append(chunk)
+                size += len(chunk)
+            await reader.readline()
+        body = b''.join(chunks)[:MAX_BODY_BYTES]
+    elif headers.get('content-length', '').isdigit():
+        body = await read_body(reader, int(headers['content-length']))
+    else:
+        # Delimited by the end of the connection
+        body = (await reader.read(MAX_BODY_BYTES))
+        keep_alive = False
+    return Response(status, headers, body, keep_alive)
+
+class KeepAliveConnection:
+    """
+    One persistent HTTP/1.1 connection to ip:port that requests are sent over
+    one after another, reconnecting whenever the server closes it. Over TLS
+    no SNI is sent, as the target is addressed by IP.
+    """
+    def __init__(self, ip, port, tls_context, timeout):
+        self.ip = ip
+        self.port = port
+        self.tls_context = tls_context
+        self.timeout = timeout
+        self.reader = self.writer = None
+        self.requests = 0
+
+    async def connect(self):
+        self.reader, self.writer = await asyncio.open_connection(
+            self.ip, self.port, ssl=self.tls_context, server_hostname='' if self.tls_context else None
+        )
+
+    def close(self):
+        if self.writer is not None:
+            self.writer.transport.abort()
+            self.reader = self.writer = None
+
+    async def get(self, host, path='/'):
+        """GETs path with the given Host header; retries once on a fresh connection if a kept-alive one was closed."""
+        request = (f"GET {path} HTTP/1.1\r\nHost: {host}\r\nUser-Agent: {USER_AGENT}\r\n"
+                   f"Accept: */*\r\nConnection: keep-alive\r\n\r\n").encode('latin-1', 'replace')
+        for attempt in range(2):
+            reused = self.writer is not None
+            try:
+                if not reused:
+                    await asyncio.wait_for(self.connect(), self.timeout)
+                self.writer.write(request)
+                response = await asyncio.wait_for(read_response(self.reader), self.timeout)
+            except (ConnectionError, asyncio.IncompleteReadError, OSError) as e:
+                self.close()
+                # Servers drop idle keep-alive connections; that's only worth one retry
+                if reused and attempt == 0:
+                    continue
+                raise ConnectionError(str(e) or type(e).__name__)
+            except asyncio.TimeoutError:
+                self.close()
+                raise
+            self.requests += 1
+            if not response.keep_alive:
+                self.close()
+            return response
+
+def page_title(body):
+    title = TITLE.search(body)
+    return title.group(1).strip().decode('utf-8', 'replace') if title else ''
+
+def fingerprint(response, host):
+    """What a response looks like with the requested hostname taken out of it."""
+    host_bytes = host.encode('latin-1', 'replace')
+    body = response.body.replace(host_bytes, b'')
+    return {
+        'status': response.status,
+        'location': response.headers.get('location', '').replace(host, '{HOST}'),
+        'title': page_title(body),
+        'words': len(body.split()),
+        'length': len(response.body),
+    }
+
+def same_page(candidate, baseline):
+    if (candidate['status'], candidate['location'], candidate['title']) != (baseline['status'], baseline['location'], baseline['title']):
+        return False
+    return abs(candidate['words'] - baseline['words']) <= max(WORD_TOLERANCE, baseline['words'] * WORD_TOLERANCE_RATIO)
+
+def make_tls_context():
+    context = ssl.SSLContext(ssl.PROTOCOL_TLS_CLIENT)
+    context.check_hostname = False
+    context.verify_mode = ssl.CERT_NONE
+    return context
+
+def baseline_hosts(ip, candidates):
+    """Hostnames that surely aren't configured: random labels under a candidate's domain and elsewhere, plus the bare IP."""
+    domains = [candidate.split('.', 1)[1] for candidate in candidates[:100] if candidate.count('.') >= 2]
+    domain = max(set(domains), key=domains.count) if domains else "example.com"
+    hosts = [f"{secrets.token_hex(6)}.{domain}" for _ in range(BASELINE_SAMPLES - 1)]
+    return hosts + [f"{secrets.token_hex(6)}.com", ip]
+
+class VhostScanner:
+    """
+    Finds name-based virtual hosts on in-scope IPs. For every ip:port a few
+    random hostnames are requested first to calibrate what the default site
+    looks like; then every candidate hostname is requested over a pool of
+    keep-alive connections and the ones whose response differs from all
+    baselines (status, redirect target, title or size) are reported.
+    """
+    def __init__(self, targets, candidates, connections=DEFAULT_CONNECTIONS, parallel_targets=DEFAULT_PARALLEL_TARGETS,
+                 timeout=DEFAULT_TIMEOUT, on_found=None, should_stop=None, progress=None):
+        self.targets = targets
+        self.candidates = candidates
+        self.connections = max(1, connections)
+        self.parallel_targets = max(1, parallel_targets)
+        self.timeout = timeout
+        self.on_found = on_found
+        self.should_stop = should_stop
+        self.progress = progress
+        self.total = len(targets) * len(candidates)
+        self.done = 0
+        self.found = 0
+        self.requests = 0
+        self.errors = 0
+        self.unreachable = []
+        self.stopped = False
+        self.last_progress = time.monotonic()
+
+    def run(self):
+        asyncio.run(self.scan())
+
+    async def scan(self):
+        self.tls_context = make_tls_context()
+        slots = asyncio.Semaphore(self.parallel_targets)
+
+        async def scan_with_slot(ip, port):
+            async with slots:
+                if not self.stopped:
+                    await self.scan_target(ip, port)
+
+        await asyncio.gather(*(scan_with_slot(ip, port) for ip, port in self.targets))
+        if self.progress:
+            self.progress(self.done, self.total, self.found)
+
+    def report_progress(self):
+        now = time.monotonic()
+        if now - self.last_progress >= PROGRESS_INTERVAL:
+            self.last_progress = now
+            if self.should_stop and self.should_stop():
+                self.stopped = True
+            if self.progress:
+                self.progress(self.done, self.total, self.found)
+
+    async def scan_target(self, ip, port):
+        tls = self.tls_context if port in TLS_PORTS else None
+        calibration = KeepAliveConnection(ip, port, tls, self.timeout)
+        baselines = []
+        try:
+            for host in baseline_hosts(ip, self.candidates):
+                baselines.append(fingerprint(await calibration.get(host), host))
+        except (ConnectionError, asyncio.TimeoutError) as e:
+            self.unreachable.append((ip, port, str(e) or "timeout"))
+            self.done += len(self.candidates)
+            return
+        finally:
+            calibration.close()
+        self.requests += len(baselines)
+
+        pending = iter(self.candidates)
+        scheme = "https" if tls else "http"
+        default_port = 443 if tls else 80
+
+        async def worker():
+            connection = KeepAliveConnection(ip, port, tls, self.timeout)
+            try:
+                for host in pending:
+                    if self.stopped:
+                        return
+                    try:
+                        response = await connection.get(host)
+                    except (ConnectionError, asyncio.TimeoutError):
+                        self.errors += 1
+                    else:
+                        self.requests += 1
+                        page = fingerprint(response, host)
+                        if not any(same_page(page, baseline) for baseline in baselines):
+                            self.found += 1
+                            if self.on_found:
+                                port_suffix = "" if port == default_port else f":{port}"
+                                self.on_found({
+                                    'url': f"{scheme}://{host}{port_suffix}/", 'host': ip, 'port': port, 'input': host,
+                                    'status_code': page['status'], 'content_length': page['length'],
+                                    'title': page_title(response.body), 'location': response.headers.get('location', ''),
+                                })
+                    self.done += 1
+                    self.report_progress()
+            finally:
+                connection.close()
+
+        await asyncio.gather(*(worker() for _ in range(min(self.connections, len(self.candidates)))))
+
+def read_lines(path):
+    with open(path, 'r', encoding='utf-8', errors='replace') as file:
+        return [line.strip() for line in file if line.strip() and not line.startswith('#')]
+
+def build_candidates(subdomains, words, domains):
+    """The collected subdomains plus word.domain for every wordlist entry and base domain, without duplicates."""
+    candidates = dict.fromkeys(name.lower().rstrip('.') for name in subdomains)
+    for domain in domains:
+        for word in words:
+            candidates.setdefault(f"{word.lower()}.{domain}", None)
+    return list(candidates)
+
+def base_domains(subdomains):
+    """The parent domains (last two labels) of a list of hostnames, most common first."""
+    counts = {}
+    for name in subdomains:
+        labels = name.lower().rstrip('.').split('.')
+        if len(labels) >= 2:
+            domain = '.'.join(labels[-2:])
+            counts[domain] = counts.get(domain, 0) + 1
+    return sorted(counts, key=counts.get, reverse=True)
+
+def read_targets(path, ports):
+    """(ip, port) for every IP in the file on every port, or just the given port for ip:port lines."""
+    targets = []
+    for line in read_lines(path):
+        try:
+            targets.extend((str(ipaddress.ip_address(line)), port) for port in ports)
+            continue
+        except ValueError:
+            pass
+        host, _, port = line.rpartition(':')
+        try:
+            targets.append((str(ipaddress.ip_address(host.strip('[]'))), int(port)))
+        except ValueError:
+            print(f"Skipping invalid entry in vhost input: {line}")
+    return list(dict.fromkeys(targets))
+
+def run_vhost_scan(input_file_path, output_file_path, subdomains_file_path=None, wordlist_path=None, domains_file_path=None,
+                   ports=DEFAULT_VHOST_PORTS, connections=DEFAULT_CONNECTIONS, parallel_targets=DEFAULT_PARALLEL_TARGETS,
+                   timeout=DEFAULT_TIMEOUT, should_stop=None, progress=None):
+    """
+    Looks for virtual hosts on every IP of the input file (such as scopeips).
+    Candidates are the hostnames of the subdomains file plus every wordlist
+    entry prefixed to each base domain (from the domains file, or else the
+    parent domains of the subdomains). Hosts that answer differently from
+    the IP's default site are written to the output file as JSON lines in
+    httpx -json form, so the Playground can open it.
+
+    Returns:
+        tuple: A tuple containing a boolean for success and a message.
+    """
+    try:
+        port_list = parse_ports(ports)
+    except ValueError as e:
+        return False, f"Invalid ports '{ports}': {e}"
+    try:
+        targets = read_targets(input_file_path, port_list)
+        subdomains = read_lines(subdomains_file_path) if subdomains_file_path else []
+        words = read_lines(wordlist_path) if wordlist_path else []
+        domains = read_lines(domains_file_path) if domains_file_path else base_domains(subdomains)
+    except FileNotFoundError as e:
+        return False, f"Input file for vhost scan not found: {e.filename}"
+    candidates = build_candidates(subdomains, words, domains)
+    if not candidates:
+        return False, "No candidate hostnames: give a subdomains file and/or a wordlist with domains."
+
+    started = time.monotonic()
+    with open(output_file_path, 'w') as out_file:
+        def write_found(record):
+            out_file.write(json.dumps(record) + "\n")
+            out_file.flush()
+
+        scanner = VhostScanner(targets, candidates, connections, parallel_targets, timeout,
+                               on_found=write_found, should_stop=should_stop, progress=progress)
+        scanner.run()
+
+    elapsed = time.monotonic() - started
+    message = (f"Found {scanner.found} virtual hosts from {len(candidates)} candidates on {len(targets)} ip:ports in "
+               f"{elapsed:.1f}s ({scanner.requests / max(elapsed, 1e-6):.0f} requests/s).")
+    if scanner.unreachable:
+        skipped = ", ".join(format_endpoint(ip, port) for ip, port, _ in scanner.unreachable[:10])
+        message += f" Skipped {len(scanner.unreachable)} unreachable: {skipped}{' ...' if len(scanner.unreachable) > 10 else ''}."
+    if scanner.errors:
+        message += f" {scanner.errors} requests failed."
+    if scanner.stopped:
+        message += " Stopped early."
+    return True, message
@@ -5,11 +5,17 @@ import argparse
 from PyQt5.QtCore import QThread, pyqtSignal
 from utils import db as command_db
 from utils import recon_tools
+from utils import fanout
+from utils import port_scanner
+from utils import nmap_runner
+from utils import tls_names
+from utils import vhost_scanner
 
 class Worker(QThread):
     """Worker thread to run the reconnaissance commands."""
     progress = pyqtSignal(str)
     progress_updated = pyqtSignal(int, int)
+    step_progress = pyqtSignal(str)
     scan_updated = pyqtSignal()
     background_task_started = pyqtSignal(int, str)
     finished = pyqtSignal()
@@ -45,6 +51,14 @@ class Worker(QThread):
         parser.add_argument('--subdomains')
         parser.add_argument('--scope')
         parser.add_argument('--scope_file')
+        parser.add_argument('--ports') # Each tool has its own default
+        parser.add_argument('--concurrency', type=int) # Each tool has its own default
+        parser.add_argument('--rate', type=float, default=port_scanner.DEFAULT_HOST_RATE)
+        parser.add_argument('--timeout', type=float)
+        parser.add_argument('--refresh', action='store_true')
+        parser.add_argument('--wordlist')
+        parser.add_argument('--domains')
+        parser.add_argument('--nmap_args', default=nmap_runner.DEFAULT_NMAP_ARGS)
 
         try:
             args = parser.parse_args(shlex.split(command_text.replace("internal:", "")))
@@ -55,6 +69,10 @@ class Worker(QThread):
                 "run_domain_enum": recon_tools.run_domain_enum,
                 "run_format_ips": recon_tools.run_format_ips,
                 "run_reverse_dns": recon_tools.run_reverse_dns,
+                "run_port_scan": port_scanner.run_port_scan,
+                "run_nmap_hosts": nmap_runner.run_nmap_hosts,
+                "run_tls_names": tls_names.run_tls_names,
+                "run_vhost_scan": vhost_scanner.run_vhost_scan,
             }
 
             if args.command in tool_map:
@@ -77,6 +95,48 @@ class Worker(QThread):
                 elif args.command == 'run_reverse_dns':
                     tool_args['input_file_path'] = os.path.join(self.output_dir, args.input)
                     tool_args['output_file_path'] = os.path.join(self.output_dir, args.output)
+                elif args.command == 'run_port_scan':
+                    tool_args['input_file_path'] = os.path.join(self.output_dir, args.input)
+                    tool_args['output_file_path'] = os.path.join(self.output_dir, args.output)
+                    tool_args['ports'] = args.ports or port_scanner.DEFAULT_PORTS
+                    tool_args['concurrency'] = args.concurrency or port_scanner.DEFAULT_CONCURRENCY
+                    tool_args['host_rate'] = args.rate
+                    tool_args['timeout'] = args.timeout or port_scanner.DEFAULT_TIMEOUT
+                    tool_args['should_stop'] = lambda: not self.is_running
+                    tool_args['progress'] = lambda scanned, total, found: self.step_progress.emit(
+                        f"port scan {scanned * 100 // max(total, 1)}% of {total} probes, {found} open")
+                elif args.command == 'run_nmap_hosts':
+                    tool_args['input_file_path'] = os.path.join(self.output_dir, args.input)
+                    tool_args['output_file_path'] = os.path.join(self.output_dir, args.output)
+                    tool_args['concurrency'] = args.concurrency or nmap_runner.DEFAULT_CONCURRENCY
+                    tool_args['nmap_args'] = args.nmap_args
+                    tool_args['should_stop'] = lambda: not self.is_running
+                    tool_args['progress'] = lambda done, total, failed: self.step_progress.emit(
+                        f"nmap {done}/{total} hosts" + (f", {failed} failed" if failed else ""))
+                elif args.command == 'run_tls_names':
+                    tool_args['input_file_path'] = os.path.join(self.output_dir, args.input)
+                    tool_args['output_file_path'] = os.path.join(self.output_dir, args.output)
+                    tool_args['ports'] = args.ports or tls_names.DEFAULT_TLS_PORTS
+                    tool_args['concurrency'] = args.concurrency or tls_names.DEFAULT_CONCURRENCY
+                    tool_args['timeout'] = args.timeout or tls_names.DEFAULT_TIMEOUT
+                    tool_args['refresh'] = args.refresh
+                    tool_args['should_stop'] = lambda: not self.is_running
+                    tool_args['progress'] = lambda done, total: self.step_progress.emit(f"TLS names {done}/{total} endpoints")
+                elif args.command == 'run_vhost_scan':
+                    tool_args['input_file_path'] = os.path.join(self.output_dir, args.input)
+                    tool_args['output_file_path'] = os.path.join(self.output_dir, args.output)
+                    if args.subdomains:
+                        tool_args['subdomains_file_path'] = os.path.join(self.output_dir, args.subdomains)
+                    if args.wordlist:
+                        tool_args['wordlist_path'] = os.path.join(self.output_dir, args.wordlist)
+                    if args.domains:
+                        tool_args['domains_file_path'] = os.path.join(self.output_dir, args.domains)
+                    tool_args['ports'] = args.ports or vhost_scanner.DEFAULT_VHOST_PORTS
+                    tool_args['connections'] = args.concurrency or vhost_scanner.DEFAULT_CONNECTIONS
+                    tool_args['timeout'] = args.timeout or vhost_scanner.DEFAULT_TIMEOUT
+                    tool_args['should_stop'] = lambda: not self.is_running
+                    tool_args['progress'] = lambda done, total, found: self.step_progress.emit(
+                        f"vhosts {done * 100 // max(total, 1)}% of {total} requests, {found} found")
 
                 success, message = tool_map[args.command](**tool_args)
 
@@ -113,12 +173,71 @@ class Worker(QThread):
         except Exception as e:
             self.error.emit(f"Error executing '{command_text}': {e}")
     
+    def run_fanout_command(self, command_text, use_shell):
+        """
+        Runs a foreach: step: one instance of the command per line of the input
+        file, at most spec.jobs at a time. Each instance writes its console
+        output to its own log file, and a failing instance doesn't stop the others.
+        """
+        try:
+            spec = fanout.parse_fanout(command_text, use_shell)
+            lines = fanout.read_fanout_lines(os.path.join(self.output_dir, spec.input_file))
+        except ValueError as e:
+            self.error.emit(f"Invalid foreach step '{command_text}': {e}")
+            return
+        except OSError as e:
+            self.error.emit(f"Could not read the input file of '{command_text}': {e}")
+            return
+        tool, total = spec.tool, len(lines)
+        if not total:
+            self.progress.emit(f"[{tool}] {spec.input_file} is empty, nothing to run.")
+            return
+
+        log_dir = os.path.join(self.output_dir, fanout.FANOUT_LOG_DIR, tool)
+        os.makedirs(log_dir, exist_ok=True)
+        # Tools rarely create the directory of their -o file; create fixed ones up front
+        for path in fanout.output_paths(spec.template):
+            directory = os.path.dirname(path)
+            if directory and '{' not in directory:
+                os.makedirs(os.path.join(self.output_dir, directory), exist_ok=True)
+
+        self.progress.emit(f"[{tool}] Running for {total} lines of {spec.input_file}, {spec.jobs} at a time. "
+                           f"Per-line output: {os.path.relpath(log_dir, self.output_dir)}")
+        # Different lines can share a safe name ('a:b' and 'a_b'); the index keeps their logs apart
+        width = len(str(total))
+        instances = [(line, fanout.expand(spec.template, line, index, use_shell),
+                      os.path.join(log_dir, f"{index:0{width}d}_{fanout.safe_name(line)}.log"))
+                     for index, line in enumerate(lines, 1)]
+        logged_tenth = 0
+
+        def report(done, failed_count):
+            nonlocal logged_tenth
+            failed = f", {failed_count} failed" if failed_count else ""
+            self.step_progress.emit(f"{tool} {done}/{total}{failed}")
+            # The log only gets a line every tenth of the way
+            if done * 10 // total > logged_tenth:
+                logged_tenth = done * 10 // total
+                self.progress.emit(f"[{tool}] {done}/{total} done{failed}")
+
+        done, failures, missing = fanout.run_parallel(instances, spec.jobs, self.output_dir, use_shell,
+                                                      should_stop=lambda: not self.is_running, progress=report)
+        if missing:
+            # Every other line would have failed the same way
+            self.error.emit(f"Command not found: {tool}")
+        if not self.is_running:
+            self.progress.emit(f"[{tool}] Cancelled after {done}/{total}.")
+        for line, reason in failures[:10]:
+            self.progress.emit(f"[{tool}] Failed for {line}: {reason}")
+        if len(failures) > 10:
+            self.progress.emit(f"[{tool}] ... and {len(failures) - 10} more failures, see {fanout.FANOUT_LOG_DIR}/{tool}")
+
     def run(self):
         if not os.path.exists(self.output_dir):
             os.makedirs(self.output_dir)
 
         commands = command_db.get_all_commands()
         total_commands = len(commands)
+        self.progress_updated.emit(0, total_commands)
 
         # Initial IP Parser run
         self.progress.emit("[*] Starting with IP parsing...")
@@ -128,10 +247,11 @@ class Worker(QThread):
             if not self.is_running:
                 break
 
-            command_text = cmd_row['command_text'].format(
+            # {line} and friends are filled in per input line by foreach: steps
+            command_text = cmd_row['command_text'].format_map(fanout.KeepUnknownPlaceholders(
                 target_name=self.target_name,
                 scope_file=self.scope_file
-            )
+            ))
 
             self.progress.emit(f"\n<span style='color: #007acc;'>--- Running Step {i+1}/{total_commands}: {command_text} ---</span>")
             self.progress_updated.emit(i + 1, total_commands)
@@ -140,6 +260,8 @@ class Worker(QThread):
                 self.run_background_command(command_text)
             elif command_text.startswith("internal:"):
                 self.run_internal_command(command_text)
+            elif command_text.startswith(fanout.FANOUT_PREFIX):
+                self.run_fanout_command(command_text, cmd_row['use_shell'])
             else:
                 self.run_external_command(command_text, cmd_row['use_shell'])
 
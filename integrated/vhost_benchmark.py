@@ -0,0 +1,96 @@
+"""
+Runs the virtual-host scanner against a local multi-vhost server: a
+keep-alive HTTP server on 127.0.0.2 whose default site echoes the requested
+Host and changes on every request, with --vhosts configured names hidden
+among --candidates random ones. Checks that exactly the configured names are
+reported:
+
+    python vhost_benchmark.py --candidates 20000 --vhosts 25
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+from utils.vhost_scanner import DEFAULT_CONNECTIONS, run_vhost_scan
+
+DOMAIN = "bench.example.com"
+
+def serve_vhosts(host, port, vhosts, ready):
+    """Serves until the process exits; sets `ready` once listening."""
+    async def handle(reader, writer):
+        try:
+            while True:
+                request_host = ""
+                line = await reader.readline()
+                if not line:
+                    break
+                while line not in (b'\r\n', b'\n', b''):
+                    if line.lower().startswith(b'host:'):
+                        request_host = line[5:].strip().decode()
+                    line = await reader.readline()
+                if request_host in vhosts:
+                    status, body = "200 OK", f"<html><title>{request_host} portal</title><body>{vhosts[request_host]}</body></html>"
+                else:
+                    # The default site: mentions the Host it was asked for and is a little different every time
+                    status, body = "200 OK", (f"<html><title>Welcome</title><body>No site configured for {request_host}. "
+                                              f"Request served at {time.time()}.</body></html>")
+                payload = body.encode()
+                writer.write(f"HTTP/1.1 {status}\r\nContent-Type: text/html\r\nContent-Length: {len(payload)}\r\n\r\n".encode() + payload)
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def main():
+        await asyncio.start_server(handle, host, port, backlog=1024)
+        ready.set()
+        await asyncio.Event().wait()
+
+    asyncio.run(main())
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark virtual-host discovery against a local multi-vhost server.")
+    parser.add_argument('--candidates', type=int, default=20000, help="Random candidate names (default: 20000)")
+    parser.add_argument('--vhosts', type=int, default=25, help="Configured virtual hosts hidden among them")
+    parser.add_argument('--port', type=int, default=18080)
+    parser.add_argument('--connections', type=int, default=DEFAULT_CONNECTIONS)
+    args = parser.parse_args(argv)
+
+    configured = {f"secret{i}.{DOMAIN}": "x " * random.randint(5, 500) for i in range(args.vhosts)}
+    ready = threading.Event()
+    threading.Thread(target=serve_vhosts, args=("127.0.0.2", args.port, configured, ready), daemon=True).start()
+    ready.wait()
+
+    words = [f"w{i:06d}" for i in range(args.candidates)] + [name.split('.', 1)[0] for name in configured]
+    random.shuffle(words)
+    with tempfile.TemporaryDirectory() as work_dir:
+        paths = {name: os.path.join(work_dir, name) for name in ("scopeips", "wordlist", "domains", "vhosts_out")}
+        with open(paths["scopeips"], 'w') as f:
+            f.write(f"127.0.0.2:{args.port}\n")
+        with open(paths["wordlist"], 'w') as f:
+            f.write("\n".join(words) + "\n")
+        with open(paths["domains"], 'w') as f:
+            f.write(DOMAIN + "\n")
+        started = time.perf_counter()
+        success, message = run_vhost_scan(paths["scopeips"], paths["vhosts_out"], wordlist_path=paths["wordlist"],
+                                          domains_file_path=paths["domains"], connections=args.connections)
+        elapsed = time.perf_counter() - started
+        with open(paths["vhosts_out"]) as f:
+            found = {json.loads(line)['input'] for line in f if line.strip()}
+
+    print(message)
+    if not success:
+        return 1
+    print(f"{len(words)} candidates in {elapsed:.2f}s: {len(words) / elapsed:,.0f} requests/s")
+    missed, extra = set(configured) - found, found - set(configured)
+    print(f"{len(configured)} configured vhosts, {len(found & set(configured))} found, {len(missed)} missed, {len(extra)} false positives")
+    return 0 if not missed and not extra else 1
+
+if __name__ == "__main__":
+    sys.exit(main())